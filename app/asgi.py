@@ -2,6 +2,8 @@
 """Configuração ASGI para o projeto Django.
 
 Este módulo expõe a callable ASGI como uma variável de nível de módulo chamada `application`.
+Servidores ASGI (por exemplo, uvicorn ou daphne) executam as views assíncronas, como
+`app.views.home_async`, de forma nativa, sem ocupar uma thread por requisição.
 
 Componentes principais:
     - application: Objeto que representa a interface ASGI do projeto Django.
@@ -3,39 +3,74 @@ Módulo de métricas para o sistema.
 
 Este módulo define funções para calcular e retornar métricas relacionadas a produtos, vendas,
 e dados diários. As métricas são usadas para gerar relatórios e gráficos na interface do sistema.
+As funções públicas são armazenadas em cache por `app.metrics_cache.cached_metric`.
 
 Componentes principais:
+    - summarize_products: Calcula as métricas de estoque de um queryset de produtos.
     - get_product_metrics: Calcula métricas gerais sobre os produtos.
+    - get_filtered_product_metrics: Calcula as métricas de estoque de uma listagem filtrada.
     - get_sales_metrics: Calcula métricas relacionadas às vendas.
+    - summarize_outflows: Calcula as métricas de vendas de um queryset de saídas.
+    - get_filtered_sales_metrics: Calcula as métricas de vendas de uma listagem filtrada.
     - get_daily_sales_data: Retorna dados diários de vendas para gráficos.
     - get_daily_sales_quantity_data: Retorna dados diários de quantidade de vendas.
     - get_graphic_product_category_metric: Retorna a contagem de produtos por categoria.
     - get_graphic_product_brand_metric: Retorna a contagem de produtos por marca.
+    - get_last_updated: Retorna a data da última atualização de produtos, entradas e saídas.
+
+Constantes:
+    - DAILY_SALES_RANGES: Janelas (em dias) aceitas pelos gráficos de vendas diárias.
+    - DEFAULT_DAILY_SALES_RANGE: Janela padrão dos gráficos de vendas diárias.
+    - GRAPHIC_TOP_N: Quantidade de categorias e marcas exibidas individualmente nos gráficos.
+    - OTHERS_LABEL: Rótulo que agrupa as demais categorias e marcas nos gráficos.
 
 Dependências:
+    - datetime: Para o cálculo do início da janela de datas.
+    - functools: Para adiar o cálculo das métricas filtradas até uma falha no cache.
     - django.db.models: Para operações de agregação e filtragem no banco de dados.
     - django.utils: Para formatação de números e manipulação de datas.
     - products.models: Para acessar o modelo Product.
-    - outflows.models: Para acessar o modelo Outflow.
+    - products.stripes: Para somar as faixas dos contadores de estoque divididos.
+    - inflows.models: Para acessar o modelo Inflow.
+    - outflows.models: Para acessar os modelos Outflow e DailySalesSummary.
     - categories.models: Para acessar o modelo Category.
     - brands.models: Para acessar o modelo Brand.
+    - .metrics_cache: Para o cache versionado das métricas.
 """
 
-from django.db.models import Sum, F
+from datetime import timedelta
+from functools import partial
+from django.db.models import Count, Max, Sum, F
 from django.utils import timezone
 from django.utils.formats import number_format
 from products.models import Product
-from outflows.models import Outflow
+from products.stripes import annotate_stock_quantity
+from inflows.models import Inflow
+from outflows.models import Outflow, DailySalesSummary
 from categories.models import Category
 from brands.models import Brand
+from .metrics_cache import cached_metric, get_or_set_metric
 
+# Janelas (em dias) disponíveis para os gráficos de vendas diárias
+DAILY_SALES_RANGES = (7, 30, 90, 365)
+DEFAULT_DAILY_SALES_RANGE = 7
 
-def get_product_metrics():
+# Quantidade de categorias e marcas exibidas individualmente nos gráficos da página inicial
+GRAPHIC_TOP_N = 10
+OTHERS_LABEL = "Outros"
+
+
+def summarize_products(queryset):
     """
-    Calcula métricas gerais sobre os produtos.
+    Calcula as métricas de estoque de um queryset de produtos.
 
-    Esta função calcula o custo total, o preço de venda total, a quantidade total
-    e o lucro total de todos os produtos no estoque.
+    Calcula o custo total, o preço de venda total, a quantidade total e o lucro total
+    dos produtos do queryset em uma única consulta de agregação, sem carregar as
+    instâncias de Product em memória. O estoque de cada produto é a base somada às faixas
+    dos contadores divididos (ver products.stripes).
+
+    Argumentos:
+        queryset (QuerySet): Queryset de Product, possivelmente filtrado.
 
     Retorna:
         dict: Um dicionário contendo as métricas formatadas:
@@ -44,15 +79,16 @@ def get_product_metrics():
             - total_quantity: Quantidade total de produtos.
             - total_profit: Lucro total (venda - custo).
     """
-    products = Product.objects.all()
-    total_cost_price = sum(
-        product.cost_price * product.quantity for product in products
-    )
-    total_selling_price = sum(
-        product.selling_price * product.quantity for product in products
+    totals = annotate_stock_quantity(queryset).aggregate(
+        total_cost_price=Sum(F("cost_price") * F("stock_quantity")),
+        total_selling_price=Sum(F("selling_price") * F("stock_quantity")),
+        total_quantity=Sum("stock_quantity"),
+        total_profit=Sum((F("selling_price") - F("cost_price")) * F("stock_quantity")),
     )
-    total_quantity = sum(product.quantity for product in products)
-    total_profit = total_selling_price - total_cost_price
+    total_cost_price = totals["total_cost_price"] or 0
+    total_selling_price = totals["total_selling_price"] or 0
+    total_quantity = totals["total_quantity"] or 0
+    total_profit = totals["total_profit"] or 0
     return dict(
         total_cost_price=number_format(
             total_cost_price, decimal_pos=2, force_grouping=True
@@ -65,12 +101,54 @@ def get_product_metrics():
     )
 
 
+@cached_metric
+def get_product_metrics():
+    """
+    Calcula métricas gerais sobre os produtos.
+
+    Esta função calcula o custo total, o preço de venda total, a quantidade total
+    e o lucro total de todos os produtos no estoque em uma única consulta de
+    agregação, sem carregar as instâncias de Product em memória.
+
+    Retorna:
+        dict: Um dicionário contendo as métricas formatadas (ver `summarize_products`).
+    """
+    return summarize_products(Product.objects.all())
+
+
+def get_filtered_product_metrics(queryset, filters):
+    """
+    Calcula as métricas de estoque dos produtos que atendem aos filtros de uma listagem.
+
+    Sem filtros, retorna as métricas gerais de `get_product_metrics`. Com filtros, calcula
+    as métricas do queryset filtrado e as armazena em cache pela assinatura dos filtros,
+    de modo que a troca de página não executa a agregação novamente.
+
+    Argumentos:
+        queryset (QuerySet): Queryset de Product já filtrado.
+        filters (dict): Filtros aplicados ao queryset (nome do parâmetro e valor).
+
+    Retorna:
+        dict: Um dicionário contendo as métricas formatadas (ver `summarize_products`).
+    """
+    if not filters:
+        return get_product_metrics()
+    return get_or_set_metric(
+        "get_filtered_product_metrics",
+        [f"{name}={value}" for name, value in sorted(filters.items())],
+        partial(summarize_products, queryset),
+    )
+
+
+@cached_metric
 def get_sales_metrics():
     """
     Calcula métricas relacionadas às vendas.
 
     Esta função calcula o total de vendas, a quantidade total de produtos vendidos,
-    o valor total das vendas e o lucro total das vendas.
+    o valor total das vendas e o lucro total das vendas em uma única consulta de
+    agregação sobre o resumo diário de vendas, que já consolida os preços
+    registrados no momento de cada venda.
 
     Retorna:
         dict: Um dicionário contendo as métricas formatadas:
@@ -79,21 +157,77 @@ def get_sales_metrics():
             - total_sales_value: Valor total das vendas.
             - total_sales_profit: Lucro total das vendas (venda - custo).
     """
-    total_sales = Outflow.objects.count()
-    total_products_sold = (
-        Outflow.objects.aggregate(total_products_sold=Sum("quantity"))[
-            "total_products_sold"
-        ]
-        or 0
+    totals = DailySalesSummary.objects.aggregate(
+        total_sales=Sum("sales_count"),
+        total_products_sold=Sum("quantity"),
+        total_sales_value=Sum("revenue"),
+        total_sales_cost=Sum("cost"),
     )
-    total_sales_value = sum(
-        outflow.quantity * outflow.product.selling_price
-        for outflow in Outflow.objects.all()
+    return _format_sales_metrics(totals)
+
+
+def summarize_outflows(queryset):
+    """
+    Calcula as métricas de vendas de um queryset de saídas.
+
+    Calcula o total de vendas, a quantidade total de produtos vendidos, o valor total e o
+    lucro total das saídas do queryset em uma única consulta de agregação, usando os preços
+    registrados no momento de cada venda.
+
+    Argumentos:
+        queryset (QuerySet): Queryset de Outflow, possivelmente filtrado.
+
+    Retorna:
+        dict: Um dicionário contendo as métricas formatadas (ver `get_sales_metrics`).
+    """
+    totals = queryset.aggregate(
+        total_sales=Count("id"),
+        total_products_sold=Sum("quantity"),
+        total_sales_value=Sum(F("unit_selling_price") * F("quantity")),
+        total_sales_cost=Sum(F("unit_cost_price") * F("quantity")),
     )
-    total_sales_cost = sum(
-        outflow.quantity * outflow.product.cost_price
-        for outflow in Outflow.objects.all()
+    return _format_sales_metrics(totals)
+
+
+def get_filtered_sales_metrics(queryset, filters):
+    """
+    Calcula as métricas de vendas das saídas que atendem aos filtros de uma listagem.
+
+    Sem filtros, retorna as métricas gerais de `get_sales_metrics`. Com filtros, calcula
+    as métricas do queryset filtrado e as armazena em cache pela assinatura dos filtros,
+    de modo que a troca de página não executa a agregação novamente.
+
+    Argumentos:
+        queryset (QuerySet): Queryset de Outflow já filtrado.
+        filters (dict): Filtros aplicados ao queryset (nome do parâmetro e valor).
+
+    Retorna:
+        dict: Um dicionário contendo as métricas formatadas (ver `get_sales_metrics`).
+    """
+    if not filters:
+        return get_sales_metrics()
+    return get_or_set_metric(
+        "get_filtered_sales_metrics",
+        [f"{name}={value}" for name, value in sorted(filters.items())],
+        partial(summarize_outflows, queryset),
     )
+
+
+def _format_sales_metrics(totals):
+    """
+    Formata os totais de vendas retornados por uma consulta de agregação.
+
+    Argumentos:
+        totals (dict): Totais com as chaves total_sales, total_products_sold,
+                       total_sales_value e total_sales_cost (podendo ser None).
+
+    Retorna:
+        dict: Um dicionário contendo as métricas formatadas (ver `get_sales_metrics`).
+    """
+    total_sales = totals["total_sales"] or 0
+    total_products_sold = totals["total_products_sold"] or 0
+    total_sales_value = totals["total_sales_value"] or 0
+    total_sales_cost = totals["total_sales_cost"] or 0
     total_sales_profit = total_sales_value - total_sales_cost
     return dict(
         total_sales=total_sales,
@@ -107,81 +241,172 @@ def get_sales_metrics():
     )
 
 
-def get_daily_sales_data():
+def _get_daily_sales(days):
+    """
+    Agrupa as vendas por dia dentro da janela informada.
+
+    Executa uma única consulta agrupada por dia sobre o resumo diário de vendas, que retorna,
+    para cada dia com vendas, o valor total e a quantidade de vendas. Os dias sem vendas não
+    aparecem no resultado da consulta e são completados com zero pelas funções públicas.
+
+    Argumentos:
+        days (int): Quantidade de dias da janela, terminando no dia atual.
+
+    Retorna:
+        tuple: Uma tupla contendo:
+            - Lista de datas da janela, em ordem crescente.
+            - Dicionário que mapeia cada data com vendas para seus totais.
+    """
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    rows = (
+        DailySalesSummary.objects.filter(date__gte=start)
+        .values("date")
+        .annotate(
+            total_value=Sum("revenue"),
+            total_count=Sum("sales_count"),
+        )
+        .order_by("date")
+    )
+    dates = [start + timedelta(days=i) for i in range(days)]
+    return dates, {row["date"]: row for row in rows}
+
+
+@cached_metric
+def get_daily_sales_data(days=DEFAULT_DAILY_SALES_RANGE):
     """
     Retorna dados diários de vendas para gráficos.
 
-    Esta função calcula o valor total das vendas para cada dia dos últimos 7 dias.
+    Esta função calcula o valor total das vendas para cada dia da janela informada,
+    usando uma única consulta agrupada por dia.
+
+    Argumentos:
+        days (int): Quantidade de dias da janela (padrão: 7).
 
     Retorna:
         dict: Um dicionário contendo:
-            - dates: Lista de datas dos últimos 7 dias.
+            - dates: Lista de datas da janela.
             - values: Lista de valores totais de vendas para cada dia.
     """
-    today = timezone.now().date()
-    dates = [str(today - timezone.timedelta(days=i)) for i in range(6, -1, -1)]
-    values = list()
-
-    for date in dates:
-        sales_total = (
-            Outflow.objects.filter(created_at__date=date).aggregate(
-                total_sales=Sum(F("product__selling_price") * F("quantity"))
-            )["total_sales"]
-            or 0
-        )
-        values.append(float(sales_total))
-
-    return dict(dates=dates, values=values)
+    dates, totals = _get_daily_sales(days)
+    values = [
+        float(totals[date]["total_value"]) if date in totals else 0.0
+        for date in dates
+    ]
+    return dict(dates=[str(date) for date in dates], values=values)
 
 
-def get_daily_sales_quantity_data():
+@cached_metric
+def get_daily_sales_quantity_data(days=DEFAULT_DAILY_SALES_RANGE):
     """
     Retorna dados diários de quantidade de vendas.
 
-    Esta função calcula a quantidade de vendas realizadas para cada dia dos últimos 7 dias.
+    Esta função calcula a quantidade de vendas realizadas para cada dia da janela informada,
+    usando uma única consulta agrupada por dia.
+
+    Argumentos:
+        days (int): Quantidade de dias da janela (padrão: 7).
 
     Retorna:
         dict: Um dicionário contendo:
-            - dates: Lista de datas dos últimos 7 dias.
+            - dates: Lista de datas da janela.
             - values: Lista de quantidades de vendas para cada dia.
     """
-    today = timezone.now().date()
-    dates = [str(today - timezone.timedelta(days=i)) for i in range(6, -1, -1)]
-    quantities = list()
+    dates, totals = _get_daily_sales(days)
+    quantities = [
+        totals[date]["total_count"] if date in totals else 0 for date in dates
+    ]
+    return dict(dates=[str(date) for date in dates], values=quantities)
+
+
+def _count_products_by(queryset, top=None):
+    """
+    Conta os produtos de cada registro do queryset (categorias ou marcas).
 
-    for date in dates:
-        sales_quantity = Outflow.objects.filter(created_at__date=date).count()
-        quantities.append(sales_quantity)
+    Executa uma única consulta com `annotate(Count("products"))`. No modo top-N, retorna apenas
+    os `top` registros com mais produtos e agrupa os demais na chave "Outros", cujo valor é
+    obtido pela diferença em relação ao total de produtos.
 
-    return dict(dates=dates, values=quantities)
+    Argumentos:
+        queryset (QuerySet): Queryset de Category ou Brand.
+        top (int, opcional): Quantidade de registros exibidos individualmente.
 
+    Retorna:
+        dict: Um dicionário que mapeia o nome de cada registro para sua quantidade de produtos.
+    """
+    counts = queryset.annotate(product_count=Count("products"))
+    if top is None:
+        return dict(counts.values_list("name", "product_count"))
 
-def get_graphic_product_category_metric():
+    counts = dict(
+        counts.order_by("-product_count", "name").values_list("name", "product_count")[
+            :top
+        ]
+    )
+    others = Product.objects.count() - sum(counts.values())
+    if others > 0:
+        counts[OTHERS_LABEL] = others
+    return counts
+
+
+@cached_metric
+def get_graphic_product_category_metric(top=None):
     """
     Retorna a contagem de produtos por categoria.
 
-    Esta função calcula a quantidade de produtos em cada categoria.
+    Esta função calcula a quantidade de produtos em cada categoria com uma única
+    consulta agregada.
+
+    Argumentos:
+        top (int, opcional): Quantidade de categorias exibidas individualmente; as demais
+                             são agrupadas em "Outros". Se omitido, retorna todas.
 
     Retorna:
         dict: Um dicionário onde as chaves são os nomes das categorias e os valores
               são a quantidade de produtos em cada categoria.
     """
-    categories = Category.objects.all()
-    return {
-        category.name: Product.objects.filter(category=category).count()
-        for category in categories
-    }
+    return _count_products_by(Category.objects.all(), top)
 
 
-def get_graphic_product_brand_metric():
+@cached_metric
+def get_graphic_product_brand_metric(top=None):
     """
     Retorna a contagem de produtos por marca.
 
-    Esta função calcula a quantidade de produtos em cada marca.
+    Esta função calcula a quantidade de produtos em cada marca com uma única
+    consulta agregada.
+
+    Argumentos:
+        top (int, opcional): Quantidade de marcas exibidas individualmente; as demais
+                             são agrupadas em "Outros". Se omitido, retorna todas.
 
     Retorna:
         dict: Um dicionário onde as chaves são os nomes das marcas e os valores
               são a quantidade de produtos em cada marca.
     """
-    brands = Brand.objects.all()
-    return {brand.name: Product.objects.filter(brand=brand).count() for brand in brands}
+    return _count_products_by(Brand.objects.all(), top)
+
+
+@cached_metric
+def get_last_updated():
+    """
+    Retorna a data da última atualização de produtos, entradas e saídas.
+
+    Usada para compor o ETag do endpoint de dados do painel. Como o resultado fica em cache
+    até a próxima gravação, as requisições condicionais repetidas não consultam o banco.
+
+    Retorna:
+        dict: Um dicionário contendo, em formato ISO 8601 (ou None se não houver registros):
+            - products: Maior updated_at dos produtos.
+            - inflows: Maior updated_at das entradas.
+            - outflows: Maior updated_at das saídas.
+    """
+    last_updated = dict(
+        products=Product.objects.aggregate(last=Max("updated_at"))["last"],
+        inflows=Inflow.objects.aggregate(last=Max("updated_at"))["last"],
+        outflows=Outflow.objects.aggregate(last=Max("updated_at"))["last"],
+    )
+    return {
+        name: value.isoformat() if value else None
+        for name, value in last_updated.items()
+    }
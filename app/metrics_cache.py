@@ -0,0 +1,174 @@
+"""
+Módulo de cache para as métricas do sistema.
+
+Este módulo define uma camada de cache, baseada no framework de cache do Django, que fica na
+frente das funções de `app.metrics`. As chaves são versionadas: sempre que um produto, uma
+entrada ou uma saída é gravado ou excluído, ou que o estoque é alterado sem passar pelos
+sinais (products.stock), a versão é incrementada e todas as métricas armazenadas deixam de
+ser lidas, de modo que os leitores nunca veem totais desatualizados.
+Uma leitura em cache não executa nenhuma consulta ao banco de dados.
+
+Componentes principais:
+    - get_or_set_metric: Retorna uma métrica do cache ou a calcula e armazena.
+    - cached_metric: Decorador que armazena em cache o resultado de uma função de métrica.
+    - get_metrics_version: Retorna a versão atual das chaves de métricas.
+    - bump_metrics_version: Incrementa a versão das chaves de métricas.
+    - invalidate_metrics_cache: Agenda o incremento da versão para após o commit da transação.
+    - get_metrics_cache_stats: Retorna os contadores de acertos e falhas do cache.
+
+Configurações:
+    - CACHES: Backend de cache utilizado (memória local por padrão).
+    - METRICS_CACHE_TIMEOUT: Tempo máximo, em segundos, de permanência de uma métrica no cache.
+
+Dependências:
+    - hashlib: Para compor as chaves a partir dos parâmetros das métricas.
+    - time: Para iniciar a versão das chaves de métricas.
+    - functools: Para preservar os metadados das funções decoradas.
+    - django.conf.settings: Para as configurações do cache de métricas.
+    - django.core.cache: Para o acesso ao backend de cache configurado.
+    - django.db.transaction: Para adiar a invalidação até o commit.
+    - django.utils.timezone: Para incluir o dia atual nas chaves.
+"""
+
+import hashlib
+import time
+from functools import partial, wraps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+VERSION_KEY = "metrics:version"
+HITS_KEY = "metrics:hits"
+MISSES_KEY = "metrics:misses"
+
+
+def _incr(key, delta=1):
+    """
+    Incrementa um contador no cache, criando-o caso ainda não exista.
+
+    Argumentos:
+        key (str): Chave do contador.
+        delta (int): Valor a ser somado ao contador.
+
+    Retorna:
+        int: Novo valor do contador.
+    """
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key, delta)
+
+
+def get_metrics_version():
+    """
+    Retorna a versão atual das chaves de métricas.
+
+    Caso a versão ainda não exista (ou tenha sido removida pelo backend), ela é iniciada com o
+    instante atual em milissegundos, para nunca reaproveitar uma versão já utilizada.
+
+    Retorna:
+        int: Versão atual das chaves de métricas.
+    """
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_metrics_version():
+    """
+    Incrementa a versão das chaves de métricas, invalidando todas as métricas em cache.
+
+    Retorna:
+        int: Nova versão das chaves de métricas.
+    """
+    get_metrics_version()
+    return _incr(VERSION_KEY)
+
+
+def invalidate_metrics_cache():
+    """
+    Invalida as métricas em cache após a gravação ou exclusão de um registro.
+
+    Chamada pelos sinais post_save e post_delete de Product, Inflow e Outflow e pelas escritas
+    de estoque de products.stock, que não disparam sinais (lotes, faixas do contador,
+    `collapse_stock_stripes` e `reconcile_stock --fix`). O incremento da versão é adiado
+    para o commit da transação corrente, para que nenhum leitor recalcule e armazene métricas
+    com dados ainda não confirmados.
+    """
+    transaction.on_commit(bump_metrics_version)
+
+
+def get_metrics_cache_stats():
+    """
+    Retorna os contadores do cache de métricas.
+
+    Retorna:
+        dict: Um dicionário contendo:
+            - version: Versão atual das chaves de métricas.
+            - hits: Quantidade de leituras atendidas pelo cache.
+            - misses: Quantidade de leituras que recalcularam a métrica.
+    """
+    return dict(
+        version=get_metrics_version(),
+        hits=cache.get(HITS_KEY, 0),
+        misses=cache.get(MISSES_KEY, 0),
+    )
+
+
+def get_or_set_metric(name, params, compute):
+    """
+    Retorna uma métrica do cache ou a calcula e armazena.
+
+    A chave é formada pelo nome da métrica, pelo dia atual e por um hash dos parâmetros
+    informados (que podem conter texto livre, como termos de busca), e é gravada com a
+    versão atual das métricas. Em caso de acerto, o resultado é retornado sem
+    consultar o banco de dados; em caso de falha, `compute` é executada e o resultado armazenado.
+
+    Argumentos:
+        name (str): Nome da métrica.
+        params (iterable): Parâmetros que identificam o resultado (por exemplo, filtros).
+        compute (callable): Função sem argumentos que calcula a métrica.
+
+    Retorna:
+        O resultado da métrica.
+    """
+    digest = hashlib.md5(":".join(str(param) for param in params).encode()).hexdigest()
+    key = f"metrics:{name}:{timezone.localdate()}:{digest}"
+    version = get_metrics_version()
+    result = cache.get(key, version=version)
+    if result is not None:
+        _incr(HITS_KEY)
+        return result
+
+    _incr(MISSES_KEY)
+    result = compute()
+    cache.set(key, result, settings.METRICS_CACHE_TIMEOUT, version=version)
+    return result
+
+
+def cached_metric(func):
+    """
+    Decorador que armazena em cache o resultado de uma função de métrica.
+
+    Usa `get_or_set_metric` com o nome da função e os argumentos da chamada.
+
+    Argumentos:
+        func (callable): Função de métrica a ser decorada.
+
+    Retorna:
+        callable: Função decorada.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        params = [str(arg) for arg in args]
+        params += [f"{name}={value}" for name, value in sorted(kwargs.items())]
+        return get_or_set_metric(
+            func.__name__, params, partial(func, *args, **kwargs)
+        )
+
+    return wrapper
@@ -0,0 +1,467 @@
+"""
+Módulo de paginação compartilhado entre as aplicações.
+
+Este módulo define a paginação por cursor (keyset) usada nas listas de movimentações, que
+crescem indefinidamente. Em vez de `OFFSET`, que obriga o banco de dados a ler e descartar
+todas as linhas das páginas anteriores, cada página é buscada a partir da posição do último
+registro da página anterior (`WHERE (created_at, id) < (...)`), apoiada por um índice
+composto com as mesmas colunas da ordenação. Assim, a página 10.000 custa o mesmo que a
+primeira. O cursor é opaco para o usuário e só permite navegar para a página anterior ou
+para a próxima.
+
+O módulo também define o paginador com contagem estimada, usado pelas demais ListViews: sem
+filtros, em tabelas grandes do PostgreSQL, o total de registros é a estimativa do planejador
+(`pg_class.reltuples`), em vez de um `COUNT(*)` que percorre a tabela inteira a cada página.
+
+Componentes principais:
+    - estimate_count: Função que retorna a estimativa do planejador para um conjunto sem filtros.
+    - EstimatedPage: Página do paginador com contagem estimada.
+    - EstimatedCountPaginator: Paginador que usa a contagem estimada em tabelas grandes.
+    - InvalidCursor: Exceção levantada para cursores malformados.
+    - KeysetPage: Página de resultados com os cursores das páginas vizinhas.
+    - paginate_keyset: Função que busca uma página a partir de um cursor.
+    - KeysetPaginationMixin: Mixin que aplica a paginação por cursor às ListViews.
+    - KeysetPagination: Classe de paginação por cursor para a API REST.
+
+Configurações:
+    - PAGINATION_ESTIMATE_THRESHOLD: Quantidade de registros a partir da qual o total é estimado.
+
+Dependências:
+    - base64, json: Para a codificação do cursor.
+    - django.conf.settings: Para o limite da contagem estimada.
+    - django.core.exceptions: Para a conversão dos valores do cursor.
+    - django.core.paginator: Para a classe Paginator.
+    - django.db: Para a consulta ao catálogo do PostgreSQL.
+    - django.db.models.Q: Para o filtro de posição.
+    - django.http.Http404: Para cursores inválidos nas views web.
+    - rest_framework: Para a paginação da API REST.
+"""
+
+import base64
+import json
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from django.http import Http404
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+DEFAULT_KEYSET_ORDERING = ("-created_at", "-id")
+
+
+def estimate_count(queryset):
+    """
+    Retorna a estimativa do planejador para a quantidade de registros de um conjunto sem filtros.
+
+    Argumentos:
+        queryset (QuerySet): Conjunto de registros.
+
+    Retorna:
+        int: Estimativa de `pg_class.reltuples`, ou None quando o conjunto tem filtros, o banco
+             não é o PostgreSQL ou a tabela ainda não foi analisada.
+    """
+    query = queryset.query
+    if query.where or query.distinct or query.is_sliced or query.combinator:
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedPage(Page):
+    """
+    Página do paginador com contagem estimada.
+
+    A existência da próxima página, o índice do último registro e os números de página
+    exibidos vêm dos registros lidos, e não do total estimado, que pode ser maior ou menor
+    que o total real.
+
+    Atributos:
+        has_more (bool): Indica se há registros além desta página.
+        page_range (range): Números das páginas que sabidamente existem: as anteriores, a
+                            atual e, se houver registros além dela, a próxima.
+    """
+
+    def __init__(self, object_list, number, paginator, has_more):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        return self.has_more
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1
+
+    @property
+    def page_range(self):
+        return range(1, self.number + (2 if self.has_more else 1))
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginador que usa a estimativa do planejador como total em tabelas grandes sem filtros.
+
+    Abaixo de PAGINATION_ESTIMATE_THRESHOLD registros, ou com filtros, a contagem é exata. Com a
+    contagem estimada, o recorte de cada página não é limitado pelo total estimado e as páginas
+    além dele continuam acessíveis, pois a estimativa pode ser menor que o total real: cada
+    página lê um registro além do seu tamanho, apenas para saber se há uma próxima página, e
+    uma página vazia além da primeira é recusada. Para usá-lo, basta definir
+    `paginator_class = EstimatedCountPaginator` na ListView; o template
+    `components/_pagination.html` exibe o total como "aproximadamente N" e, como a última
+    página não é conhecida, não exibe o link para ela nem números de página além da próxima.
+
+    Atributos:
+        count_is_estimated (bool): Indica se o total é uma estimativa.
+
+    Métodos sobrescritos:
+        count: Total de registros, estimado ou exato.
+        validate_number: Aceita páginas além do total estimado.
+        page: Busca a página sem limitá-la ao total estimado.
+    """
+
+    count_is_estimated = False
+
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate >= settings.PAGINATION_ESTIMATE_THRESHOLD:
+                self.count_is_estimated = True
+                return estimate
+        return super().count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if self.count_is_estimated and int(number) > 1:
+                return int(number)
+            raise
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimated:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        rows = list(self.object_list[bottom:top + 1])
+        if not rows and number > 1:
+            raise EmptyPage("Essa página não contém resultados")
+        return EstimatedPage(
+            rows[: self.per_page], number, self, has_more=len(rows) > self.per_page
+        )
+
+
+class InvalidCursor(ValueError):
+    """
+    Exceção levantada quando um cursor não pode ser decodificado.
+    """
+
+
+class KeysetPage:
+    """
+    Página de resultados da paginação por cursor.
+
+    Atributos:
+        object_list (list): Registros da página, na ordem da listagem.
+        next_cursor (str): Cursor da próxima página, ou None.
+        previous_cursor (str): Cursor da página anterior, ou None.
+
+    Métodos:
+        has_next, has_previous, has_other_pages: Indicam a existência de páginas vizinhas.
+    """
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def encode_cursor(values, backwards):
+    """
+    Codifica a posição de um registro e o sentido da navegação em um cursor opaco.
+
+    Argumentos:
+        values (list): Valores das colunas da ordenação no registro de referência.
+        backwards (bool): Indica se o cursor aponta para a página anterior.
+
+    Retorna:
+        str: Cursor em base64 seguro para URLs.
+    """
+    payload = json.dumps(
+        {"v": [str(value) for value in values], "b": backwards}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, fields):
+    """
+    Decodifica um cursor, convertendo os valores para os tipos das colunas da ordenação.
+
+    Argumentos:
+        cursor (str): Cursor recebido na query string.
+        fields (list): Campos do modelo correspondentes às colunas da ordenação.
+
+    Retorna:
+        tuple: Valores da posição e indicador de navegação para trás.
+
+    Levanta:
+        InvalidCursor: Se o cursor estiver malformado.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+        if len(values) != len(fields):
+            raise InvalidCursor(cursor)
+        return (
+            [field.to_python(value) for field, value in zip(fields, values)],
+            bool(payload["b"]),
+        )
+    except (ValueError, TypeError, KeyError, ValidationError):
+        raise InvalidCursor(cursor)
+
+
+def keyset_filter(ordering, values, backwards):
+    """
+    Monta o filtro que seleciona os registros posteriores (ou anteriores) a uma posição.
+
+    Para a ordenação ("-created_at", "-id"), equivale a `(created_at, id) < (c, i)`,
+    expandido como `created_at <= c AND (created_at < c OR (created_at = c AND id < i))`;
+    a primeira condição delimita a varredura do índice composto.
+
+    Argumentos:
+        ordering (tuple): Colunas da ordenação, com "-" para as decrescentes.
+        values (list): Valores das colunas no registro de referência.
+        backwards (bool): Indica se os registros procurados vêm antes da posição.
+
+    Retorna:
+        Q: Filtro de posição.
+    """
+    names = [field.lstrip("-") for field in ordering]
+    lookups = [
+        "lt" if field.startswith("-") != backwards else "gt" for field in ordering
+    ]
+    condition = Q()
+    for index, (name, lookup) in enumerate(zip(names, lookups)):
+        condition |= Q(
+            **dict(zip(names[:index], values[:index])),
+            **{f"{name}__{lookup}": values[index]},
+        )
+    return Q(**{f"{names[0]}__{lookups[0]}e": values[0]}) & condition
+
+
+def paginate_keyset(queryset, page_size, cursor=None, ordering=DEFAULT_KEYSET_ORDERING):
+    """
+    Busca uma página de registros a partir de um cursor, com uma única consulta.
+
+    É lido um registro além do tamanho da página, apenas para saber se há mais páginas.
+
+    Argumentos:
+        queryset (QuerySet): Registros a paginar (a ordenação é substituída).
+        page_size (int): Quantidade de registros por página.
+        cursor (str): Cursor recebido, ou None para a primeira página.
+        ordering (tuple): Colunas da ordenação, a última delas única (por exemplo, "-id").
+
+    Retorna:
+        KeysetPage: Página de resultados.
+
+    Levanta:
+        InvalidCursor: Se o cursor estiver malformado.
+    """
+    names = [field.lstrip("-") for field in ordering]
+    backwards = False
+    if cursor:
+        fields = [queryset.model._meta.get_field(name) for name in names]
+        values, backwards = decode_cursor(cursor, fields)
+        queryset = queryset.filter(keyset_filter(ordering, values, backwards))
+
+    if backwards:
+        ordering = [
+            field[1:] if field.startswith("-") else f"-{field}" for field in ordering
+        ]
+    rows = list(queryset.order_by(*ordering)[: page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+
+    def position(row):
+        return [getattr(row, name) for name in names]
+
+    next_cursor = previous_cursor = None
+    if rows:
+        if has_more or backwards:
+            next_cursor = encode_cursor(position(rows[-1]), False)
+        if (has_more and backwards) or (cursor and not backwards):
+            previous_cursor = encode_cursor(position(rows[0]), True)
+    return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+class KeysetPaginationMixin:
+    """
+    Mixin que aplica a paginação por cursor a uma ListView.
+
+    Substitui a paginação por número de página: o contexto recebe `page_obj` (uma KeysetPage,
+    com `next_url` e `previous_url` que preservam os demais parâmetros da query string) e
+    `paginator` vazio. O template deve incluir `components/_keyset_pagination.html`.
+
+    O total de registros (`page_obj.count`) só é informado quando não custa uma varredura:
+    sem filtros, estimado pelo planejador em tabelas grandes ou exato em tabelas pequenas.
+
+    Atributos:
+        keyset_ordering (tuple): Colunas da ordenação, apoiadas por um índice composto.
+        cursor_param (str): Nome do parâmetro do cursor na query string.
+
+    Métodos sobrescritos:
+        paginate_queryset: Busca a página indicada pelo cursor.
+    """
+
+    keyset_ordering = DEFAULT_KEYSET_ORDERING
+    cursor_param = "cursor"
+
+    def paginate_queryset(self, queryset, page_size):
+        try:
+            page = paginate_keyset(
+                queryset,
+                page_size,
+                self.request.GET.get(self.cursor_param),
+                self.keyset_ordering,
+            )
+        except InvalidCursor:
+            raise Http404("Cursor de paginação inválido.")
+        page.next_url = self.get_cursor_url(page.next_cursor)
+        page.previous_url = self.get_cursor_url(page.previous_cursor)
+        page.first_url = self.get_cursor_url(None) if page.has_previous() else None
+        page.count, page.count_is_estimated = self.get_total_count(queryset)
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_total_count(self, queryset):
+        """
+        Retorna o total de registros da lista, quando ele pode ser obtido sem varredura.
+
+        Argumentos:
+            queryset (QuerySet): Registros da lista.
+
+        Retorna:
+            tuple: Total (ou None) e indicador de total estimado.
+        """
+        estimate = estimate_count(queryset)
+        if estimate is None:
+            return None, False
+        if estimate >= settings.PAGINATION_ESTIMATE_THRESHOLD:
+            return estimate, True
+        return queryset.count(), False
+
+    def get_cursor_url(self, cursor):
+        """
+        Monta a query string de uma página, preservando os demais parâmetros.
+
+        Argumentos:
+            cursor (str): Cursor da página, ou None para a primeira página.
+
+        Retorna:
+            str: Query string iniciada por "?".
+        """
+        query = self.request.GET.copy()
+        query.pop(self.cursor_param, None)
+        if cursor:
+            query[self.cursor_param] = cursor
+        return f"?{query.urlencode()}"
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação por cursor para a API REST.
+
+    A resposta traz os links `next` e `previous` e a lista `results`. O tamanho da página pode
+    ser informado com `?page_size=`, até `max_page_size`.
+
+    Atributos:
+        page_size (int): Quantidade padrão de registros por página.
+        max_page_size (int): Quantidade máxima de registros por página.
+        ordering (tuple): Colunas da ordenação, apoiadas por um índice composto.
+        cursor_query_param (str): Nome do parâmetro do cursor.
+        page_size_query_param (str): Nome do parâmetro do tamanho da página.
+    """
+
+    page_size = 100
+    max_page_size = 1000
+    ordering = DEFAULT_KEYSET_ORDERING
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        try:
+            self.page = paginate_keyset(
+                queryset,
+                self.get_page_size(request),
+                request.query_params.get(self.cursor_query_param),
+                self.ordering,
+            )
+        except InvalidCursor:
+            raise NotFound("Cursor de paginação inválido.")
+        return self.page.object_list
+
+    def get_link(self, cursor):
+        url = self.request.build_absolute_uri()
+        if cursor is None:
+            return None
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_link(self.page.next_cursor),
+                "previous": self.get_link(self.page.previous_cursor),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,91 @@
+"""
+Módulo de serialização compartilhado entre as aplicações.
+
+Este módulo define os componentes usados pelos endpoints que recebem vários itens em uma única
+requisição (entradas em lote, vendas com várias linhas). Os registros relacionados de todos os
+itens são carregados com uma consulta por modelo, em vez de uma consulta por item.
+
+Componentes principais:
+    - PreloadedPrimaryKeyRelatedField: Campo de relacionamento validado contra registros pré-carregados.
+    - PreloadedListSerializer: Serializador de lista que pré-carrega os registros relacionados.
+
+Dependências:
+    - rest_framework.serializers: Para as classes PrimaryKeyRelatedField e ListSerializer.
+"""
+
+from rest_framework import serializers
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Campo de relacionamento validado contra registros pré-carregados.
+
+    Em vez de executar uma consulta por item, como o PrimaryKeyRelatedField, este campo procura
+    o registro no dicionário `preloaded` do serializador pai, preenchido pelo
+    PreloadedListSerializer com uma única consulta para todos os itens da lista.
+
+    Métodos:
+        to_internal_value: Converte o id recebido no registro pré-carregado correspondente.
+    """
+
+    def to_internal_value(self, data):
+        """
+        Converte o id recebido no registro pré-carregado correspondente.
+
+        Argumentos:
+            data: Id recebido na requisição.
+
+        Retorna:
+            Model: Registro correspondente ao id.
+
+        Lógica:
+            - Rejeita valores que não sejam ids inteiros.
+            - Rejeita ids que não estejam entre os registros pré-carregados.
+        """
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+        instance = self.parent.preloaded[self.field_name].get(pk)
+        if instance is None:
+            self.fail("does_not_exist", pk_value=data)
+        return instance
+
+
+class PreloadedListSerializer(serializers.ListSerializer):
+    """
+    Serializador de lista que pré-carrega os registros relacionados.
+
+    Antes de validar os itens, reúne os ids informados em cada campo PreloadedPrimaryKeyRelatedField
+    do serializador filho e os carrega com um único `in_bulk` por campo.
+
+    Métodos:
+        to_internal_value: Pré-carrega os registros relacionados e valida todos os itens.
+    """
+
+    def to_internal_value(self, data):
+        """
+        Pré-carrega os registros relacionados e valida todos os itens.
+
+        Argumentos:
+            data (list): Lista de itens recebidos na requisição.
+
+        Retorna:
+            list: Lista de dados validados.
+        """
+        if isinstance(data, list):
+            self.child.preloaded = {}
+            for field_name, field in self.child.fields.items():
+                if isinstance(field, PreloadedPrimaryKeyRelatedField):
+                    ids = set()
+                    for item in data:
+                        if isinstance(item, dict):
+                            try:
+                                ids.add(int(item.get(field_name)))
+                            except (TypeError, ValueError):
+                                pass
+                    self.child.preloaded[field_name] = field.get_queryset().in_bulk(ids)
+        return super().to_internal_value(data)
@@ -8,6 +8,14 @@ Componentes principais:
     - INSTALLED_APPS: Lista de aplicativos instalados.
     - MIDDLEWARE: Lista de middlewares para processamento de requisições.
     - DATABASES: Configuração do banco de dados.
+    - CACHES e METRICS_CACHE_TIMEOUT: Configuração do cache das métricas.
+    - METRICS_MAX_WORKERS: Limite de threads das métricas do painel.
+    - STOCK_RESERVATION_TTL: Duração padrão das reservas de estoque.
+    - STOCK_RESERVATION_MAX_TTL: Duração máxima das reservas pedidas pela API.
+    - STOCK_STRIPES_CACHE_TIMEOUT: Duração do estoque somado às faixas em cache.
+    - STOCK_TRIGGERS: Instalação dos gatilhos de estoque do PostgreSQL pela migração.
+    - PAGINATION_ESTIMATE_THRESHOLD: Tamanho a partir do qual as listas estimam o total.
+    - PRODUCT_SEARCH_CONFIG: Idioma da busca textual de produtos.
     - AUTH_PASSWORD_VALIDATORS: Validações de senha.
     - LANGUAGE_CODE e TIME_ZONE: Configurações de internacionalização.
     - STATIC_URL: Caminho para arquivos estáticos.
@@ -49,6 +57,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "authentication",
     "brands",
     "categories",
@@ -114,6 +123,49 @@ DATABASES = {
     },
 }
 
+# ======== Cache ======== #
+# Em produção, substitua o backend de memória local por um backend compartilhado
+# (por exemplo, Redis ou Memcached) para que todos os processos usem as mesmas métricas.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sge",
+    },
+}
+
+# Tempo máximo (em segundos) de permanência das métricas no cache
+METRICS_CACHE_TIMEOUT = 300
+
+# Quantidade máxima de threads usadas pela página inicial assíncrona e pelo endpoint de dados
+# do painel para calcular as métricas; 1 calcula os blocos do endpoint em sequência (indicado
+# quando o banco de dados divide um único processador com a aplicação)
+METRICS_MAX_WORKERS = 6
+
+# ======== Estoque ======== #
+# Duração padrão (em segundos) das reservas de estoque feitas durante as vendas
+STOCK_RESERVATION_TTL = 300
+
+# Duração máxima (em segundos) que a API aceita para uma reserva de estoque, para que uma
+# reserva esquecida não retenha o estoque por tempo indeterminado
+STOCK_RESERVATION_MAX_TTL = 3600
+
+# Tempo máximo (em segundos) de permanência em cache do estoque dos produtos com contador
+# dividido em faixas, usado apenas para exibição
+STOCK_STRIPES_CACHE_TIMEOUT = 5
+
+# Mantém o estoque por gatilhos do PostgreSQL em vez dos sinais (ver products/triggers.py).
+# Aplicado pela migração products.0006_stock_triggers ou pelo comando `stock_triggers`
+STOCK_TRIGGERS = False
+
+# ======== Paginação ======== #
+# Quantidade de registros a partir da qual as listas sem filtros exibem o total estimado pelo
+# planejador do PostgreSQL, em vez de executar um COUNT(*) a cada página
+PAGINATION_ESTIMATE_THRESHOLD = 10000
+
+# ======== Busca ======== #
+# Configuração de idioma da busca textual de produtos do PostgreSQL (ver products/search.py)
+PRODUCT_SEARCH_CONFIG = "portuguese"
+
 # ======== Validações de Senha ======== #
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -138,7 +190,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication"
+        "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
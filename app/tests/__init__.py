@@ -0,0 +1,7 @@
+"""
+Pacote de testes do projeto.
+
+Este pacote contém os testes dos módulos compartilhados do projeto (métricas, paginação e
+índices de busca) e as funções auxiliares de criação de registros usadas pelos testes das
+demais aplicações.
+"""
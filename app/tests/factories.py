@@ -0,0 +1,52 @@
+"""
+Módulo de funções auxiliares para a criação de registros nos testes.
+
+Este módulo define funções que criam categorias, marcas, fornecedores e produtos com valores
+padrão, permitindo que cada teste informe apenas os campos relevantes para o caso testado.
+
+Componentes principais:
+    - create_category: Cria uma categoria.
+    - create_brand: Cria uma marca.
+    - create_supplier: Cria um fornecedor.
+    - create_product: Cria um produto, com categoria e marca, se não informadas.
+
+Dependências:
+    - decimal: Para os preços padrão dos produtos.
+    - brands.models, categories.models, suppliers.models, products.models: Modelos criados.
+"""
+
+from decimal import Decimal
+from brands.models import Brand
+from categories.models import Category
+from products.models import Product
+from suppliers.models import Supplier
+
+
+def create_category(name="Categoria", **kwargs):
+    return Category.objects.create(name=name, **kwargs)
+
+
+def create_brand(name="Marca", **kwargs):
+    return Brand.objects.create(name=name, **kwargs)
+
+
+def create_supplier(name="Fornecedor", **kwargs):
+    return Supplier.objects.create(name=name, **kwargs)
+
+
+def create_product(title="Produto", **kwargs):
+    """
+    Cria um produto com preços padrão (custo 10,00 e venda 15,00).
+
+    Argumentos:
+        title (str): Título do produto.
+        **kwargs: Demais campos do produto; category e brand são criadas se não informadas.
+
+    Retorna:
+        Product: Produto criado.
+    """
+    kwargs.setdefault("category", kwargs.get("category") or create_category())
+    kwargs.setdefault("brand", kwargs.get("brand") or create_brand())
+    kwargs.setdefault("cost_price", Decimal("10.00"))
+    kwargs.setdefault("selling_price", Decimal("15.00"))
+    return Product.objects.create(title=title, **kwargs)
@@ -0,0 +1,59 @@
+"""
+Módulo de testes das métricas de produtos e vendas.
+
+Verifica que as métricas de estoque e de vendas são calculadas em uma única consulta de
+agregação, independentemente da quantidade de registros, e que os totais estão corretos.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase
+from app import metrics
+from outflows.models import Outflow
+from products.models import Product
+from .factories import create_brand, create_category, create_product
+
+
+class MetricsQueryCountTests(TestCase):
+    """
+    Testes da quantidade de consultas das métricas de produtos e vendas.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        category = create_category()
+        brand = create_brand()
+        cls.products = [
+            create_product(f"Produto {i}", category=category, brand=brand, quantity=10)
+            for i in range(5)
+        ]
+        for product in cls.products:
+            Outflow.objects.create(product=product, quantity=2, description="Venda")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_summarize_products_runs_one_query(self):
+        with self.assertNumQueries(1):
+            result = metrics.summarize_products(Product.objects.all())
+        # 5 produtos com 8 unidades restantes após as saídas
+        self.assertEqual(result["total_quantity"], 40)
+
+    def test_summarize_outflows_runs_one_query(self):
+        with self.assertNumQueries(1):
+            result = metrics.summarize_outflows(Outflow.objects.all())
+        self.assertEqual(result["total_sales"], 5)
+        self.assertEqual(result["total_product_sold"], 10)
+
+    def test_get_product_metrics_runs_one_query(self):
+        with self.assertNumQueries(1):
+            metrics.get_product_metrics()
+
+    def test_get_sales_metrics_runs_one_query(self):
+        with self.assertNumQueries(1):
+            result = metrics.get_sales_metrics()
+        self.assertEqual(result["total_sales"], 5)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        create_product("Produto extra", quantity=3)
+        with self.assertNumQueries(1):
+            metrics.summarize_products(Product.objects.all())
@@ -0,0 +1,116 @@
+"""
+Módulo de testes do paginador com contagem estimada.
+
+Verifica que, quando a estimativa do planejador é menor que o total real, as páginas além do
+total estimado são preenchidas e navegáveis, que uma página além do último registro é
+recusada e que, quando a estimativa é maior que o total real, os links de paginação não levam
+a páginas vazias.
+"""
+
+import unittest
+from unittest import mock
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
+from app.pagination import EstimatedCountPaginator
+from brands.models import Brand
+
+
+@override_settings(PAGINATION_ESTIMATE_THRESHOLD=1)
+class EstimatedCountPaginatorTests(TestCase):
+    """
+    Testes do paginador com uma estimativa menor que o total real.
+    """
+
+    def setUp(self):
+        Brand.objects.bulk_create(Brand(name=f"Marca {i:02}") for i in range(25))
+        self.brands = Brand.objects.order_by("name")
+
+    def paginate(self, estimate):
+        with mock.patch("app.pagination.estimate_count", return_value=estimate):
+            paginator = EstimatedCountPaginator(self.brands, 10)
+            self.assertEqual(paginator.count, estimate)
+        return paginator
+
+    def test_pages_beyond_the_estimate_are_filled(self):
+        paginator = self.paginate(12)
+        self.assertTrue(paginator.count_is_estimated)
+        self.assertEqual(paginator.num_pages, 2)
+
+        second = paginator.page(2)
+        self.assertEqual(len(second), 10)
+        self.assertTrue(second.has_next())
+        self.assertEqual(second.end_index(), 20)
+
+        third = paginator.page(second.next_page_number())
+        self.assertEqual(
+            [brand.name for brand in third], [f"Marca {i:02}" for i in range(20, 25)]
+        )
+        self.assertFalse(third.has_next())
+        self.assertEqual(third.end_index(), 25)
+
+    def test_page_past_the_last_row_is_rejected(self):
+        paginator = self.paginate(12)
+        with self.assertRaises(EmptyPage):
+            paginator.page(4)
+
+    def test_links_do_not_pass_the_last_row_when_estimate_is_higher(self):
+        paginator = self.paginate(100)
+        self.assertEqual(paginator.num_pages, 10)
+
+        html = render_to_string("components/_pagination.html", {"page_obj": paginator.page(1)})
+        self.assertIn("?page=2", html)
+        self.assertNotIn("?page=3", html)
+        self.assertNotIn("Última", html)
+
+        html = render_to_string("components/_pagination.html", {"page_obj": paginator.page(3)})
+        self.assertNotIn("?page=4", html)
+        self.assertNotIn("Próxima", html)
+        self.assertNotIn("Última", html)
+        with self.assertRaises(EmptyPage):
+            paginator.page(10)
+
+    def test_exact_count_keeps_last_page_link(self):
+        with override_settings(PAGINATION_ESTIMATE_THRESHOLD=100):
+            paginator = EstimatedCountPaginator(self.brands, 10)
+            html = render_to_string(
+                "components/_pagination.html", {"page_obj": paginator.page(1)}
+            )
+        self.assertIn("?page=3", html)
+        self.assertIn("Última", html)
+
+    def test_exact_count_below_threshold(self):
+        with override_settings(PAGINATION_ESTIMATE_THRESHOLD=100), mock.patch(
+            "app.pagination.estimate_count", return_value=12
+        ):
+            paginator = EstimatedCountPaginator(self.brands, 10)
+            self.assertEqual(paginator.count, 25)
+            self.assertFalse(paginator.count_is_estimated)
+            self.assertFalse(paginator.page(3).has_next())
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "A estimativa do planejador exige o PostgreSQL."
+)
+@override_settings(PAGINATION_ESTIMATE_THRESHOLD=1)
+class EstimatedCountPaginatorPostgresTests(TestCase):
+    """
+    Testes do paginador com a estimativa real de `pg_class.reltuples`, desatualizada.
+    """
+
+    def test_stale_reltuples(self):
+        Brand.objects.bulk_create(Brand(name=f"Marca {i:02}") for i in range(12))
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE brands_brand")
+        # Registros gravados depois da análise não entram na estimativa
+        Brand.objects.bulk_create(Brand(name=f"Marca {i:02}") for i in range(12, 25))
+
+        paginator = EstimatedCountPaginator(Brand.objects.order_by("name"), 10)
+        self.assertEqual(paginator.count, 12)
+        self.assertTrue(paginator.count_is_estimated)
+
+        third = paginator.page(3)
+        self.assertEqual(len(third), 5)
+        self.assertFalse(third.has_next())
+        self.assertTrue(paginator.page(2).has_next())
@@ -0,0 +1,65 @@
+"""
+Módulo de testes dos índices de trigramas do PostgreSQL.
+
+Verifica, pelo plano de execução, que os filtros `__icontains` das listagens usam os índices
+de trigramas declarados nos modelos. Com poucas linhas o planejador prefere varrer a tabela,
+por isso a varredura sequencial é desabilitada na transação do teste: se a expressão do índice
+não coincidisse com a do filtro, o plano continuaria sendo uma varredura sequencial.
+"""
+
+import unittest
+from django.db import connection
+from django.test import TestCase
+from app.tests.factories import create_brand, create_category, create_product, create_supplier
+from brands.models import Brand
+from categories.models import Category
+from products.models import Product
+from suppliers.models import Supplier
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "Os índices de trigramas exigem o PostgreSQL."
+)
+class TrigramIndexPlanTests(TestCase):
+    """
+    Testes do uso dos índices de trigramas pelos filtros `__icontains`.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_product("Parafuso sextavado", serie_number="SX-12345")
+        create_brand("Tramontina")
+        create_category("Ferragens")
+        create_supplier("Distribuidora Central")
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn("Seq Scan", plan)
+
+    def test_product_filters(self):
+        self.assertUsesIndex(
+            Product.objects.filter(title__icontains="sextav"),
+            "products_product_title_trgm",
+        )
+        self.assertUsesIndex(
+            Product.objects.filter(serie_number__icontains="12345"),
+            "products_product_serie_trgm",
+        )
+
+    def test_name_filters(self):
+        self.assertUsesIndex(
+            Brand.objects.filter(name__icontains="montin"), "brands_brand_name_trgm"
+        )
+        self.assertUsesIndex(
+            Category.objects.filter(name__icontains="ragen"),
+            "categories_category_name_trgm",
+        )
+        self.assertUsesIndex(
+            Supplier.objects.filter(name__icontains="central"),
+            "suppliers_supplier_name_trgm",
+        )
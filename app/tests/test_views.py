@@ -0,0 +1,86 @@
+"""
+Módulo de testes das views da página inicial e do endpoint de dados do painel.
+
+Verifica que os blocos do painel são calculados de forma concorrente no pool de métricas,
+que o endpoint retorna todos os blocos que o usuário pode acessar e que a página inicial
+exibe a janela selecionada nos títulos dos gráficos.
+"""
+
+import threading
+import time
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from app.views import DASHBOARD_BLOCK_PERMISSIONS, gather_metrics
+from .factories import create_product
+
+
+class GatherMetricsTests(SimpleTestCase):
+    """
+    Testes do cálculo concorrente dos blocos do painel.
+    """
+
+    def test_blocks_run_concurrently_in_metrics_pool(self):
+        def slow_metric():
+            time.sleep(0.2)
+            return threading.current_thread().name
+
+        calls = {f"block_{i}": slow_metric for i in range(3)}
+        start = time.perf_counter()
+        results = gather_metrics(calls, list(calls))
+        elapsed = time.perf_counter() - start
+
+        # O tempo total se aproxima do bloco mais lento, e não da soma dos três
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(list(results), list(calls))
+        for thread_name in results.values():
+            self.assertTrue(thread_name.startswith("metrics"))
+
+    @override_settings(METRICS_MAX_WORKERS=1)
+    def test_single_worker_runs_blocks_in_request_thread(self):
+        calls = {f"block_{i}": lambda: threading.current_thread().name for i in range(3)}
+        results = gather_metrics(calls, list(calls))
+        self.assertEqual(set(results.values()), {threading.current_thread().name})
+
+    def test_single_block_runs_in_request_thread(self):
+        calls = {"block": lambda: threading.current_thread().name}
+        results = gather_metrics(calls, ["block"])
+        self.assertEqual(results["block"], threading.current_thread().name)
+
+
+class DashboardAPIViewTests(TransactionTestCase):
+    """
+    Testes do endpoint de dados do painel (as threads do pool usam conexões próprias e, por
+    isso, os dados precisam estar confirmados).
+    """
+
+    def setUp(self):
+        cache.clear()
+        create_product(quantity=5)
+        self.user = User.objects.create_superuser("admin", "admin@sge.local", "admin")
+        self.client.force_login(self.user)
+
+    def test_returns_all_blocks(self):
+        response = self.client.get(reverse("dashboard-api-view"))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(set(data), set(DASHBOARD_BLOCK_PERMISSIONS))
+        self.assertEqual(data["product_metrics"]["total_quantity"], 5)
+
+
+class HomeViewTests(TestCase):
+    """
+    Testes da página inicial.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser("admin", "admin@sge.local", "admin")
+        self.client.force_login(self.user)
+
+    def test_chart_titles_show_selected_range(self):
+        response = self.client.get(reverse("home"), {"range": 30})
+        self.assertEqual(response.context["daily_sales_range"], 30)
+        self.assertContains(response, "Valor de vendas (Últimos 30 dias)")
+        self.assertContains(response, "Quantidade de vendas (Últimos 30 dias)")
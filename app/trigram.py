@@ -0,0 +1,109 @@
+"""
+Módulo dos índices de trigramas do PostgreSQL.
+
+Este módulo define os índices GIN da extensão `pg_trgm` usados pelos filtros de busca por
+trecho das listagens (`__icontains`). No PostgreSQL, o Django traduz `campo__icontains=valor`
+para `UPPER("campo"::text) LIKE UPPER('%valor%')`, que não pode usar um índice B-tree comum e
+varre a tabela inteira. Os índices são criados sobre a mesma expressão, `UPPER(campo)`, com a
+classe de operadores `gin_trgm_ops`, para que o planejador os use nessas consultas sem
+nenhuma alteração nos filtros das views. Termos com menos de três caracteres não formam
+trigramas e continuam sendo resolvidos por varredura.
+
+Os índices são declarados em `Meta.indexes` de cada modelo e criados pelas migrações com
+`CreateTrigramExtension` e `AddTrigramIndex`, que usa `CREATE INDEX CONCURRENTLY`, sem
+bloquear as gravações nas tabelas. Nos demais bancos (como o banco "dev" em SQLite), que não têm índices
+GIN, é criado um índice comum sobre a mesma expressão, para que o estado das migrações e a
+recriação das tabelas continuem válidos.
+
+Componentes principais:
+    - TrigramIndex: Índice GIN de trigramas sobre `UPPER(campo)`.
+    - CreateTrigramExtension: Operação de migração que cria a extensão `pg_trgm`.
+    - AddTrigramIndex: Operação de migração que cria o índice sem bloquear a tabela.
+
+Dependências:
+    - django.contrib.postgres.indexes: Para as classes GinIndex e OpClass.
+    - django.contrib.postgres.operations: Para as operações AddIndexConcurrently e
+      TrigramExtension.
+    - django.db.migrations: Para a operação AddIndex, usada fora do PostgreSQL.
+    - django.db.models: Para a classe Index e a função Upper.
+"""
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db.migrations import AddIndex
+from django.db.models import Index
+from django.db.models.functions import Upper
+
+
+class TrigramIndex(GinIndex):
+    """
+    Índice GIN de trigramas sobre `UPPER(campo)`, usado pelos filtros `__icontains`.
+
+    Fora do PostgreSQL, o índice é criado como um índice comum sobre `UPPER(campo)`.
+
+    Atributos:
+        field (str): Nome do campo indexado.
+
+    Uso:
+        class Meta:
+            indexes = [TrigramIndex(field="name", name="brands_brand_name_trgm")]
+    """
+
+    def __init__(self, *, field, name):
+        self.field = field
+        super().__init__(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        return "app.trigram.TrigramIndex", (), {"field": self.field, "name": self.name}
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        return Index(Upper(self.field), name=self.name).create_sql(
+            model, schema_editor, **kwargs
+        )
+
+
+class CreateTrigramExtension(TrigramExtension):
+    """
+    Operação de migração que cria a extensão `pg_trgm` no PostgreSQL.
+
+    Igual a `TrigramExtension`, que já ignora os demais bancos ao aplicar a migração, mas
+    também os ignora ao revertê-la.
+    """
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class AddTrigramIndex(AddIndexConcurrently):
+    """
+    Operação de migração que cria um TrigramIndex com `CREATE INDEX CONCURRENTLY`.
+
+    A migração que a utiliza deve declarar `atomic = False`. Fora do PostgreSQL, que não tem
+    `CONCURRENTLY`, o índice é criado como em `AddIndex`.
+
+    Uso:
+        AddTrigramIndex(
+            model_name="brand",
+            index=TrigramIndex(field="name", name="brands_brand_name_trgm"),
+        )
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
@@ -44,6 +44,21 @@ urlpatterns = [
     path("api/v1/", include("authentication.urls")),
     # Rota padrão para a página inicial
     path("", views.home, name="home"),
+    # Variante assíncrona da página inicial (métricas calculadas de forma concorrente)
+    path("async/", views.home_async, name="home_async"),
+    # Rotas para os dados do painel (todos os blocos ou um bloco específico)
+    path(
+        "api/v1/dashboard/",
+        views.DashboardAPIView.as_view(),
+        name="dashboard-api-view",
+    ),
+    path(
+        "api/v1/dashboard/<str:block>/",
+        views.DashboardAPIView.as_view(),
+        name="dashboard-block-api-view",
+    ),
+    # Rota para os contadores do cache de métricas (somente equipe)
+    path("metrics/cache/", views.metrics_cache_stats, name="metrics_cache_stats"),
     # Inclusão das URLs dos apps específicos
     path("", include("brands.urls")),
     path("", include("categories.urls")),
@@ -1,23 +1,194 @@
 """
 Módulo de views para a página inicial (home).
 
-Este módulo define a view `home`, que renderiza a página inicial do sistema. A view coleta
-métricas relacionadas a produtos, vendas e dados diários, e as passa para o template.
+Este módulo define a view `home`, que renderiza a página inicial do sistema, e o endpoint
+`DashboardAPIView`, que fornece os dados do painel em JSON. A view coleta as métricas dos
+cartões e as passa para o template; os gráficos são buscados depois pelo navegador.
 
 Componentes principais:
+    - get_daily_sales_range: Obtém a janela dos gráficos de vendas diárias da query string.
+    - get_dashboard_metric_calls: Retorna as chamadas de métricas (blocos) do painel.
+    - get_home_context: Prepara o contexto do template a partir das métricas calculadas.
+    - run_metric: Executa uma métrica em uma thread do pool e libera sua conexão.
+    - gather_metrics: Calcula vários blocos de forma concorrente no pool de métricas.
     - home: View que renderiza a página inicial com métricas e gráficos.
+    - home_async: Variante assíncrona de `home`, que calcula as métricas de forma concorrente.
+    - metrics_cache_stats: View que retorna os contadores do cache de métricas.
+    - DashboardAPIView: API que retorna os blocos do painel com ETag e GET condicional.
 
 Dependências:
-    - json: Para serializar dados em formato JSON.
+    - asyncio: Para aguardar as métricas calculadas de forma concorrente.
+    - hashlib: Para calcular o ETag do endpoint de dados do painel.
+    - json: Para serializar o estado usado no ETag.
+    - concurrent.futures.ThreadPoolExecutor: Para o pool limitado de threads de métricas.
+    - functools.partial: Para montar as chamadas de métricas.
+    - asgiref.sync.sync_to_async: Para executar código síncrono a partir da view assíncrona.
+    - django.conf.settings: Para o tamanho do pool de threads de métricas.
     - django.contrib.auth.decorators.login_required: Para restringir o acesso a usuários autenticados.
+    - django.contrib.admin.views.decorators.staff_member_required: Para restringir o acesso à equipe.
+    - django.db.close_old_connections: Para liberar as conexões abertas pelas threads de métricas.
+    - django.http.JsonResponse: Para retornar respostas em JSON.
     - django.shortcuts.render: Para renderizar o template.
+    - django.utils: Para o dia atual e o tratamento de ETag e Cache-Control.
+    - rest_framework, rest_framework_simplejwt: Para o endpoint de dados do painel.
     - .metrics: Para obter as métricas e dados necessários.
+    - .metrics_cache: Para os contadores do cache de métricas.
 """
 
+import asyncio
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.db import close_old_connections
+from django.http import JsonResponse
 from django.shortcuts import render
-from . import metrics
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import NotFound, PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from . import metrics, metrics_cache
+
+# Blocos calculados no servidor pela página inicial (os gráficos são buscados pelo navegador)
+HOME_METRIC_BLOCKS = ("product_metrics", "sales_metrics")
+
+# Permissão necessária para acessar cada bloco do painel
+DASHBOARD_BLOCK_PERMISSIONS = {
+    "product_metrics": "products.view_product",
+    "sales_metrics": "outflows.view_outflow",
+    "daily_sales_data": "outflows.view_outflow",
+    "daily_sales_quantity_data": "outflows.view_outflow",
+    "product_count_by_category": "products.view_product",
+    "product_count_by_brand": "products.view_product",
+}
+
+# Pool limitado de threads usado pela view home_async e pelo endpoint de dados do painel para
+# calcular as métricas de forma concorrente
+metrics_executor = ThreadPoolExecutor(
+    max_workers=settings.METRICS_MAX_WORKERS, thread_name_prefix="metrics"
+)
+
+
+def get_daily_sales_range(request):
+    """
+    Obtém a janela dos gráficos de vendas diárias a partir da requisição.
+
+    Lê o parâmetro `range` da query string e o aceita apenas se for uma das janelas
+    definidas em `metrics.DAILY_SALES_RANGES`; caso contrário, usa a janela padrão.
+
+    Argumentos:
+        request (HttpRequest): Objeto de requisição HTTP.
+
+    Retorna:
+        int: Quantidade de dias da janela selecionada.
+    """
+    value = request.GET.get("range", "")
+    if value.isdigit() and int(value) in metrics.DAILY_SALES_RANGES:
+        return int(value)
+    return metrics.DEFAULT_DAILY_SALES_RANGE
+
+
+def get_dashboard_metric_calls(daily_sales_range):
+    """
+    Retorna as chamadas de métricas (blocos) do painel.
+
+    Cada chamada é independente das demais, o que permite executá-las em sequência
+    (view `home`), de forma concorrente (view `home_async`) ou individualmente
+    (endpoint `DashboardAPIView`).
+
+    Argumentos:
+        daily_sales_range (int): Janela, em dias, dos gráficos de vendas diárias.
+
+    Retorna:
+        dict: Um dicionário que mapeia o nome de cada bloco para uma chamada sem argumentos.
+    """
+    return dict(
+        product_metrics=partial(metrics.get_product_metrics),
+        sales_metrics=partial(metrics.get_sales_metrics),
+        daily_sales_data=partial(metrics.get_daily_sales_data, daily_sales_range),
+        daily_sales_quantity_data=partial(
+            metrics.get_daily_sales_quantity_data, daily_sales_range
+        ),
+        product_count_by_category=partial(
+            metrics.get_graphic_product_category_metric, top=metrics.GRAPHIC_TOP_N
+        ),
+        product_count_by_brand=partial(
+            metrics.get_graphic_product_brand_metric, top=metrics.GRAPHIC_TOP_N
+        ),
+    )
+
+
+def get_home_context(daily_sales_range, results):
+    """
+    Prepara o contexto do template `home.html` a partir das métricas calculadas.
+
+    Os dados dos gráficos não fazem parte do contexto: o template os busca de forma
+    assíncrona no endpoint `DashboardAPIView`.
+
+    Argumentos:
+        daily_sales_range (int): Janela, em dias, dos gráficos de vendas diárias.
+        results (dict): Resultados dos blocos listados em `HOME_METRIC_BLOCKS`.
+
+    Retorna:
+        dict: Contexto do template.
+    """
+    return {
+        "daily_sales_range": daily_sales_range,
+        "daily_sales_ranges": metrics.DAILY_SALES_RANGES,
+        "product_metrics": results["product_metrics"],
+        "sales_metrics": results["sales_metrics"],
+    }
+
+
+def run_metric(call):
+    """
+    Executa uma chamada de métrica em uma thread do pool de métricas.
+
+    Ao final, libera a conexão com o banco de dados aberta pela thread, respeitando
+    `CONN_MAX_AGE`, já que ela não participa do ciclo de requisição do Django.
+
+    Argumentos:
+        call (callable): Chamada de métrica sem argumentos.
+
+    Retorna:
+        O resultado da chamada.
+    """
+    try:
+        return call()
+    finally:
+        close_old_connections()
+
+
+def gather_metrics(calls, names):
+    """
+    Calcula vários blocos do painel de forma concorrente, no pool de métricas.
+
+    Cada bloco é executado em uma thread do pool limitado por `METRICS_MAX_WORKERS`, de modo
+    que o tempo total se aproxima do bloco mais lento, e não da soma de todos, quando o banco
+    de dados tem processadores livres para as consultas simultâneas. Um único bloco, ou
+    qualquer bloco com `METRICS_MAX_WORKERS` igual a 1, é calculado na própria thread da
+    requisição.
+
+    Argumentos:
+        calls (dict): Chamadas de métricas, pelo nome do bloco.
+        names (list): Nomes dos blocos calculados.
+
+    Retorna:
+        dict: Resultado de cada bloco, pelo nome.
+    """
+    if len(names) == 1 or settings.METRICS_MAX_WORKERS <= 1:
+        return {name: calls[name]() for name in names}
+    futures = {name: metrics_executor.submit(run_metric, calls[name]) for name in names}
+    return {name: future.result() for name, future in futures.items()}
 
 
 @login_required(login_url="login")
@@ -25,8 +196,9 @@ def home(request):
     """
     View para a página inicial.
 
-    Esta view coleta métricas relacionadas a produtos, vendas e dados diários,
-    serializa os dados em formato JSON e os passa para o template `home.html`.
+    Esta view coleta as métricas dos cartões de produtos e vendas e renderiza o template
+    `home.html`. Os gráficos são carregados depois, pelo navegador, a partir do endpoint
+    `DashboardAPIView`, para que a página não espere o cálculo de todas as métricas.
 
     Requer autenticação do usuário. Caso o usuário não esteja autenticado,
     redireciona para a página de login.
@@ -37,32 +209,145 @@ def home(request):
     Retorna:
         HttpResponse: Resposta HTTP que renderiza o template `home.html` com o contexto.
 
+    Parâmetros da query string:
+        - range: Janela, em dias, dos gráficos de vendas diárias (7, 30, 90 ou 365).
+
     Contexto:
+        - daily_sales_range: Janela selecionada para os gráficos de vendas diárias.
+        - daily_sales_ranges: Janelas disponíveis para os gráficos de vendas diárias.
         - product_metrics: Métricas relacionadas a produtos.
         - sales_metrics: Métricas relacionadas a vendas.
-        - daily_sales_data: Dados diários de vendas em formato JSON.
-        - daily_sales_quantity_data: Dados diários de quantidade de vendas em formato JSON.
-        - product_count_by_category: Contagem de produtos por categoria em formato JSON.
-        - product_count_by_brand: Contagem de produtos por marca em formato JSON.
-    """
-
-    # Coleta as métricas e dados
-    product_metrics = metrics.get_product_metrics()
-    sales_metrics = metrics.get_sales_metrics()
-    daily_sales_data = metrics.get_daily_sales_data()
-    daily_sales_quantity_data = metrics.get_daily_sales_quantity_data()
-    graphic_product_category_metric = metrics.get_graphic_product_category_metric()
-    graphic_product_brand_metric = metrics.get_graphic_product_brand_metric()
-
-    # Prepara o contexto para o template
-    context = {
-        "product_metrics": product_metrics,
-        "sales_metrics": sales_metrics,
-        "daily_sales_data": json.dumps(daily_sales_data),
-        "daily_sales_quantity_data": json.dumps(daily_sales_quantity_data),
-        "product_count_by_category": json.dumps(graphic_product_category_metric),
-        "product_count_by_brand": json.dumps(graphic_product_brand_metric),
-    }
+    """
+
+    # Define a janela dos gráficos de vendas diárias
+    daily_sales_range = get_daily_sales_range(request)
+
+    # Coleta as métricas dos cartões, uma após a outra
+    calls = get_dashboard_metric_calls(daily_sales_range)
+    results = {name: calls[name]() for name in HOME_METRIC_BLOCKS}
 
     # Renderiza o template com o contexto
+    context = get_home_context(daily_sales_range, results)
     return render(request, "home.html", context=context)
+
+
+@login_required(login_url="login")
+async def home_async(request):
+    """
+    Variante assíncrona da view para a página inicial.
+
+    Calcula as métricas dos cartões da página inicial de forma concorrente, cada uma em
+    uma thread do pool limitado por `METRICS_MAX_WORKERS`, de modo que a latência da página
+    se aproxima da métrica mais lenta, e não da soma de todas. É servida de forma nativa
+    pela aplicação ASGI de `app/asgi.py`.
+
+    Requer autenticação do usuário. Caso o usuário não esteja autenticado,
+    redireciona para a página de login.
+
+    Argumentos:
+        request (HttpRequest): Objeto de requisição HTTP.
+
+    Retorna:
+        HttpResponse: Resposta HTTP que renderiza o template `home.html` com o mesmo
+                      contexto da view `home`.
+    """
+
+    # Define a janela dos gráficos de vendas diárias
+    daily_sales_range = get_daily_sales_range(request)
+
+    # Coleta as métricas dos cartões de forma concorrente
+    calls = get_dashboard_metric_calls(daily_sales_range)
+    values = await asyncio.gather(
+        *(
+            sync_to_async(run_metric, thread_sensitive=False, executor=metrics_executor)(
+                calls[name]
+            )
+            for name in HOME_METRIC_BLOCKS
+        )
+    )
+    results = dict(zip(HOME_METRIC_BLOCKS, values))
+
+    # Renderiza o template com o contexto (as permissões do template consultam o banco)
+    context = get_home_context(daily_sales_range, results)
+    return await sync_to_async(render)(request, "home.html", context=context)
+
+
+@staff_member_required
+def metrics_cache_stats(request):
+    """
+    View que retorna os contadores do cache de métricas.
+
+    Permite que operadores acompanhem a versão atual das chaves de métricas e a quantidade
+    de acertos e falhas do cache. Requer um usuário da equipe (is_staff).
+
+    Argumentos:
+        request (HttpRequest): Objeto de requisição HTTP.
+
+    Retorna:
+        JsonResponse: Resposta JSON com as chaves version, hits e misses.
+    """
+    return JsonResponse(metrics_cache.get_metrics_cache_stats())
+
+
+class DashboardAPIView(APIView):
+    """
+    API view que retorna os dados do painel em JSON.
+
+    Retorna todos os blocos de métricas que o usuário pode acessar ou, se informado na URL,
+    apenas um bloco. Os blocos são calculados de forma concorrente no pool de métricas
+    (ver `gather_metrics`). As respostas trazem um ETag baseado na última atualização de produtos,
+    entradas e saídas (e na versão do cache de métricas, que também muda em exclusões); se o
+    cliente enviar o mesmo ETag em If-None-Match, a resposta é `304 Not Modified`, sem
+    recalcular as métricas. Aceita autenticação por sessão (páginas web) e por JWT.
+
+    Atributos:
+        authentication_classes: Sessão e JWT.
+        permission_classes: Exige usuário autenticado.
+
+    Parâmetros da query string:
+        - range: Janela, em dias, dos gráficos de vendas diárias (7, 30, 90 ou 365).
+
+    Métodos:
+        get_blocks: Retorna os blocos solicitados que o usuário pode acessar.
+        get_etag: Calcula o ETag da resposta.
+        get: Retorna os blocos solicitados ou `304 Not Modified`.
+    """
+
+    authentication_classes = (SessionAuthentication, JWTAuthentication)
+    permission_classes = (IsAuthenticated,)
+
+    def get_blocks(self, request, block=None):
+        if block is not None and block not in DASHBOARD_BLOCK_PERMISSIONS:
+            raise NotFound()
+        blocks = [
+            name
+            for name, permission in DASHBOARD_BLOCK_PERMISSIONS.items()
+            if (block is None or name == block) and request.user.has_perm(permission)
+        ]
+        if block is not None and not blocks:
+            raise PermissionDenied()
+        return blocks
+
+    def get_etag(self, blocks, daily_sales_range):
+        state = [
+            metrics.get_last_updated(),
+            metrics_cache.get_metrics_version(),
+            str(timezone.localdate()),
+            daily_sales_range,
+            blocks,
+        ]
+        return hashlib.md5(json.dumps(state).encode()).hexdigest()
+
+    def get(self, request, block=None):
+        blocks = self.get_blocks(request, block)
+        daily_sales_range = get_daily_sales_range(request)
+        etag = quote_etag(self.get_etag(blocks, daily_sales_range))
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            calls = get_dashboard_metric_calls(daily_sales_range)
+            response = Response(gather_metrics(calls, blocks))
+
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
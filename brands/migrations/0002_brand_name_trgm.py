@@ -0,0 +1,53 @@
+"""
+Módulo de migração para o índice de trigramas das marcas.
+
+Este módulo cria a extensão `pg_trgm`, usada também pelos índices de trigramas das categorias,
+dos fornecedores e dos produtos, e, no PostgreSQL, um índice GIN sobre `UPPER(name)`, a mesma
+expressão gerada pelos filtros `__icontains` da listagem de marcas, para que as buscas por
+trecho deixem de varrer a tabela inteira. Nos demais bancos de dados é criado um índice comum
+sobre a mesma expressão (ver app.trigram).
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - CreateTrigramExtension: Operação que cria a extensão `pg_trgm` no PostgreSQL.
+    - AddTrigramIndex: Operação que cria o índice de trigramas.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - app.trigram: Para a extensão, o índice e a operação que o cria.
+"""
+
+from django.db import migrations
+from app.trigram import AddTrigramIndex, CreateTrigramExtension, TrigramIndex
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para o índice de trigramas das marcas.
+
+    A migração não é atômica, pois o índice é criado com `CREATE INDEX CONCURRENTLY`, sem
+    bloquear as gravações na tabela.
+
+    Atributos:
+        atomic (bool): Indica que a migração não é executada em uma transação.
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - CreateTrigramExtension: Cria a extensão `pg_trgm`, se ainda não existir.
+        - AddTrigramIndex: Cria o índice brands_brand_name_trgm da coluna name.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("brands", "0001_initial"),
+    ]
+
+    operations = [
+        CreateTrigramExtension(),
+        AddTrigramIndex(
+            model_name="brand",
+            index=TrigramIndex(field="name", name="brands_brand_name_trgm"),
+        ),
+    ]
@@ -9,9 +9,11 @@ Componentes principais:
 
 Dependências:
     - django.db.models: Para a definição dos campos e comportamentos do modelo.
+    - app.trigram: Para o índice de trigramas do nome.
 """
 
 from django.db import models
+from app.trigram import TrigramIndex
 
 
 class Brand(models.Model):
@@ -32,6 +34,7 @@ class Brand(models.Model):
 
     Meta:
         - ordering: Ordenação padrão das marcas por nome (ordem alfabética).
+        - indexes: Índice de trigramas do nome, usado pela busca por trecho da listagem.
     """
 
     name = models.CharField(max_length=500)
@@ -41,6 +44,7 @@ class Brand(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [TrigramIndex(field="name", name="brands_brand_name_trgm")]
 
     def __str__(self):
         """
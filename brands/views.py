@@ -21,6 +21,7 @@ Dependências:
     - .models: Para o modelo Brand.
     - .forms: Para o formulário de criação e atualização de Brand.
     - .serializers: Para a serialização do modelo Brand na API.
+    - app.pagination: Para o paginador com contagem estimada.
 """
 
 from rest_framework import generics
@@ -34,6 +35,7 @@ from django.views.generic import (
     DeleteView,
 )
 from . import models, forms, serializers
+from app.pagination import EstimatedCountPaginator
 
 
 class BrandListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
@@ -48,6 +50,7 @@ class BrandListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
         template_name (str): Nome do template usado para renderizar a lista.
         context_object_name (str): Nome do objeto de contexto no template.
         paginate_by (int): Número de itens por página.
+        paginator_class (Paginator): Paginador com total estimado em tabelas grandes.
         permission_required (str): Permissão necessária para acessar a view.
 
     Métodos:
@@ -58,6 +61,7 @@ class BrandListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = "brand_list.html"
     context_object_name = "brands"
     paginate_by = 10
+    paginator_class = EstimatedCountPaginator
     permission_required = "brands.view_brand"
 
     def get_queryset(self):
@@ -9,9 +9,11 @@ Componentes principais:
 
 Dependências:
     - django.db.models: Para a definição dos campos e comportamentos do modelo.
+    - app.trigram: Para o índice de trigramas do nome.
 """
 
 from django.db import models
+from app.trigram import TrigramIndex
 
 
 class Category(models.Model):
@@ -32,6 +34,7 @@ class Category(models.Model):
 
     Meta:
         - ordering: Ordenação padrão das categorias por nome (ordem alfabética).
+        - indexes: Índice de trigramas do nome, usado pela busca por trecho da listagem.
     """
 
     name = models.CharField(max_length=100)
@@ -41,6 +44,7 @@ class Category(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [TrigramIndex(field="name", name="categories_category_name_trgm")]
 
     def __str__(self):
         """
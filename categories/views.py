@@ -21,6 +21,7 @@ Dependências:
     - .models: Para o modelo Category.
     - .forms: Para o formulário de criação e atualização de Category.
     - .serializers: Para a serialização do modelo Category na API.
+    - app.pagination: Para o paginador com contagem estimada.
 """
 
 from rest_framework import generics
@@ -34,6 +35,7 @@ from django.views.generic import (
     DeleteView,
 )
 from . import models, forms, serializers
+from app.pagination import EstimatedCountPaginator
 
 
 class CategoryListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
@@ -48,6 +50,7 @@ class CategoryListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
         template_name (str): Nome do template usado para renderizar a lista.
         context_object_name (str): Nome do objeto de contexto no template.
         paginate_by (int): Número de itens por página.
+        paginator_class (Paginator): Paginador com total estimado em tabelas grandes.
         permission_required (str): Permissão necessária para acessar a view.
 
     Métodos:
@@ -58,6 +61,7 @@ class CategoryListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = "category_list.html"
     context_object_name = "categories"
     paginate_by = 5
+    paginator_class = EstimatedCountPaginator
     permission_required = "categories.view_category"
 
     def get_queryset(self):
@@ -0,0 +1,47 @@
+"""
+Módulo de migração para a paginação por cursor do modelo Inflow.
+
+Este módulo desempata a ordenação padrão das entradas pelo id e cria o índice composto
+(created_at, id), que permite buscar cada página da lista a partir da posição da página
+anterior, sem ler as linhas das páginas anteriores.
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - AlterModelOptions: Operação que altera a ordenação padrão do modelo Inflow.
+    - AddIndex: Operação que cria o índice composto (created_at, id).
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para a definição do índice.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para a paginação por cursor do modelo Inflow.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - AlterModelOptions: Ordena as entradas por data de criação e id (decrescentes).
+        - AddIndex: Cria o índice inflow_created_at_id sobre (created_at, id).
+    """
+
+    dependencies = [
+        ("inflows", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="inflow",
+            options={"ordering": ["-created_at", "-id"]},
+        ),
+        migrations.AddIndex(
+            model_name="inflow",
+            index=models.Index(fields=["created_at", "id"], name="inflow_created_at_id"),
+        ),
+    ]
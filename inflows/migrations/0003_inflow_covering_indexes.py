@@ -0,0 +1,56 @@
+"""
+Módulo de migração para os índices de cobertura do modelo Inflow.
+
+Este módulo cria os índices (product, created_at) e (created_at) das entradas, ambos com a
+quantidade como coluna incluída (`INCLUDE (quantity)`, no PostgreSQL). O primeiro atende ao
+histórico de um produto ordenado por data e às somas por produto; o segundo, às somas por
+período. Com a quantidade no índice, as somas são resolvidas por varredura somente de índice,
+sem ler a tabela.
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - AddIndex: Operação que cria cada um dos índices.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para a definição dos índices.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para os índices de cobertura do modelo Inflow.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - AddIndex: Cria o índice inflow_product_created_at sobre (product, created_at).
+        - AddIndex: Cria o índice inflow_created_at_quantity sobre (created_at).
+    """
+
+    dependencies = [
+        ("inflows", "0002_inflow_created_at_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="inflow",
+            index=models.Index(
+                fields=["product", "created_at"],
+                include=["quantity"],
+                name="inflow_product_created_at",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="inflow",
+            index=models.Index(
+                fields=["created_at"],
+                include=["quantity"],
+                name="inflow_created_at_quantity",
+            ),
+        ),
+    ]
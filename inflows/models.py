@@ -10,11 +10,12 @@ Componentes principais:
 
 Dependências:
     - django.db.models: Para a definição dos campos e relacionamentos do modelo.
+    - django.db.transaction: Para gravar a entrada e a atualização do estoque em conjunto.
     - suppliers.models: Para o relacionamento com o modelo Supplier.
     - products.models: Para o relacionamento com o modelo Product.
 """
 
-from django.db import models
+from django.db import models, transaction
 from suppliers.models import Supplier
 from products.models import Product
 
@@ -35,10 +36,16 @@ class Inflow(models.Model):
         - updated_at: Data e hora da última atualização da entrada.
 
     Métodos:
+        - save: Salva a entrada dentro de uma transação.
         - __str__: Retorna uma representação legível do objeto (nome do produto).
 
     Meta:
-        - ordering: Ordenação padrão das entradas por data de criação (mais recente primeiro).
+        - ordering: Ordenação padrão das entradas por data de criação (mais recente primeiro),
+          desempatada pelo id.
+        - indexes: Índice composto (created_at, id), usado pela paginação por cursor; índice
+          (product, created_at), usado pelo histórico e pelas somas por produto; e índice
+          (created_at), usado pelas somas por período. Os dois últimos incluem a quantidade
+          (INCLUDE, no PostgreSQL), permitindo somá-la sem ler a tabela.
     """
 
     supplier = models.ForeignKey(
@@ -53,7 +60,31 @@ class Inflow(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="inflow_created_at_id"),
+            models.Index(
+                fields=["product", "created_at"],
+                include=["quantity"],
+                name="inflow_product_created_at",
+            ),
+            models.Index(
+                fields=["created_at"],
+                include=["quantity"],
+                name="inflow_created_at_quantity",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Salva a entrada dentro de uma transação.
+
+        O sinal de post_save (atualização do estoque) é disparado dentro do mesmo bloco
+        atômico, de modo que a entrada e o incremento do estoque são gravados ou descartados
+        em conjunto.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         """
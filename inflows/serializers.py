@@ -2,18 +2,37 @@
 Módulo de serialização para o modelo Inflow.
 
 Este módulo define o serializador `InflowSerializer`, que é usado para converter instâncias
-do modelo Inflow em formatos como JSON e vice-versa, facilitando a integração com APIs REST.
+do modelo Inflow em formatos como JSON e vice-versa, facilitando a integração com APIs REST,
+e os serializadores usados no recebimento de entradas em lote.
 
 Componentes principais:
     - InflowSerializer: Serializador para o modelo Inflow.
+    - InflowBulkListSerializer: Serializador de lista que valida e grava várias entradas de uma vez.
+    - InflowBulkSerializer: Serializador de cada entrada recebida em lote.
 
 Dependências:
     - rest_framework.serializers: Para a classe ModelSerializer.
+    - app.metrics_cache: Para a invalidação das métricas em cache.
+    - app.serializers: Para o pré-carregamento dos registros relacionados.
+    - products.stock: Para o lote de escritas de estoque e o livro-razão de estoque.
+    - products.triggers: Para detectar o modo de gatilhos de estoque.
     - inflows.models: Para o modelo Inflow.
+    - products.models: Para o modelo Product.
+    - suppliers.models: Para o modelo Supplier.
 """
 
 from rest_framework import serializers
+from app.metrics_cache import invalidate_metrics_cache
+from app.serializers import PreloadedListSerializer, PreloadedPrimaryKeyRelatedField
 from inflows.models import Inflow
+from products.models import Product
+from products.stock import (
+    adjust_product_quantity,
+    record_stock_movements,
+    stock_batch,
+)
+from products.triggers import stock_triggers_enabled
+from suppliers.models import Supplier
 
 
 class InflowSerializer(serializers.ModelSerializer):
@@ -32,3 +51,76 @@ class InflowSerializer(serializers.ModelSerializer):
     class Meta:
         model = Inflow
         fields = "__all__"
+
+
+class InflowBulkListSerializer(PreloadedListSerializer):
+    """
+    Serializador de lista que valida e grava várias entradas de uma vez.
+
+    Os fornecedores e produtos referenciados por todos os itens são carregados com uma consulta
+    por modelo, pelo PreloadedListSerializer. As entradas são inseridas com `bulk_create` em um
+    bloco `stock_batch`, que grava o estoque com uma única atualização agrupada por produto e
+    as movimentações com uma única inserção, ao final do bloco e na mesma transação. Como o
+    sinal post_save não é disparado pelo `bulk_create`, o estoque e a invalidação das métricas
+    são tratados aqui.
+
+    Métodos:
+        create: Grava as entradas e atualiza o estoque dos produtos envolvidos.
+    """
+
+    def create(self, validated_data):
+        """
+        Grava as entradas e atualiza o estoque dos produtos envolvidos.
+
+        Argumentos:
+            validated_data (list): Lista de dados validados das entradas.
+
+        Retorna:
+            list: Lista de entradas criadas.
+
+        Lógica:
+            - Abre um bloco `stock_batch` (ou usa o de um bloco externo, como uma importação).
+            - Insere todas as entradas com um único `bulk_create`.
+            - Acumula no lote a quantidade positiva de cada entrada e as suas movimentações,
+              como faz o sinal de entrada; o lote as grava ao final do bloco, antes do commit
+              (em uma faixa, para produtos com contador dividido).
+            - Com os gatilhos de estoque instalados, o estoque e o livro-razão são gravados
+              pelo banco de dados e a etapa anterior é ignorada.
+            - Agenda a invalidação das métricas para após o commit.
+        """
+        with stock_batch():
+            inflows = Inflow.objects.bulk_create(
+                [Inflow(**item) for item in validated_data]
+            )
+            if not stock_triggers_enabled():
+                for inflow in inflows:
+                    if inflow.quantity > 0:
+                        adjust_product_quantity(
+                            inflow.product_id, inflow.quantity, inflow.product.stock_stripes
+                        )
+                record_stock_movements(inflows=inflows)
+            invalidate_metrics_cache()
+        return inflows
+
+
+class InflowBulkSerializer(serializers.ModelSerializer):
+    """
+    Serializador de cada entrada recebida em lote.
+
+    Atributos:
+        supplier (PreloadedPrimaryKeyRelatedField): Fornecedor da entrada.
+        product (PreloadedPrimaryKeyRelatedField): Produto da entrada.
+
+    Atributos da classe Meta:
+        model (Model): Modelo associado ao serializador (Inflow).
+        fields (str): Campos do modelo a serem incluídos na serialização.
+        list_serializer_class (ListSerializer): Serializador usado quando `many=True`.
+    """
+
+    supplier = PreloadedPrimaryKeyRelatedField(queryset=Supplier.objects.all())
+    product = PreloadedPrimaryKeyRelatedField(queryset=Product.objects.all())
+
+    class Meta:
+        model = Inflow
+        fields = "__all__"
+        list_serializer_class = InflowBulkListSerializer
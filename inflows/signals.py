@@ -1,27 +1,64 @@
 """
 Módulo de sinais para o modelo Inflow.
 
-Este módulo define um sinal que atualiza a quantidade de um produto no estoque
-sempre que uma nova entrada (Inflow) é criada.
+Este módulo define os sinais que atualizam a quantidade de um produto no estoque sempre que
+uma entrada (Inflow) é criada, alterada ou excluída, e um sinal que invalida as métricas em
+cache. Como nos gatilhos de estoque (products.triggers), a alteração do produto ou da
+quantidade de uma entrada estorna a movimentação antiga e aplica a nova, e a exclusão estorna
+a movimentação. Gravações que não disparam sinais (`QuerySet.update` e SQL direto) só são
+refletidas no estoque com os gatilhos instalados.
 
 Componentes principais:
+    - remember_stock_movement: Função que guarda o produto e a quantidade antes da alteração.
     - update_product_quantity: Função que ajusta a quantidade do produto com base na entrada.
+    - revert_product_quantity: Função que estorna a entrada excluída do estoque do produto.
+    - invalidate_metrics: Função que invalida as métricas em cache.
 
 Dependências:
-    - django.db.models.signals: Para o sinal post_save.
+    - django.db.models.signals: Para os sinais pre_save, post_save e post_delete.
     - django.dispatch: Para o decorador receiver.
+    - app.metrics_cache: Para a invalidação das métricas em cache.
+    - products.stock: Para a atualização atômica do estoque e o livro-razão de estoque.
+    - products.triggers: Para detectar o modo de gatilhos de estoque.
     - .models: Para o modelo Inflow.
 """
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
+from app.metrics_cache import invalidate_metrics_cache
+from products.stock import (
+    adjust_product_quantity,
+    record_stock_change,
+    record_stock_movements,
+)
+from products.triggers import stock_triggers_enabled
 from .models import Inflow
 
 
+@receiver(pre_save, sender=Inflow)
+def remember_stock_movement(sender, instance, **kwargs):
+    """
+    Guarda o produto, a quantidade e as faixas do contador do produto gravados de uma
+    entrada que será alterada.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Inflow).
+        instance: Instância do modelo Inflow que será salva.
+        **kwargs: Argumentos adicionais passados pelo sinal.
+    """
+    instance._stock_movement = None
+    if not instance._state.adding and not stock_triggers_enabled():
+        instance._stock_movement = (
+            Inflow.objects.filter(pk=instance.pk)
+            .values_list("product_id", "quantity", "product__stock_stripes")
+            .first()
+        )
+
+
 @receiver(post_save, sender=Inflow)
 def update_product_quantity(sender, instance, created, **kwargs):
     """
-    Atualiza a quantidade de um produto no estoque após a criação de uma entrada.
+    Atualiza a quantidade de um produto no estoque após a criação ou alteração de uma entrada.
 
     Esta função é disparada pelo sinal post_save do modelo Inflow. Quando uma nova entrada é criada,
     ela aumenta a quantidade do produto associado com base na quantidade da entrada.
@@ -33,12 +70,65 @@ def update_product_quantity(sender, instance, created, **kwargs):
         **kwargs: Argumentos adicionais passados pelo sinal.
 
     Lógica:
-        - Verifica se a instância foi criada (created=True).
-        - Se a quantidade da entrada for maior que 0, adiciona essa quantidade ao estoque do produto.
-        - Salva as alterações no produto.
+        - Verifica se a instância foi criada (created=True) e se o estoque não é mantido pelos
+          gatilhos do banco de dados (products.triggers).
+        - Se a quantidade da entrada for maior que 0, adiciona essa quantidade ao estoque do produto
+          com um UPDATE atômico, que altera apenas a quantidade e a data de atualização (ou uma
+          faixa do contador, para produtos com contador dividido).
+        - Registra a movimentação no livro-razão de estoque.
+        - Se uma entrada existente teve o produto ou a quantidade alterados, estorna a
+          movimentação antiga e aplica a nova (em uma faixa, para produtos com contador
+          dividido).
     """
+    if stock_triggers_enabled():
+        return
     if created:
         if instance.quantity > 0:
-            product = instance.product
-            product.quantity += instance.quantity
-            product.save()
+            adjust_product_quantity(
+                instance.product_id, instance.quantity, instance.product.stock_stripes
+            )
+            record_stock_movements(inflows=[instance])
+        return
+
+    previous = getattr(instance, "_stock_movement", None)
+    if previous is None or previous[:2] == (instance.product_id, instance.quantity):
+        return
+    product_id, quantity, stripes = previous
+    if quantity > 0:
+        record_stock_change(product_id, -quantity, inflow=instance, stripes=stripes)
+    if instance.quantity > 0:
+        record_stock_change(
+            instance.product_id,
+            instance.quantity,
+            inflow=instance,
+            stripes=instance.product.stock_stripes,
+        )
+
+
+@receiver(post_delete, sender=Inflow)
+def revert_product_quantity(sender, instance, **kwargs):
+    """
+    Estorna do estoque do produto a quantidade de uma entrada excluída.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Inflow).
+        instance: Instância do modelo Inflow que foi excluída.
+        **kwargs: Argumentos adicionais passados pelo sinal.
+    """
+    if not stock_triggers_enabled() and instance.quantity > 0:
+        record_stock_change(
+            instance.product_id, -instance.quantity, stripes=instance.product.stock_stripes
+        )
+
+
+@receiver([post_save, post_delete], sender=Inflow)
+def invalidate_metrics(sender, instance, **kwargs):
+    """
+    Invalida as métricas em cache após a gravação ou exclusão de uma entrada.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Inflow).
+        instance: Instância do modelo Inflow que foi salva ou excluída.
+        **kwargs: Argumentos adicionais passados pelo sinal.
+    """
+    invalidate_metrics_cache()
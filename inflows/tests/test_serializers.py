@@ -0,0 +1,58 @@
+"""
+Módulo de testes do recebimento de entradas em lote.
+
+Verifica que o serializador de entradas em lote grava o estoque e o livro-razão por meio de um
+bloco `stock_batch`: com uma quantidade fixa de consultas, qualquer que seja a quantidade de
+linhas, e dentro da transação das entradas, antes das tarefas agendadas para o commit.
+"""
+
+from django.test import TestCase
+from app.tests.factories import create_product, create_supplier
+from inflows.serializers import InflowBulkSerializer
+from products.models import StockMovement
+
+
+class InflowBulkSerializerTests(TestCase):
+    """
+    Testes da gravação de entradas em lote.
+    """
+
+    def setUp(self):
+        self.supplier = create_supplier()
+        self.products = [create_product(f"Produto {i}", quantity=10) for i in range(5)]
+
+    def save_inflows(self, rows):
+        data = [
+            {
+                "supplier": self.supplier.pk,
+                "product": self.products[i % len(self.products)].pk,
+                "quantity": 2,
+            }
+            for i in range(rows)
+        ]
+        serializer = InflowBulkSerializer(data=data, many=True)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_query_count_does_not_depend_on_rows(self):
+        # Fornecedores, produtos, savepoint, entradas, estoque, livro-razão e liberação
+        with self.assertNumQueries(7):
+            self.save_inflows(2)
+        with self.assertNumQueries(7):
+            self.save_inflows(50)
+
+        self.products[0].refresh_from_db()
+        self.assertEqual(self.products[0].quantity, 10 + 2 + 10 * 2)
+
+    def test_stock_is_written_before_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            inflows = self.save_inflows(10)
+
+            # O lote já gravou o estoque e o livro-razão; só a invalidação das métricas
+            # aguarda o commit
+            self.products[0].refresh_from_db()
+            self.assertEqual(self.products[0].quantity, 10 + 2 * 2)
+            self.assertEqual(
+                StockMovement.objects.filter(inflow__in=inflows).count(), 10
+            )
+        self.assertTrue(callbacks)
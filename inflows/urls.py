@@ -9,6 +9,7 @@ Componentes principais:
     - URL para criar novas entradas de produtos (inflow_create).
     - URL para detalhar uma entrada específica (inflow_detail).
     - URL para listar e criar entradas via API (inflow-create-list-api-view).
+    - URL para criar várias entradas em uma única requisição via API (inflow-bulk-create-api-view).
     - URL para recuperar detalhes de uma entrada via API (inflow-detail-api-view).
 
 Dependências:
@@ -40,6 +41,11 @@ urlpatterns = [
         views.InflowCreateListAPIView.as_view(),
         name="inflow-create-list-api-view",
     ),
+    path(
+        "api/v1/inflows/bulk/",
+        views.InflowBulkCreateAPIView.as_view(),
+        name="inflow-bulk-create-api-view",
+    ),
     path(
         "api/v1/inflows/<int:pk>/",
         views.InflowRetrieveAPIView.as_view(),
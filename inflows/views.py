@@ -9,16 +9,18 @@ Componentes principais:
     - InflowCreateView: View para criar novas entradas de produtos.
     - InflowDetailView: View para exibir detalhes de uma entrada específica.
     - InflowCreateListAPIView: API view para listar e criar entradas de produtos.
+    - InflowBulkCreateAPIView: API view para criar várias entradas de produtos em uma única requisição.
     - InflowRetrieveAPIView: API view para recuperar detalhes de uma entrada específica.
 
 Dependências:
-    - rest_framework.generics: Para as views de API (ListCreateAPIView, RetrieveAPIView).
+    - rest_framework.generics: Para as views de API (ListCreateAPIView, CreateAPIView, RetrieveAPIView).
     - django.contrib.auth.mixins: Para controle de autenticação e permissões (LoginRequiredMixin, PermissionRequiredMixin).
     - django.views.generic: Para as views baseadas em classes (ListView, CreateView, DetailView).
     - django.urls: Para redirecionamento de URLs (reverse_lazy).
     - .models: Para o modelo Inflow.
     - .forms: Para o formulário de criação de Inflow.
     - .serializers: Para a serialização do modelo Inflow na API.
+    - app.pagination: Para a paginação por cursor da lista e da API.
 """
 
 from rest_framework import generics
@@ -30,14 +32,19 @@ from django.views.generic import (
     DetailView,
 )
 from . import models, forms, serializers
+from app.pagination import KeysetPagination, KeysetPaginationMixin
 
 
-class InflowListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class InflowListView(
+    LoginRequiredMixin, PermissionRequiredMixin, KeysetPaginationMixin, ListView
+):
     """
     View para listar entradas de produtos (Inflows).
 
     Esta view exibe uma lista paginada de entradas de produtos, com suporte para filtragem
-    por título do produto. Requer autenticação e permissão para visualizar entradas.
+    por título do produto. Requer autenticação e permissão para visualizar entradas. A
+    paginação é por cursor sobre (created_at, id), de modo que o custo de uma página não
+    depende da sua posição na lista.
 
     Atributos:
         model (Model): Modelo associado à view (Inflow).
@@ -108,16 +115,48 @@ class InflowCreateListAPIView(generics.ListCreateAPIView):
     """
     API View para listar e criar entradas de produtos (Inflows).
 
-    Esta view permite listar todas as entradas de produtos e criar novas entradas
-    via API REST.
+    Esta view permite listar as entradas de produtos, paginadas por cursor, e criar novas
+    entradas via API REST.
 
     Atributos:
         queryset (QuerySet): Conjunto de dados usado para listar entradas.
         serializer_class (Serializer): Classe de serialização para o modelo Inflow.
+        pagination_class (Pagination): Paginação por cursor sobre (created_at, id).
     """
 
     queryset = models.Inflow.objects.all()
     serializer_class = serializers.InflowSerializer
+    pagination_class = KeysetPagination
+
+
+class InflowBulkCreateAPIView(generics.CreateAPIView):
+    """
+    API View para criar várias entradas de produtos (Inflows) em uma única requisição.
+
+    Esta view recebe uma lista de entradas, como as linhas de uma entrega de fornecedor,
+    valida todas de uma vez e as grava com `bulk_create`, aplicando uma única atualização
+    agrupada de estoque por produto na mesma transação.
+
+    Atributos:
+        queryset (QuerySet): Conjunto de dados usado para verificar as permissões do modelo.
+        serializer_class (Serializer): Classe de serialização das entradas em lote.
+
+    Métodos:
+        get_serializer: Retorna o serializador de lista para os dados recebidos.
+    """
+
+    queryset = models.Inflow.objects.all()
+    serializer_class = serializers.InflowBulkSerializer
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        Retorna o serializador de lista para os dados recebidos.
+
+        Retorna:
+            InflowBulkListSerializer: Serializador que valida e grava todas as entradas.
+        """
+        kwargs["many"] = True
+        return super().get_serializer(*args, **kwargs)
 
 
 class InflowRetrieveAPIView(generics.RetrieveAPIView):
@@ -6,10 +6,12 @@ permitindo a visualização e edição de saídas de produtos no painel de admin
 
 Componentes principais:
     - OutflowAdmin: Classe que personaliza a exibição e a pesquisa de registros de Outflow no painel de administração.
+    - SaleAdmin: Classe que exibe as vendas e suas saídas no painel de administração.
+    - DailySalesSummaryAdmin: Classe que exibe o resumo diário de vendas no painel de administração.
 
 Dependências:
     - django.contrib.admin: Para o registro e configuração do modelo no painel de administração.
-    - .models: Para o modelo Outflow.
+    - .models: Para os modelos Outflow, Sale e DailySalesSummary.
 """
 
 from django.contrib import admin
@@ -39,3 +41,69 @@ class OutflowAdmin(admin.ModelAdmin):
 
 # Registra o modelo Outflow com a classe OutflowAdmin no painel de administração
 admin.site.register(models.Outflow, OutflowAdmin)
+
+
+class SaleOutflowInline(admin.TabularInline):
+    """
+    Exibe, somente para leitura, as saídas de uma venda na página da venda.
+
+    Atributos:
+        model (Model): Modelo exibido na listagem (Outflow).
+        fields (tuple): Campos exibidos de cada saída.
+        readonly_fields (tuple): Campos que não podem ser editados.
+        extra (int): Quantidade de formulários vazios exibidos.
+        can_delete (bool): Indica se as saídas podem ser excluídas pela venda.
+
+    Métodos:
+        has_add_permission: Impede a inclusão de saídas pela página da venda.
+    """
+
+    model = models.Outflow
+    fields = ("product", "quantity", "unit_selling_price", "unit_cost_price")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class SaleAdmin(admin.ModelAdmin):
+    """
+    Configurações de administração para o modelo Sale.
+
+    Atributos:
+        list_display (tuple): Campos a serem exibidos na lista de registros.
+        search_fields (tuple): Campos pelos quais a pesquisa pode ser realizada.
+        inlines (list): Saídas exibidas na página da venda.
+    """
+
+    list_display = ("__str__", "description", "created_at")
+    search_fields = ("description",)
+    inlines = [SaleOutflowInline]
+
+
+# Registra o modelo Sale com a classe SaleAdmin no painel de administração
+admin.site.register(models.Sale, SaleAdmin)
+
+
+class DailySalesSummaryAdmin(admin.ModelAdmin):
+    """
+    Configurações de administração para o modelo DailySalesSummary.
+
+    Esta classe define como os registros do resumo diário de vendas são exibidos e pesquisados
+    no painel de administração do Django.
+
+    Atributos:
+        list_display (tuple): Campos a serem exibidos na lista de registros.
+        list_filter (tuple): Campos disponíveis para filtragem.
+        search_fields (tuple): Campos pelos quais a pesquisa pode ser realizada.
+    """
+
+    list_display = ("date", "product", "sales_count", "quantity", "revenue", "cost")
+    list_filter = ("date",)
+    search_fields = ("product__title",)
+
+
+# Registra o modelo DailySalesSummary com a classe DailySalesSummaryAdmin no painel de administração
+admin.site.register(models.DailySalesSummary, DailySalesSummaryAdmin)
@@ -2,7 +2,9 @@
 Módulo de formulário para o modelo Outflow.
 
 Este módulo define um formulário para criar e editar instâncias do modelo Outflow,
-utilizado em views baseadas em formulários na interface web, com validação de quantidade.
+utilizado em views baseadas em formulários na interface web, com validação de quantidade
+contra o estoque disponível (estoque menos as reservas ativas) e suporte a uma reserva
+de estoque feita previamente para a venda.
 
 Componentes principais:
     - OutflowForm: Formulário que mapeia campos do modelo Outflow e valida a quantidade.
@@ -10,13 +12,23 @@ Componentes principais:
 Dependências:
     - django.forms: Para a criação de formulários baseados em modelos.
     - django.core.exceptions: Para a exceção ValidationError.
+    - django.db.transaction: Para gravar a saída e consumir a reserva em conjunto.
+    - products.reservations: Para o estoque disponível e o consumo das reservas.
     - .models: Para o modelo Outflow.
 """
 
 from django import forms
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from products.reservations import (
+    active_reservations,
+    consume_reservation,
+    get_available_quantity,
+)
 from . import models
 
+RESERVATION_ERROR = "A reserva de estoque expirou ou não pertence a este produto."
+
 
 class OutflowForm(forms.ModelForm):
     """
@@ -30,6 +42,7 @@ class OutflowForm(forms.ModelForm):
 
     Campos:
         product: Produto associado à saída (chave estrangeira).
+        reservation: Token opcional de uma reserva de estoque feita para a venda (oculto).
         quantity: Quantidade de itens a serem retirados.
         description: Descrição da saída.
 
@@ -44,12 +57,18 @@ class OutflowForm(forms.ModelForm):
         description: "Descrição".
 
     Métodos:
-        clean_quantity: Valida se a quantidade não excede o estoque do produto.
+        clean_reservation: Valida se a reserva informada está ativa e pertence ao produto.
+        clean_quantity: Valida se a quantidade não excede o estoque disponível do produto.
+        save: Salva a saída e consome a reserva na mesma transação.
 
     Exceções:
-        ValidationError: Levantada se a quantidade for maior que o estoque disponível.
+        ValidationError: Levantada se a quantidade for maior que o estoque disponível, ou se
+            a reserva deixar de estar ativa antes de ser consumida.
     """
 
+    reservation = forms.UUIDField(required=False, widget=forms.HiddenInput)
+    field_order = ["product", "reservation", "quantity", "description"]
+
     class Meta:
         model = models.Outflow
         fields = ["product", "quantity", "description"]
@@ -64,12 +83,31 @@ class OutflowForm(forms.ModelForm):
             "quantity": "Quantidade",
         }
 
+    def clean_reservation(self):
+        """
+        Valida o campo reservation, retornando a reserva ativa correspondente.
+
+        Retorna:
+            StockReservation: A reserva ativa, ou None se nenhuma reserva foi informada.
+
+        Levanta:
+            ValidationError: Se a reserva estiver expirada, tiver sido usada ou pertencer a outro produto.
+        """
+        token = self.cleaned_data.get("reservation")
+        if token is None:
+            return None
+        product = self.cleaned_data.get("product")
+        reservation = active_reservations().filter(token=token).first()
+        if reservation is None or (product and reservation.product_id != product.pk):
+            raise ValidationError(RESERVATION_ERROR)
+        return reservation
+
     def clean_quantity(self):
         """
-        Valida o campo quantity para garantir que não exceda o estoque do produto.
+        Valida o campo quantity para garantir que não exceda o estoque disponível do produto.
 
-        Recupera a quantidade e o produto dos dados validados e verifica se a quantidade
-        solicitada é menor ou igual ao estoque disponível.
+        O estoque disponível é a quantidade do produto menos as reservas ativas, desconsiderando
+        a reserva da própria venda, quando informada.
 
         Retorna:
             O valor validado de quantity.
@@ -79,8 +117,39 @@ class OutflowForm(forms.ModelForm):
         """
         quantity = self.cleaned_data.get("quantity")
         product = self.cleaned_data.get("product")
-        if quantity > product.quantity:
+        if product is None:
+            return quantity
+        reservation = self.cleaned_data.get("reservation")
+        available = get_available_quantity(
+            product, exclude=[reservation.token] if reservation else None
+        )
+        if quantity > available:
             raise ValidationError(
-                f"A quantidade disponível em estoque para o produto {product.title} é de {product.quantity} unidades."
+                f"A quantidade disponível em estoque para o produto {product.title} é de {available} unidades."
             )
         return quantity
+
+    def save(self, commit=True):
+        """
+        Salva a saída e consome a reserva informada na mesma transação.
+
+        A reserva validada em `clean_reservation` pode expirar ou ser consumida por outra
+        venda antes da gravação. Nesse caso, a transação é desfeita, incluindo a saída e a
+        baixa de estoque feita pelos sinais.
+
+        Argumentos:
+            commit (bool): Indica se a saída deve ser gravada no banco de dados.
+
+        Retorna:
+            Outflow: A saída salva.
+
+        Levanta:
+            ValidationError: Se a reserva não estiver mais ativa ao ser consumida.
+        """
+        reservation = self.cleaned_data.get("reservation")
+        with transaction.atomic():
+            outflow = super().save(commit)
+            if commit and reservation is not None:
+                if not consume_reservation(reservation.token):
+                    raise ValidationError(RESERVATION_ERROR)
+        return outflow
@@ -0,0 +1,137 @@
+"""
+Módulo do comando de reconstrução do resumo diário de vendas.
+
+Este módulo define o comando `rebuild_daily_sales_summary`, que recalcula o modelo
+DailySalesSummary a partir do histórico de saídas. O recálculo é feito em lotes de IDs de
+produtos: cada lote apaga e recria seus registros de resumo em uma transação própria, com uma
+única consulta agrupada por dia e produto, mantendo o uso de memória limitado ao lote.
+
+A categoria e a marca de cada registro são as atuais do produto. Com `--orphaned`, apenas os
+produtos cujos registros perderam a categoria ou a marca (por exclusão delas) são
+reconstruídos.
+
+Componentes principais:
+    - Command: Comando de gerenciamento que reconstrói o resumo diário de vendas.
+
+Uso:
+    python manage.py rebuild_daily_sales_summary [--batch-size 1000]
+    python manage.py rebuild_daily_sales_summary --orphaned
+
+Dependências:
+    - django.core.management.base: Para a classe BaseCommand.
+    - django.db: Para controle de transações e funções de agregação.
+    - outflows.models: Para os modelos Outflow e DailySalesSummary.
+    - products.models: Para o modelo Product.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from outflows.models import Outflow, DailySalesSummary
+from products.models import Product
+
+
+class Command(BaseCommand):
+    """
+    Comando que reconstrói o resumo diário de vendas a partir do histórico de saídas.
+
+    Argumentos:
+        --batch-size: Quantidade de IDs de produtos processados por lote (padrão: 1000).
+        --orphaned: Reconstrói apenas os produtos com registros sem categoria ou marca.
+    """
+
+    help = "Reconstrói o resumo diário de vendas a partir do histórico de saídas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Quantidade de IDs de produtos processados por lote.",
+        )
+        parser.add_argument(
+            "--orphaned",
+            action="store_true",
+            help="Reconstrói apenas os produtos com registros sem categoria ou marca.",
+        )
+
+    def handle(self, *args, **options):
+        if options["orphaned"]:
+            return self.rebuild_orphaned()
+
+        batch_size = options["batch_size"]
+        bounds = Product.objects.aggregate(first_id=Min("id"), last_id=Max("id"))
+        if bounds["first_id"] is None:
+            DailySalesSummary.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS("Nenhum produto cadastrado."))
+            return
+
+        total = 0
+        for start in range(bounds["first_id"], bounds["last_id"] + 1, batch_size):
+            total += self.rebuild_batch(start, start + batch_size)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Resumo diário de vendas reconstruído: {total} registros.")
+        )
+
+    def rebuild_orphaned(self):
+        """
+        Reconstrói o resumo dos produtos com registros sem categoria ou marca.
+        """
+        product_ids = (
+            DailySalesSummary.objects.filter(Q(category=None) | Q(brand=None))
+            .values_list("product_id", flat=True)
+            .distinct()
+            .order_by("product_id")
+        )
+        total = 0
+        for product_id in list(product_ids):
+            total += self.rebuild_batch(product_id, product_id + 1)
+        self.stdout.write(
+            self.style.SUCCESS(f"Resumo diário de vendas reconstruído: {total} registros.")
+        )
+
+    def rebuild_batch(self, start, end):
+        """
+        Reconstrói o resumo dos produtos com IDs no intervalo [start, end).
+
+        Argumentos:
+            start (int): Primeiro ID de produto do lote.
+            end (int): ID de produto final do lote (exclusivo).
+
+        Retorna:
+            int: Quantidade de registros de resumo criados para o lote.
+        """
+        rows = (
+            Outflow.objects.filter(product_id__gte=start, product_id__lt=end)
+            .annotate(date=TruncDate("created_at"))
+            .values("date", "product_id", "product__category_id", "product__brand_id")
+            .annotate(
+                total_sales=Count("id"),
+                total_quantity=Sum("quantity"),
+                total_revenue=Sum(F("unit_selling_price") * F("quantity")),
+                total_cost=Sum(F("unit_cost_price") * F("quantity")),
+            )
+            .order_by()
+        )
+        with transaction.atomic():
+            DailySalesSummary.objects.filter(
+                product_id__gte=start, product_id__lt=end
+            ).delete()
+            created = DailySalesSummary.objects.bulk_create(
+                [
+                    DailySalesSummary(
+                        date=row["date"],
+                        product_id=row["product_id"],
+                        category_id=row["product__category_id"],
+                        brand_id=row["product__brand_id"],
+                        sales_count=row["total_sales"],
+                        quantity=row["total_quantity"],
+                        revenue=row["total_revenue"],
+                        cost=row["total_cost"],
+                    )
+                    for row in rows
+                ]
+            )
+        return len(created)
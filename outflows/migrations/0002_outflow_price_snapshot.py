@@ -0,0 +1,52 @@
+"""
+Módulo de migração para os preços unitários do modelo Outflow.
+
+Este módulo adiciona ao modelo Outflow as colunas que registram o preço de venda e o preço
+de custo do produto no momento da saída. As colunas são criadas como opcionais para que
+os registros existentes possam ser preenchidos pela migração seguinte.
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - AddField: Operações que adicionam os campos de preço ao modelo Outflow.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para a definição dos campos do modelo.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para os preços unitários do modelo Outflow.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - AddField: Adiciona o campo unit_selling_price (opcional).
+        - AddField: Adiciona o campo unit_cost_price (opcional).
+    """
+
+    dependencies = [
+        ("outflows", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outflow",
+            name="unit_selling_price",
+            field=models.DecimalField(
+                decimal_places=2, editable=False, max_digits=20, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="outflow",
+            name="unit_cost_price",
+            field=models.DecimalField(
+                decimal_places=2, editable=False, max_digits=20, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,71 @@
+"""
+Módulo de migração de dados para os preços unitários do modelo Outflow.
+
+Este módulo preenche os preços unitários das saídas já existentes com os preços atuais
+dos produtos associados, que são a melhor informação disponível para vendas registradas
+antes da criação das colunas. O preenchimento é feito em lotes de IDs, com um único
+UPDATE por lote, para não manter a tabela inteira bloqueada nem carregar registros em memória.
+
+Componentes principais:
+    - BATCH_SIZE: Quantidade de IDs processados por lote.
+    - backfill_price_snapshot: Função que preenche os preços em lotes.
+    - Migration: Classe que define a migração de dados.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para as expressões Subquery e OuterRef.
+"""
+
+from django.db import migrations
+from django.db.models import Max, Min, OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+def backfill_price_snapshot(apps, schema_editor):
+    """
+    Preenche os preços unitários das saídas existentes em lotes.
+
+    Percorre a tabela de saídas por faixas de IDs e, para cada faixa, executa um único
+    UPDATE que copia os preços do produto associado para as saídas ainda sem preço.
+
+    Argumentos:
+        apps: Registro histórico de aplicações usado pela migração.
+        schema_editor: Editor de esquema do banco de dados.
+    """
+    Outflow = apps.get_model("outflows", "Outflow")
+    Product = apps.get_model("products", "Product")
+
+    pending = Outflow.objects.filter(unit_selling_price__isnull=True)
+    bounds = pending.aggregate(first_id=Min("id"), last_id=Max("id"))
+    if bounds["first_id"] is None:
+        return
+
+    product = Product.objects.filter(pk=OuterRef("product_id"))
+    for start in range(bounds["first_id"], bounds["last_id"] + 1, BATCH_SIZE):
+        pending.filter(id__gte=start, id__lt=start + BATCH_SIZE).update(
+            unit_selling_price=Subquery(product.values("selling_price")[:1]),
+            unit_cost_price=Subquery(product.values("cost_price")[:1]),
+        )
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração de dados para os preços unitários do modelo Outflow.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - RunPython: Executa o preenchimento em lotes (sem operação reversa necessária).
+    """
+
+    dependencies = [
+        ("outflows", "0002_outflow_price_snapshot"),
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_price_snapshot, migrations.RunPython.noop),
+    ]
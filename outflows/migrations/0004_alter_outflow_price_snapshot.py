@@ -0,0 +1,48 @@
+"""
+Módulo de migração que torna obrigatórios os preços unitários do modelo Outflow.
+
+Após o preenchimento dos registros existentes, este módulo altera as colunas de preço
+unitário para não aceitarem valores nulos, garantindo que toda saída tenha seus preços
+registrados no momento da venda.
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - AlterField: Operações que tornam os campos de preço obrigatórios.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para a definição dos campos do modelo.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração que torna obrigatórios os preços unitários do modelo Outflow.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - AlterField: Torna o campo unit_selling_price obrigatório.
+        - AlterField: Torna o campo unit_cost_price obrigatório.
+    """
+
+    dependencies = [
+        ("outflows", "0003_backfill_outflow_price_snapshot"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="outflow",
+            name="unit_selling_price",
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=20),
+        ),
+        migrations.AlterField(
+            model_name="outflow",
+            name="unit_cost_price",
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=20),
+        ),
+    ]
@@ -0,0 +1,106 @@
+"""
+Módulo de migração para o modelo DailySalesSummary.
+
+Este módulo cria a tabela de resumo diário de vendas, que consolida as saídas por dia e por
+produto, com a categoria e a marca do produto desnormalizadas para os gráficos.
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - CreateModel: Operação que cria o modelo DailySalesSummary no banco de dados.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para a definição dos campos do modelo.
+    - products, categories, brands: Para os relacionamentos do resumo.
+"""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para o modelo DailySalesSummary.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - CreateModel: Cria o modelo DailySalesSummary com os campos:
+            - id: Chave primária automática.
+            - date: Dia das vendas.
+            - sales_count: Quantidade de saídas no dia.
+            - quantity: Quantidade de itens vendidos no dia.
+            - revenue: Valor total das vendas no dia.
+            - cost: Custo total das vendas no dia.
+            - brand, category, product: Relacionamentos com Brand, Category e Product.
+          e a restrição de unicidade da combinação de dia e produto.
+    """
+
+    dependencies = [
+        ("brands", "0001_initial"),
+        ("categories", "0001_initial"),
+        ("outflows", "0004_alter_outflow_price_snapshot"),
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailySalesSummary",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("sales_count", models.IntegerField(default=0)),
+                ("quantity", models.IntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "cost",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                (
+                    "brand",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="daily_sales",
+                        to="brands.brand",
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="daily_sales",
+                        to="categories.category",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="daily_sales",
+                        to="products.product",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "product"), name="unique_daily_sales_summary"
+                    )
+                ],
+            },
+        ),
+    ]
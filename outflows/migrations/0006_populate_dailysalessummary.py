@@ -0,0 +1,89 @@
+"""
+Módulo de migração de dados para o modelo DailySalesSummary.
+
+Este módulo preenche o resumo diário de vendas a partir das saídas já registradas, para que
+as métricas e os gráficos continuem corretos logo após a implantação. O preenchimento agrupa
+as saídas por dia e produto em lotes de IDs de produtos, sem carregar as saídas em memória.
+O comando `rebuild_daily_sales_summary` executa a mesma reconstrução sob demanda.
+
+Componentes principais:
+    - BATCH_SIZE: Quantidade de IDs de produtos processados por lote.
+    - populate_daily_sales_summary: Função que preenche o resumo em lotes.
+    - Migration: Classe que define a migração de dados.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para as funções de agregação.
+"""
+
+from django.db import migrations
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import TruncDate
+
+BATCH_SIZE = 1000
+
+
+def populate_daily_sales_summary(apps, schema_editor):
+    """
+    Preenche o resumo diário de vendas a partir das saídas existentes.
+
+    Argumentos:
+        apps: Registro histórico de aplicações usado pela migração.
+        schema_editor: Editor de esquema do banco de dados.
+    """
+    Outflow = apps.get_model("outflows", "Outflow")
+    DailySalesSummary = apps.get_model("outflows", "DailySalesSummary")
+
+    bounds = Outflow.objects.aggregate(first_id=Min("product_id"), last_id=Max("product_id"))
+    if bounds["first_id"] is None:
+        return
+
+    for start in range(bounds["first_id"], bounds["last_id"] + 1, BATCH_SIZE):
+        rows = (
+            Outflow.objects.filter(product_id__gte=start, product_id__lt=start + BATCH_SIZE)
+            .annotate(date=TruncDate("created_at"))
+            .values("date", "product_id", "product__category_id", "product__brand_id")
+            .annotate(
+                total_sales=Count("id"),
+                total_quantity=Sum("quantity"),
+                total_revenue=Sum(F("unit_selling_price") * F("quantity")),
+                total_cost=Sum(F("unit_cost_price") * F("quantity")),
+            )
+            .order_by()
+        )
+        DailySalesSummary.objects.bulk_create(
+            [
+                DailySalesSummary(
+                    date=row["date"],
+                    product_id=row["product_id"],
+                    category_id=row["product__category_id"],
+                    brand_id=row["product__brand_id"],
+                    sales_count=row["total_sales"],
+                    quantity=row["total_quantity"],
+                    revenue=row["total_revenue"],
+                    cost=row["total_cost"],
+                )
+                for row in rows
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração de dados para o modelo DailySalesSummary.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - RunPython: Preenche o resumo a partir do histórico (sem operação reversa necessária).
+    """
+
+    dependencies = [
+        ("outflows", "0005_dailysalessummary"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_daily_sales_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,74 @@
+"""
+Módulo de migração para o modelo Sale.
+
+Este módulo cria a tabela de vendas, que agrupa as saídas criadas em uma mesma operação,
+e adiciona ao modelo Outflow a chave estrangeira opcional para a venda.
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - CreateModel: Operação que cria o modelo Sale no banco de dados.
+    - AddField: Operação que adiciona o campo sale ao modelo Outflow.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para a definição dos campos do modelo.
+"""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para o modelo Sale.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - CreateModel: Cria o modelo Sale com os campos:
+            - id: Chave primária automática.
+            - description: Descrição opcional da venda.
+            - created_at: Data e hora de criação.
+            - updated_at: Data e hora da última atualização.
+        - AddField: Adiciona o campo sale (opcional) ao modelo Outflow.
+    """
+
+    dependencies = [
+        ("outflows", "0006_populate_dailysalessummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Sale",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("description", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AddField(
+            model_name="outflow",
+            name="sale",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="outflows",
+                to="outflows.sale",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+"""
+Módulo de migração para a paginação por cursor do modelo Outflow.
+
+Este módulo desempata a ordenação padrão das saídas pelo id e cria o índice composto
+(created_at, id), que permite buscar cada página da lista a partir da posição da página
+anterior, sem ler as linhas das páginas anteriores.
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - AlterModelOptions: Operação que altera a ordenação padrão do modelo Outflow.
+    - AddIndex: Operação que cria o índice composto (created_at, id).
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para a definição do índice.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para a paginação por cursor do modelo Outflow.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - AlterModelOptions: Ordena as saídas por data de criação e id (decrescentes).
+        - AddIndex: Cria o índice outflow_created_at_id sobre (created_at, id).
+    """
+
+    dependencies = [
+        ("outflows", "0007_sale"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="outflow",
+            options={"ordering": ["-created_at", "-id"]},
+        ),
+        migrations.AddIndex(
+            model_name="outflow",
+            index=models.Index(fields=["created_at", "id"], name="outflow_created_at_id"),
+        ),
+    ]
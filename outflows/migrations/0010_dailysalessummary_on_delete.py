@@ -0,0 +1,73 @@
+"""
+Módulo de migração para as exclusões relacionadas ao resumo diário de vendas.
+
+Este módulo deixa de proteger contra exclusão os produtos, as categorias e as marcas
+referenciados pelo resumo diário de vendas, que é um dado derivado das saídas: os registros
+de um produto excluído são removidos, e a categoria e a marca excluídas ficam vazias até a
+reconstrução do resumo.
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - AlterField: Operação que altera os relacionamentos do resumo.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para a definição dos campos do modelo.
+"""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para as exclusões relacionadas ao resumo diário de vendas.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - AlterField: Exclui os registros junto com o produto (CASCADE).
+        - AlterField: Esvazia a categoria excluída (SET_NULL).
+        - AlterField: Esvazia a marca excluída (SET_NULL).
+    """
+
+    dependencies = [
+        ("outflows", "0009_outflow_covering_indexes"),
+        ("brands", "0001_initial"),
+        ("categories", "0001_initial"),
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="dailysalessummary",
+            name="product",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="daily_sales",
+                to="products.product",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="dailysalessummary",
+            name="category",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="daily_sales",
+                to="categories.category",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="dailysalessummary",
+            name="brand",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="daily_sales",
+                to="brands.brand",
+            ),
+        ),
+    ]
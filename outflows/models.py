@@ -5,15 +5,51 @@ Este módulo define o modelo Outflow para registrar saídas de produtos no banco
 utilizado em diversas partes da aplicação, como views, formulários e APIs.
 
 Componentes principais:
+    - Sale: Modelo que agrupa as saídas de uma mesma venda.
     - Outflow: Modelo que representa uma saída de produto com campos para quantidade, descrição, etc.
+    - DailySalesSummary: Modelo que consolida as vendas por dia e por produto.
 
 Dependências:
-    - django.db.models: Para a criação de modelos de banco de dados.
+    - django.db: Para a criação de modelos de banco de dados e controle de transações.
     - products.models: Para o modelo Product (relação de chave estrangeira).
+    - categories.models: Para o modelo Category (relação de chave estrangeira).
+    - brands.models: Para o modelo Brand (relação de chave estrangeira).
 """
 
-from django.db import models
+from django.db import models, transaction
 from products.models import Product
+from categories.models import Category
+from brands.models import Brand
+
+
+class Sale(models.Model):
+    """
+    Modelo que representa uma venda com uma ou mais saídas de produtos.
+
+    Agrupa as linhas (saídas) criadas em uma única operação, como um pedido com vários
+    produtos, gravadas em conjunto pelo endpoint de vendas.
+
+    Campos:
+        description: Descrição da venda (opcional, pode ser nulo ou vazio).
+        created_at: Data e hora de criação do registro (adicionada automaticamente).
+        updated_at: Data e hora da última atualização do registro (atualizada automaticamente).
+
+    Atributos:
+        Meta: Classe interna que define a ordenação padrão por data de criação (decrescente).
+
+    Métodos:
+        __str__: Retorna o número da venda como representação em string.
+    """
+
+    description = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Venda {self.pk}"
 
 
 class Outflow(models.Model):
@@ -21,32 +57,139 @@ class Outflow(models.Model):
     Modelo que representa uma saída de produto no banco de dados.
 
     Registra informações sobre saídas de produtos, incluindo o produto associado,
-    quantidade retirada, descrição e timestamps de criação/atualização.
+    quantidade retirada, preços unitários vigentes no momento da venda, descrição
+    e timestamps de criação/atualização.
 
     Campos:
         product: Chave estrangeira para o modelo Product (protegida contra exclusão).
+        sale: Chave estrangeira opcional para a venda (Sale) à qual a saída pertence.
         quantity: Quantidade de itens retirados (inteiro, obrigatório).
+        unit_selling_price: Preço de venda unitário do produto no momento da saída (não editável).
+        unit_cost_price: Preço de custo unitário do produto no momento da saída (não editável).
         description: Descrição da saída (opcional, pode ser nulo ou vazio).
         created_at: Data e hora de criação do registro (adicionada automaticamente).
         updated_at: Data e hora da última atualização do registro (atualizada automaticamente).
 
     Atributos:
-        Meta: Classe interna que define a ordenação padrão por data de criação (decrescente).
+        Meta: Classe interna que define a ordenação padrão por data de criação (decrescente,
+              desempatada pelo id) e os índices: (created_at, id), usado pela paginação
+              por cursor; (product, created_at), usado pelo histórico e pelas somas por
+              produto; e (created_at), usado pelas somas por período, como as vendas
+              diárias. Os dois últimos incluem a quantidade (INCLUDE, no PostgreSQL),
+              permitindo somá-la sem ler a tabela.
 
     Métodos:
+        save: Salva a saída dentro de uma transação, junto com os sinais de post_save.
         __str__: Retorna a descrição da saída como representação em string.
     """
 
     product = models.ForeignKey(
         Product, on_delete=models.PROTECT, related_name="outflows"
     )
+    sale = models.ForeignKey(
+        Sale,
+        on_delete=models.PROTECT,
+        related_name="outflows",
+        null=True,
+        blank=True,
+    )
     quantity = models.IntegerField()
+    unit_selling_price = models.DecimalField(
+        max_digits=20, decimal_places=2, editable=False
+    )
+    unit_cost_price = models.DecimalField(
+        max_digits=20, decimal_places=2, editable=False
+    )
     description = models.TextField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="outflow_created_at_id"),
+            models.Index(
+                fields=["product", "created_at"],
+                include=["quantity"],
+                name="outflow_product_created_at",
+            ),
+            models.Index(
+                fields=["created_at"],
+                include=["quantity"],
+                name="outflow_created_at_quantity",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Salva a saída dentro de uma transação.
+
+        Os sinais de post_save (atualização do estoque e do resumo diário de vendas) são
+        disparados dentro do mesmo bloco atômico, de modo que a saída e seus efeitos
+        colaterais são gravados ou descartados em conjunto.
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return self.description
+
+
+class DailySalesSummary(models.Model):
+    """
+    Modelo que consolida as vendas por dia e por produto.
+
+    Mantém, para cada combinação de dia e produto, a quantidade de vendas, a quantidade de
+    itens vendidos, a receita e o custo. É atualizado de forma incremental a cada saída
+    criada, alterada ou excluída e pode ser reconstruído a partir do histórico pelo comando
+    `rebuild_daily_sales_summary`. Permite que os gráficos e as métricas de vendas leiam um
+    registro por dia e produto, em vez de percorrer toda a tabela de saídas.
+
+    Por ser um dado derivado, o resumo não impede a exclusão dos registros relacionados: os
+    registros de um produto excluído são removidos, e a categoria e a marca de uma categoria
+    ou marca excluída ficam vazias, até que o comando de reconstrução as preencha novamente
+    com a categoria e a marca atuais do produto.
+
+    Campos:
+        date: Dia das vendas (no fuso horário configurado).
+        product: Chave estrangeira para o modelo Product (excluída junto com o produto).
+        category: Chave estrangeira para o modelo Category do produto (vazia se excluída).
+        brand: Chave estrangeira para o modelo Brand do produto (vazia se excluída).
+        sales_count: Quantidade de saídas registradas no dia.
+        quantity: Quantidade de itens vendidos no dia.
+        revenue: Valor total das vendas no dia (preço de venda registrado na saída).
+        cost: Custo total das vendas no dia (preço de custo registrado na saída).
+
+    Atributos:
+        Meta: Classe interna que define a ordenação padrão por dia (decrescente) e a
+              unicidade da combinação de dia e produto.
+
+    Métodos:
+        __str__: Retorna o dia e o produto como representação em string.
+    """
+
+    date = models.DateField()
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="daily_sales"
+    )
+    category = models.ForeignKey(
+        Category, on_delete=models.SET_NULL, null=True, related_name="daily_sales"
+    )
+    brand = models.ForeignKey(
+        Brand, on_delete=models.SET_NULL, null=True, related_name="daily_sales"
+    )
+    sales_count = models.IntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    cost = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["-date"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "product"], name="unique_daily_sales_summary"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.product}"
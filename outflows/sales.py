@@ -0,0 +1,97 @@
+"""
+Módulo de apoio à gravação de saídas em lote.
+
+Este módulo define a atualização agrupada do resumo diário de vendas para saídas inseridas com
+`bulk_create`, que não disparam o sinal post_save. Em vez de um UPDATE por saída, as saídas são
+somadas por dia e produto e gravadas com um número constante de consultas.
+
+Componentes principais:
+    - accumulate_daily_sales: Acumula um conjunto de saídas no resumo diário de vendas.
+
+Dependências:
+    - django.db.models: Para expressões F na atualização incremental.
+    - django.utils.timezone: Para obter o dia da saída no fuso horário configurado.
+    - .models: Para o modelo DailySalesSummary.
+"""
+
+from django.db.models import F
+from django.utils import timezone
+from .models import DailySalesSummary
+
+SUMMARY_FIELDS = ("sales_count", "quantity", "revenue", "cost")
+
+
+def accumulate_daily_sales(outflows):
+    """
+    Acumula um conjunto de saídas no resumo diário de vendas.
+
+    Deve ser chamada dentro da transação que gravou as saídas. Os registros que faltam são
+    criados zerados ignorando conflitos, de modo que um registro criado ao mesmo tempo por
+    outro gravador (por exemplo, o sinal de uma saída individual) é reaproveitado, e todos os
+    incrementos são aplicados com expressões F.
+
+    Argumentos:
+        outflows (list): Saídas gravadas, com o produto e os preços unitários preenchidos.
+
+    Lógica:
+        - Soma as saídas por dia e produto em memória.
+        - Carrega os registros de resumo já existentes com uma única consulta.
+        - Cria os registros que faltam com um único `bulk_create` e os carrega em seguida.
+        - Incrementa todos os registros com um único `bulk_update` de expressões F.
+    """
+    totals = {}
+    for outflow in outflows:
+        key = (timezone.localdate(outflow.created_at), outflow.product_id)
+        row = totals.setdefault(
+            key,
+            dict(
+                category_id=outflow.product.category_id,
+                brand_id=outflow.product.brand_id,
+                sales_count=0,
+                quantity=0,
+                revenue=0,
+                cost=0,
+            ),
+        )
+        row["sales_count"] += 1
+        row["quantity"] += outflow.quantity
+        row["revenue"] += outflow.unit_selling_price * outflow.quantity
+        row["cost"] += outflow.unit_cost_price * outflow.quantity
+    if not totals:
+        return
+
+    existing = DailySalesSummary.objects.filter(
+        date__in={date for date, _ in totals},
+        product_id__in={product_id for _, product_id in totals},
+    )
+    summaries = {(summary.date, summary.product_id): summary for summary in existing}
+
+    missing = [key for key in totals if key not in summaries]
+    if missing:
+        DailySalesSummary.objects.bulk_create(
+            [
+                DailySalesSummary(
+                    date=date,
+                    product_id=product_id,
+                    category_id=totals[(date, product_id)]["category_id"],
+                    brand_id=totals[(date, product_id)]["brand_id"],
+                )
+                for date, product_id in missing
+            ],
+            ignore_conflicts=True,
+        )
+        created = DailySalesSummary.objects.filter(
+            date__in={date for date, _ in missing},
+            product_id__in={product_id for _, product_id in missing},
+        )
+        summaries.update(
+            {(summary.date, summary.product_id): summary for summary in created}
+        )
+
+    to_update = []
+    for key, row in totals.items():
+        summary = summaries[key]
+        for field in SUMMARY_FIELDS:
+            setattr(summary, field, F(field) + row[field])
+        to_update.append(summary)
+    DailySalesSummary.objects.bulk_update(to_update, SUMMARY_FIELDS)
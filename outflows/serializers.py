@@ -1,19 +1,43 @@
 """
 Módulo de serialização para o modelo Outflow.
 
-Este módulo define o serializer utilizado para converter instâncias do modelo Outflow
+Este módulo define os serializers utilizados para converter instâncias dos modelos Outflow e Sale
 em representações JSON e vice-versa, possibilitando a integração com APIs REST.
 
 Componentes principais:
     - OutflowSerializer: Serializer que mapeia todos os campos do modelo Outflow.
+    - SaleItemSerializer: Serializer de cada linha (saída) de uma venda.
+    - SaleSerializer: Serializer que cria uma venda com várias linhas em uma única transação.
 
 Dependências:
+    - collections.defaultdict: Para somar as quantidades pedidas por produto.
     - rest_framework.serializers: Para a criação de serializers.
-    - outflows.models: Para o modelo Outflow.
+    - app.metrics_cache: Para a invalidação das métricas em cache.
+    - app.serializers: Para o pré-carregamento dos produtos das linhas.
+    - outflows.models: Para os modelos Outflow e Sale.
+    - outflows.sales: Para a atualização agrupada do resumo diário de vendas.
+    - products.models: Para o modelo Product.
+    - products.reservations: Para descontar as reservas ativas do estoque disponível.
+    - products.stripes: Para somar as faixas dos contadores de estoque divididos.
+    - products.stock: Para o lote de escritas de estoque e o livro-razão de estoque.
+    - products.triggers: Para detectar o modo de gatilhos de estoque.
 """
 
+from collections import defaultdict
 from rest_framework import serializers
-from outflows.models import Outflow
+from app.metrics_cache import invalidate_metrics_cache
+from app.serializers import PreloadedListSerializer, PreloadedPrimaryKeyRelatedField
+from outflows.models import Outflow, Sale
+from outflows.sales import accumulate_daily_sales
+from products.models import Product
+from products.reservations import get_reserved_quantities
+from products.stripes import get_striped_quantities
+from products.triggers import stock_triggers_enabled
+from products.stock import (
+    adjust_product_quantity,
+    record_stock_movements,
+    stock_batch,
+)
 
 
 class OutflowSerializer(serializers.ModelSerializer):
@@ -30,3 +54,147 @@ class OutflowSerializer(serializers.ModelSerializer):
     class Meta:
         model = Outflow
         fields = "__all__"
+
+
+class SaleItemSerializer(serializers.ModelSerializer):
+    """
+    Serializer de cada linha (saída) de uma venda.
+
+    Os produtos de todas as linhas são carregados com uma única consulta pelo
+    PreloadedListSerializer.
+
+    Atributos:
+        product: Produto da linha, validado contra os produtos pré-carregados.
+        quantity: Quantidade vendida (maior que zero).
+        Meta: Classe interna que especifica o modelo e os campos a serem serializados.
+    """
+
+    product = PreloadedPrimaryKeyRelatedField(queryset=Product.objects.all())
+    quantity = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = Outflow
+        fields = [
+            "id",
+            "product",
+            "quantity",
+            "unit_selling_price",
+            "unit_cost_price",
+            "description",
+        ]
+        list_serializer_class = PreloadedListSerializer
+
+
+class SaleSerializer(serializers.ModelSerializer):
+    """
+    Serializer que cria uma venda com várias linhas em uma única transação.
+
+    Atributos:
+        items: Linhas (saídas) da venda.
+        Meta: Classe interna que especifica o modelo e os campos a serem serializados.
+
+    Métodos:
+        create: Valida o estoque de todas as linhas e grava a venda.
+    """
+
+    items = SaleItemSerializer(many=True, allow_empty=False, source="outflows")
+
+    class Meta:
+        model = Sale
+        fields = ["id", "description", "items", "created_at", "updated_at"]
+
+    def create(self, validated_data):
+        """
+        Valida o estoque de todas as linhas e grava a venda.
+
+        O custo em consultas não depende da quantidade de linhas: um bloqueio, uma leitura
+        das reservas ativas, uma leitura das faixas dos contadores divididos, uma inserção
+        da venda, uma inserção das saídas, uma atualização de estoque, uma inserção no
+        livro-razão e até quatro consultas no resumo diário de vendas. A venda é gravada em
+        um bloco `stock_batch`, cuja transação envolve o bloqueio, a validação e as
+        gravações; o estoque e o livro-razão são gravados ao final do bloco, antes do commit.
+
+        Argumentos:
+            validated_data (dict): Dados validados da venda e de suas linhas.
+
+        Retorna:
+            Sale: Venda criada.
+
+        Lógica:
+            - Soma as quantidades pedidas por produto.
+            - Bloqueia as linhas de todos os produtos envolvidos com um único
+              SELECT ... FOR UPDATE, em ordem de id, para evitar deadlocks entre vendas.
+            - Valida todas as linhas de uma só vez contra o estoque bloqueado, somadas as
+              faixas dos contadores divididos e descontadas as reservas ativas (uma consulta
+              agrupada para cada).
+            - Para produtos com contador dividido, a baixa é feita em uma faixa, como nas
+              saídas individuais, e a base do produto não é alterada.
+            - Grava a venda e as saídas com `bulk_create`, registrando os preços vigentes.
+            - Acumula no lote a baixa de estoque de cada saída e as suas movimentações (exceto
+              com os gatilhos de estoque instalados, que as gravam no banco de dados) e
+              acumula o resumo diário.
+        """
+        items = validated_data.pop("outflows")
+        requested = defaultdict(int)
+        for item in items:
+            requested[item["product"].pk] += item["quantity"]
+
+        with stock_batch():
+            products = {
+                product.pk: product
+                for product in Product.objects.select_for_update()
+                .filter(pk__in=requested)
+                .order_by("pk")
+            }
+
+            reserved = get_reserved_quantities(list(products))
+            striped = get_striped_quantities(
+                [product.pk for product in products.values() if product.stock_stripes]
+            )
+
+            errors = []
+            for item in items:
+                product = products.get(item["product"].pk)
+                if product is None:
+                    errors.append(
+                        {"product": [f'Pk inválido "{item["product"].pk}" - objeto não existe.']}
+                    )
+                    continue
+                stock = product.quantity + striped.get(product.pk, 0)
+                available = stock - reserved.get(product.pk, 0)
+                if requested[product.pk] > available:
+                    errors.append(
+                        {
+                            "quantity": [
+                                f"A quantidade disponível em estoque para o produto {product.title} é de {available} unidades."
+                            ]
+                        }
+                    )
+                else:
+                    errors.append({})
+            if any(errors):
+                raise serializers.ValidationError({"items": errors})
+
+            sale = Sale.objects.create(**validated_data)
+            outflows = Outflow.objects.bulk_create(
+                [
+                    Outflow(
+                        sale=sale,
+                        product=products[item["product"].pk],
+                        quantity=item["quantity"],
+                        description=item.get("description"),
+                        unit_selling_price=products[item["product"].pk].selling_price,
+                        unit_cost_price=products[item["product"].pk].cost_price,
+                    )
+                    for item in items
+                ]
+            )
+            if not stock_triggers_enabled():
+                for outflow in outflows:
+                    adjust_product_quantity(
+                        outflow.product_id, -outflow.quantity, outflow.product.stock_stripes
+                    )
+                record_stock_movements(outflows=outflows)
+            accumulate_daily_sales(outflows)
+            invalidate_metrics_cache()
+        return sale
@@ -1,27 +1,112 @@
 """
 Módulo de sinais para o modelo Outflow.
 
-Este módulo define um sinal que atualiza a quantidade de um produto no estoque
-sempre que uma nova saída (Outflow) é criada.
+Este módulo define os sinais que registram os preços vigentes do produto na saída,
+atualizam a quantidade de um produto no estoque e o resumo diário de vendas sempre que
+uma nova saída (Outflow) é criada, e que invalidam as métricas em cache. Como nos gatilhos de
+estoque (products.triggers), a alteração do produto ou da quantidade de uma saída estorna a
+movimentação antiga e aplica a nova, e a exclusão estorna a movimentação. O resumo diário de
+vendas segue a mesma regra: a alteração de uma saída subtrai os valores antigos do registro
+do dia e do produto e soma os novos, e a exclusão subtrai os valores da saída. Gravações que
+não disparam sinais (`QuerySet.update` e `QuerySet.delete`) devem ser seguidas do comando
+`rebuild_daily_sales_summary`.
 
 Componentes principais:
+    - snapshot_product_prices: Função que copia os preços atuais do produto para a saída.
+    - remember_previous_outflow: Função que guarda os valores gravados antes da alteração.
     - update_product_quantity: Função que ajusta a quantidade do produto com base na saída.
+    - revert_product_quantity: Função que devolve a saída excluída ao estoque do produto.
+    - daily_sales_entry: Função que calcula o dia, o produto e os valores de uma saída.
+    - add_to_daily_sales: Função que soma uma saída ao resumo diário de vendas.
+    - subtract_from_daily_sales: Função que subtrai uma saída do resumo diário de vendas.
+    - update_daily_sales_summary: Função que acumula a saída no resumo diário de vendas.
+    - revert_daily_sales_summary: Função que subtrai a saída excluída do resumo diário.
+    - invalidate_metrics: Função que invalida as métricas em cache.
 
 Dependências:
-    - django.db.models.signals: Para o sinal post_save.
+    - django.db: Para o tratamento de IntegrityError e controle de transações.
+    - django.db.models: Para expressões F na atualização incremental.
+    - django.db.models.signals: Para os sinais pre_save, post_save e post_delete.
     - django.dispatch: Para o decorador receiver.
-    - .models: Para o modelo Outflow.
+    - django.utils.timezone: Para obter o dia da saída no fuso horário configurado.
+    - app.metrics_cache: Para a invalidação das métricas em cache.
+    - products.stock: Para a atualização atômica do estoque e o livro-razão de estoque.
+    - products.triggers: Para detectar o modo de gatilhos de estoque.
+    - .models: Para os modelos Outflow e DailySalesSummary.
 """
 
-from django.db.models.signals import post_save
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from .models import Outflow
+from django.utils import timezone
+from app.metrics_cache import invalidate_metrics_cache
+from products.stock import (
+    adjust_product_quantity,
+    record_stock_change,
+    record_stock_movements,
+)
+from products.triggers import stock_triggers_enabled
+from .models import Outflow, DailySalesSummary
+
+
+@receiver(pre_save, sender=Outflow)
+def snapshot_product_prices(sender, instance, **kwargs):
+    """
+    Registra os preços unitários do produto no momento da saída.
+
+    Esta função é disparada pelo sinal pre_save do modelo Outflow. Ela copia o preço de venda
+    e o preço de custo atuais do produto para a saída, de modo que o valor e o lucro das vendas
+    passadas não mudem quando os preços do produto forem alterados.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Outflow).
+        instance: Instância do modelo Outflow que será salva.
+        **kwargs: Argumentos adicionais passados pelo sinal.
+
+    Lógica:
+        - Preenche apenas os preços ainda não definidos, preservando os valores já registrados.
+    """
+    if instance.unit_selling_price is None:
+        instance.unit_selling_price = instance.product.selling_price
+    if instance.unit_cost_price is None:
+        instance.unit_cost_price = instance.product.cost_price
+
+
+@receiver(pre_save, sender=Outflow)
+def remember_previous_outflow(sender, instance, **kwargs):
+    """
+    Guarda os valores gravados de uma saída que será alterada.
+
+    O produto, a quantidade e as faixas do contador do produto são usados para estornar a
+    movimentação de estoque, e o dia e os preços unitários, para subtrair a saída antiga do
+    resumo diário de vendas.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Outflow).
+        instance: Instância do modelo Outflow que será salva.
+        **kwargs: Argumentos adicionais passados pelo sinal.
+    """
+    instance._previous_outflow = None
+    if not instance._state.adding:
+        instance._previous_outflow = (
+            Outflow.objects.filter(pk=instance.pk)
+            .only(
+                "product_id",
+                "quantity",
+                "unit_selling_price",
+                "unit_cost_price",
+                "created_at",
+            )
+            .annotate(product_stripes=F("product__stock_stripes"))
+            .first()
+        )
 
 
 @receiver(post_save, sender=Outflow)
 def update_product_quantity(sender, instance, created, **kwargs):
     """
-    Atualiza a quantidade de um produto no estoque após a criação de uma saída.
+    Atualiza a quantidade de um produto no estoque após a criação ou alteração de uma saída.
 
     Esta função é disparada pelo sinal post_save do modelo Outflow. Quando uma nova saída é criada,
     ela reduz a quantidade do produto associado com base na quantidade da saída.
@@ -33,12 +118,194 @@ def update_product_quantity(sender, instance, created, **kwargs):
         **kwargs: Argumentos adicionais passados pelo sinal.
 
     Lógica:
-        - Verifica se a instância foi criada (created=True).
-        - Se a quantidade da saída for maior que 0, subtrai essa quantidade do estoque do produto.
-        - Salva as alterações no produto.
+        - Verifica se a instância foi criada (created=True) e se o estoque não é mantido pelos
+          gatilhos do banco de dados (products.triggers).
+        - Se a quantidade da saída for maior que 0, subtrai essa quantidade do estoque do produto
+          com um UPDATE atômico, que altera apenas a quantidade e a data de atualização (ou uma
+          faixa do contador, para produtos com contador dividido).
+        - Registra a movimentação no livro-razão de estoque.
+        - Se uma saída existente teve o produto ou a quantidade alterados, estorna a
+          movimentação antiga e aplica a nova (em uma faixa, para produtos com contador
+          dividido).
     """
+    if stock_triggers_enabled():
+        return
     if created:
         if instance.quantity > 0:
-            product = instance.product
-            product.quantity -= instance.quantity
-            product.save()
+            adjust_product_quantity(
+                instance.product_id, -instance.quantity, instance.product.stock_stripes
+            )
+            record_stock_movements(outflows=[instance])
+        return
+
+    previous = getattr(instance, "_previous_outflow", None)
+    if previous is None or (previous.product_id, previous.quantity) == (
+        instance.product_id,
+        instance.quantity,
+    ):
+        return
+    if previous.quantity > 0:
+        record_stock_change(
+            previous.product_id,
+            previous.quantity,
+            outflow=instance,
+            stripes=previous.product_stripes,
+        )
+    if instance.quantity > 0:
+        record_stock_change(
+            instance.product_id,
+            -instance.quantity,
+            outflow=instance,
+            stripes=instance.product.stock_stripes,
+        )
+
+
+@receiver(post_delete, sender=Outflow)
+def revert_product_quantity(sender, instance, **kwargs):
+    """
+    Devolve ao estoque do produto a quantidade de uma saída excluída.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Outflow).
+        instance: Instância do modelo Outflow que foi excluída.
+        **kwargs: Argumentos adicionais passados pelo sinal.
+    """
+    if not stock_triggers_enabled() and instance.quantity > 0:
+        record_stock_change(
+            instance.product_id, instance.quantity, stripes=instance.product.stock_stripes
+        )
+
+
+def daily_sales_entry(outflow):
+    """
+    Retorna o dia, o produto e os valores com que uma saída entra no resumo diário de vendas.
+
+    Argumentos:
+        outflow (Outflow): Saída, com os preços unitários preenchidos.
+
+    Retorna:
+        tuple: Dia, ID do produto, quantidade, receita e custo da saída.
+    """
+    return (
+        timezone.localdate(outflow.created_at),
+        outflow.product_id,
+        outflow.quantity,
+        outflow.unit_selling_price * outflow.quantity,
+        outflow.unit_cost_price * outflow.quantity,
+    )
+
+
+def add_to_daily_sales(outflow):
+    """
+    Soma uma saída ao registro do dia e do produto no resumo diário de vendas.
+
+    Argumentos:
+        outflow (Outflow): Saída gravada, com o produto e os preços unitários preenchidos.
+
+    Lógica:
+        - Tenta incrementar o registro existente do dia e do produto.
+        - Se não houver registro, cria um novo; em caso de criação concorrente
+          (IntegrityError), repete o incremento sobre o registro criado.
+    """
+    date, product_id, quantity, revenue, cost = daily_sales_entry(outflow)
+    summary = DailySalesSummary.objects.filter(date=date, product=product_id)
+    increments = dict(
+        sales_count=F("sales_count") + 1,
+        quantity=F("quantity") + quantity,
+        revenue=F("revenue") + revenue,
+        cost=F("cost") + cost,
+    )
+
+    if summary.update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            DailySalesSummary.objects.create(
+                date=date,
+                product_id=product_id,
+                category_id=outflow.product.category_id,
+                brand_id=outflow.product.brand_id,
+                sales_count=1,
+                quantity=quantity,
+                revenue=revenue,
+                cost=cost,
+            )
+    except IntegrityError:
+        summary.update(**increments)
+
+
+def subtract_from_daily_sales(outflow):
+    """
+    Subtrai uma saída do registro do dia e do produto no resumo diário de vendas.
+
+    O registro que fica sem vendas é removido, como se o resumo tivesse sido reconstruído
+    pelo comando `rebuild_daily_sales_summary`.
+
+    Argumentos:
+        outflow (Outflow): Saída com os valores que foram somados ao resumo.
+    """
+    date, product_id, quantity, revenue, cost = daily_sales_entry(outflow)
+    summary = DailySalesSummary.objects.filter(date=date, product=product_id)
+    if summary.update(
+        sales_count=F("sales_count") - 1,
+        quantity=F("quantity") - quantity,
+        revenue=F("revenue") - revenue,
+        cost=F("cost") - cost,
+    ):
+        summary.filter(sales_count__lte=0).delete()
+
+
+@receiver(post_save, sender=Outflow)
+def update_daily_sales_summary(sender, instance, created, **kwargs):
+    """
+    Acumula uma saída criada ou alterada no resumo diário de vendas.
+
+    Esta função é disparada pelo sinal post_save do modelo Outflow, dentro da mesma transação
+    em que a saída é gravada, tanto no modo de sinais quanto no de gatilhos de estoque.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Outflow).
+        instance: Instância do modelo Outflow que foi salva.
+        created: Booleano indicando se a instância foi recém-criada.
+        **kwargs: Argumentos adicionais passados pelo sinal.
+
+    Lógica:
+        - Se a instância foi criada (created=True), soma a saída ao resumo.
+        - Se uma saída existente teve o dia, o produto, a quantidade ou os preços alterados,
+          subtrai os valores antigos e soma os novos.
+    """
+    if created:
+        add_to_daily_sales(instance)
+        return
+
+    previous = getattr(instance, "_previous_outflow", None)
+    if previous is None or daily_sales_entry(previous) == daily_sales_entry(instance):
+        return
+    subtract_from_daily_sales(previous)
+    add_to_daily_sales(instance)
+
+
+@receiver(post_delete, sender=Outflow)
+def revert_daily_sales_summary(sender, instance, **kwargs):
+    """
+    Subtrai a saída excluída do resumo diário de vendas.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Outflow).
+        instance: Instância do modelo Outflow que foi excluída.
+        **kwargs: Argumentos adicionais passados pelo sinal.
+    """
+    subtract_from_daily_sales(instance)
+
+
+@receiver([post_save, post_delete], sender=Outflow)
+def invalidate_metrics(sender, instance, **kwargs):
+    """
+    Invalida as métricas em cache após a gravação ou exclusão de uma saída.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Outflow).
+        instance: Instância do modelo Outflow que foi salva ou excluída.
+        **kwargs: Argumentos adicionais passados pelo sinal.
+    """
+    invalidate_metrics_cache()
@@ -0,0 +1,3 @@
+"""
+Pacote de testes da aplicação outflows.
+"""
@@ -0,0 +1,131 @@
+"""
+Módulo de testes do resumo diário de vendas.
+
+Verifica que o resumo, por ser um dado derivado, não impede a exclusão de categorias e marcas
+com histórico de vendas, que o comando de reconstrução preenche novamente a categoria e a
+marca perdidas, e que a alteração e a exclusão de saídas mantêm o resumo igual ao reconstruído
+a partir do histórico.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from app.metrics import get_sales_metrics, summarize_outflows
+from app.tests.factories import create_brand, create_category, create_product
+from outflows.models import DailySalesSummary, Outflow
+
+
+class DailySalesSummaryDeletionTests(TestCase):
+    """
+    Testes da exclusão de registros relacionados ao resumo diário de vendas.
+    """
+
+    def setUp(self):
+        self.old_category = create_category("Antiga")
+        self.old_brand = create_brand("Antiga")
+        self.product = create_product(
+            category=self.old_category, brand=self.old_brand, quantity=10
+        )
+        Outflow.objects.create(product=self.product, quantity=2, description="Venda")
+        # O produto passa para outra categoria e marca, deixando as antigas apenas no resumo
+        self.product.category = create_category("Nova")
+        self.product.brand = create_brand("Nova")
+        self.product.save()
+
+    def test_category_and_brand_with_sales_history_can_be_deleted(self):
+        self.old_category.delete()
+        self.old_brand.delete()
+
+        summary = DailySalesSummary.objects.get(product=self.product)
+        self.assertIsNone(summary.category_id)
+        self.assertIsNone(summary.brand_id)
+        self.assertEqual(summary.quantity, 2)
+
+    def test_rebuild_orphaned_restores_category_and_brand(self):
+        self.old_category.delete()
+        self.old_brand.delete()
+
+        call_command("rebuild_daily_sales_summary", "--orphaned", stdout=StringIO())
+
+        summary = DailySalesSummary.objects.get(product=self.product)
+        self.assertEqual(summary.category_id, self.product.category_id)
+        self.assertEqual(summary.brand_id, self.product.brand_id)
+        self.assertEqual(summary.sales_count, 1)
+        self.assertEqual(summary.quantity, 2)
+
+
+class DailySalesSummaryChangeTests(TestCase):
+    """
+    Testes da atualização do resumo diário de vendas na alteração e exclusão de saídas.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.product = create_product(quantity=100)
+        self.other = create_product("Outro", quantity=100)
+        self.outflow = Outflow.objects.create(
+            product=self.product, quantity=2, description="Venda"
+        )
+        Outflow.objects.create(product=self.product, quantity=3, description="Venda")
+
+    def assertSummaryMatchesRebuild(self):
+        fields = ("date", "product_id", "sales_count", "quantity", "revenue", "cost")
+        summary = list(DailySalesSummary.objects.order_by("date", "product").values(*fields))
+        call_command("rebuild_daily_sales_summary", stdout=StringIO())
+        rebuilt = list(DailySalesSummary.objects.order_by("date", "product").values(*fields))
+        self.assertEqual(summary, rebuilt)
+
+    def test_quantity_change_updates_summary(self):
+        self.outflow.quantity = 7
+        self.outflow.save()
+
+        summary = DailySalesSummary.objects.get(product=self.product)
+        self.assertEqual(summary.sales_count, 2)
+        self.assertEqual(summary.quantity, 10)
+        self.assertEqual(summary.revenue, Decimal("150.00"))
+        self.assertEqual(summary.cost, Decimal("100.00"))
+        self.assertSummaryMatchesRebuild()
+
+    def test_product_change_moves_sale_between_summaries(self):
+        self.outflow.product = self.other
+        self.outflow.save()
+
+        self.assertEqual(DailySalesSummary.objects.get(product=self.product).quantity, 3)
+        summary = DailySalesSummary.objects.get(product=self.other)
+        self.assertEqual(summary.sales_count, 1)
+        self.assertEqual(summary.quantity, 2)
+        self.assertSummaryMatchesRebuild()
+
+    def test_date_change_moves_sale_between_days(self):
+        self.outflow.created_at -= timedelta(days=1)
+        self.outflow.save()
+
+        self.assertEqual(DailySalesSummary.objects.filter(product=self.product).count(), 2)
+        self.assertSummaryMatchesRebuild()
+
+    def test_delete_subtracts_sale_from_summary(self):
+        self.outflow.delete()
+
+        summary = DailySalesSummary.objects.get(product=self.product)
+        self.assertEqual(summary.sales_count, 1)
+        self.assertEqual(summary.quantity, 3)
+        self.assertSummaryMatchesRebuild()
+
+    def test_deleting_last_sale_removes_summary_row(self):
+        Outflow.objects.filter(product=self.product).exclude(pk=self.outflow.pk).get().delete()
+        self.outflow.delete()
+
+        self.assertFalse(DailySalesSummary.objects.filter(product=self.product).exists())
+        self.assertSummaryMatchesRebuild()
+
+    def test_sales_metrics_match_outflows_after_changes(self):
+        self.outflow.quantity = 4
+        self.outflow.save()
+        Outflow.objects.create(product=self.other, quantity=1, description="Venda")
+        Outflow.objects.filter(product=self.other).get().delete()
+
+        cache.clear()
+        self.assertEqual(get_sales_metrics(), summarize_outflows(Outflow.objects.all()))
@@ -0,0 +1,86 @@
+"""
+Módulo de testes do formulário de saídas.
+
+Verifica que a saída feita com uma reserva de estoque é desfeita quando a reserva deixa de
+estar ativa entre a validação do formulário e a gravação, e que a view de criação reapresenta
+o formulário com o erro nesse caso.
+"""
+
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from app.tests.factories import create_product
+from outflows.forms import RESERVATION_ERROR, OutflowForm
+from outflows.models import Outflow
+from products.models import StockReservation
+from products.reservations import consume_reservation, reserve_stock
+
+
+class OutflowFormReservationTests(TestCase):
+    """
+    Testes do consumo da reserva de estoque na gravação da saída.
+    """
+
+    def setUp(self):
+        self.product = create_product(quantity=10)
+        self.reservation = reserve_stock(self.product.pk, 3)
+        self.form = OutflowForm(
+            data={
+                "product": self.product.pk,
+                "reservation": self.reservation.token,
+                "quantity": 3,
+                "description": "Venda",
+            }
+        )
+
+    def test_save_consumes_the_reservation(self):
+        self.assertTrue(self.form.is_valid(), self.form.errors)
+        self.form.save()
+
+        self.reservation.refresh_from_db()
+        self.assertEqual(self.reservation.status, StockReservation.CONSUMED)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 7)
+
+    def test_save_rolls_back_when_reservation_was_consumed_meanwhile(self):
+        self.assertTrue(self.form.is_valid(), self.form.errors)
+        # Outra venda consome a reserva depois da validação deste formulário
+        consume_reservation(self.reservation.token)
+
+        with self.assertRaises(ValidationError):
+            self.form.save()
+
+        self.assertFalse(Outflow.objects.exists())
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 10)
+
+
+class OutflowCreateViewReservationTests(TestCase):
+    """
+    Testes da view de criação de saídas com uma reserva que deixa de estar ativa.
+    """
+
+    def setUp(self):
+        self.product = create_product(quantity=10)
+        self.reservation = reserve_stock(self.product.pk, 3)
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "senha")
+        )
+
+    def test_form_is_shown_again_with_the_error(self):
+        with mock.patch("outflows.forms.consume_reservation", return_value=False):
+            response = self.client.post(
+                reverse("outflow_create"),
+                {
+                    "product": self.product.pk,
+                    "reservation": self.reservation.token,
+                    "quantity": 3,
+                    "description": "Venda",
+                },
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(RESERVATION_ERROR, response.context["form"].non_field_errors())
+        self.assertFalse(Outflow.objects.exists())
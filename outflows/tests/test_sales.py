@@ -0,0 +1,55 @@
+"""
+Módulo de testes das vendas com várias linhas.
+
+Verifica que o serializador de vendas grava o estoque e o livro-razão por meio de um bloco
+`stock_batch`: com uma quantidade fixa de consultas, qualquer que seja a quantidade de linhas,
+e dentro da transação da venda, antes das tarefas agendadas para o commit.
+"""
+
+from django.test import TestCase
+from app.tests.factories import create_product
+from outflows.serializers import SaleSerializer
+from products.models import StockMovement
+
+
+class SaleSerializerTests(TestCase):
+    """
+    Testes da gravação de vendas com várias linhas.
+    """
+
+    def setUp(self):
+        self.products = [create_product(f"Produto {i}", quantity=100) for i in range(5)]
+
+    def save_sale(self, rows):
+        data = {
+            "description": "Venda",
+            "items": [
+                {"product": self.products[i % len(self.products)].pk, "quantity": 1}
+                for i in range(rows)
+            ],
+        }
+        serializer = SaleSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_query_count_does_not_depend_on_rows(self):
+        # Produtos, savepoint, bloqueio, reservas, venda, saídas, quatro consultas do resumo
+        # diário, estoque, livro-razão e liberação
+        with self.assertNumQueries(13):
+            self.save_sale(2)
+        with self.assertNumQueries(13):
+            self.save_sale(50)
+
+        self.products[0].refresh_from_db()
+        self.assertEqual(self.products[0].quantity, 100 - 1 - 10)
+
+    def test_stock_is_written_before_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            sale = self.save_sale(10)
+
+            self.products[0].refresh_from_db()
+            self.assertEqual(self.products[0].quantity, 100 - 2)
+            self.assertEqual(
+                StockMovement.objects.filter(outflow__sale=sale).count(), 10
+            )
+        self.assertTrue(callbacks)
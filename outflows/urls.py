@@ -10,6 +10,8 @@ Rotas definidas:
     - outflow_detail: Mostra os detalhes de uma saída específica na interface web.
     - outflow-create-list-api-view: Endpoint da API para listar todas as saídas ou criar uma nova.
     - outflow-detail-api-view: Endpoint da API para recuperar os detalhes de uma saída específica.
+    - sale-create-list-api-view: Endpoint da API para listar vendas ou criar uma venda com várias saídas.
+    - sale-detail-api-view: Endpoint da API para recuperar os detalhes de uma venda específica.
 
 Dependências:
     - django.urls: Para a definição de rotas.
@@ -38,4 +40,14 @@ urlpatterns = [
         views.OutflowRetrieveAPIView.as_view(),
         name="outflow-detail-api-view",
     ),
+    path(
+        "api/v1/sales/",
+        views.SaleCreateListAPIView.as_view(),
+        name="sale-create-list-api-view",
+    ),
+    path(
+        "api/v1/sales/<int:pk>/",
+        views.SaleRetrieveAPIView.as_view(),
+        name="sale-detail-api-view",
+    ),
 ]
@@ -11,6 +11,8 @@ Componentes principais:
     - OutflowDetailView: Exibe detalhes de uma saída.
     - OutflowCreateListAPIView: API para listar e criar saídas.
     - OutflowRetrieveAPIView: API para recuperar detalhes de uma saída.
+    - SaleCreateListAPIView: API para listar vendas e criar uma venda com várias saídas.
+    - SaleRetrieveAPIView: API para recuperar detalhes de uma venda.
 
 Fluxo típico:
     1. O usuário acessa a lista de saídas com filtros opcionais.
@@ -19,14 +21,21 @@ Fluxo típico:
 
 Dependências:
     - django.contrib.auth.mixins: Para autenticação e permissões.
+    - django.utils.functional.cached_property: Para memorizar as métricas durante a requisição.
     - rest_framework.generics: Para views de API.
     - .models, .forms, .serializers: Modelos, formulários e serializadores locais.
     - app.metrics: Funções para métricas de vendas.
+    - django.core.exceptions.ValidationError: Para tokens de reserva inválidos na URL e
+      reservas que deixam de estar ativas na gravação.
+    - products.reservations: Para as reservas de estoque usadas na criação de saídas.
+    - app.pagination: Para a paginação por cursor da lista e da API.
 """
 
 from rest_framework import generics
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.core.exceptions import ValidationError
 from django.urls import reverse_lazy
+from django.utils.functional import cached_property
 from django.views.generic import (
     ListView,
     CreateView,
@@ -34,14 +43,22 @@ from django.views.generic import (
 )
 from . import models, forms, serializers
 from app import metrics
+from app.pagination import KeysetPagination, KeysetPaginationMixin
+from products.reservations import active_reservations
 
 
-class OutflowListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class OutflowListView(
+    LoginRequiredMixin, PermissionRequiredMixin, KeysetPaginationMixin, ListView
+):
     """
-    View para listar saídas com paginação e filtragem.
+    View para listar saídas com paginação por cursor e filtragem.
 
     Exibe uma lista paginada de saídas com filtro por produto e inclui métricas de vendas
-    no contexto. Requer autenticação e a permissão 'outflows.view_outflow'.
+    no contexto. Requer autenticação e a permissão 'outflows.view_outflow'. As métricas
+    consideram o filtro ativo, são calculadas uma única vez por requisição e ficam em cache
+    pela assinatura do filtro, de modo que a troca de página não recalcula a agregação. A
+    paginação é por cursor sobre (created_at, id), de modo que o custo de uma página não
+    depende da sua posição na lista.
 
     Atributos:
         model: Modelo Outflow.
@@ -49,6 +66,11 @@ class OutflowListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
         context_object_name: Nome do objeto no contexto do template.
         paginate_by: Número de itens por página.
         permission_required: Permissão necessária para acessar a view.
+        filter_params: Parâmetros da query string usados como filtros.
+
+    Métodos:
+        get_filters: Retorna os filtros ativos na query string.
+        sales_metrics: Métricas das saídas filtradas, memorizadas para a requisição.
 
     Métodos sobrescritos:
         get_queryset: Filtra o queryset com base no título do produto na query string.
@@ -60,6 +82,18 @@ class OutflowListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     context_object_name = "outflows"
     paginate_by = 5
     permission_required = "outflows.view_outflow"
+    filter_params = ("product",)
+
+    def get_filters(self):
+        return {
+            name: self.request.GET[name]
+            for name in self.filter_params
+            if self.request.GET.get(name)
+        }
+
+    @cached_property
+    def sales_metrics(self):
+        return metrics.get_filtered_sales_metrics(self.object_list, self.get_filters())
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -70,7 +104,7 @@ class OutflowListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["sales_metrics"] = metrics.get_sales_metrics()
+        context["sales_metrics"] = self.sales_metrics
         return context
 
 
@@ -87,6 +121,10 @@ class OutflowCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView)
         form_class: Formulário usado para criar a saída.
         success_url: URL para redirecionar após a criação.
         permission_required: Permissão necessária para acessar a view.
+
+    Métodos:
+        get_initial: Preenche o formulário a partir de uma reserva de estoque informada na URL.
+        form_valid: Salva a saída ou reapresenta o formulário se a reserva não puder ser usada.
     """
 
     model = models.Outflow
@@ -95,6 +133,52 @@ class OutflowCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateView)
     success_url = reverse_lazy("outflow_list")
     permission_required = "outflows.add_outflow"
 
+    def get_initial(self):
+        """
+        Preenche o formulário a partir de uma reserva de estoque informada na URL.
+
+        Quando a URL contém `?reservation=<token>` de uma reserva ativa, o produto, a
+        quantidade e a reserva são preenchidos, e a venda é validada contra a quantidade
+        já reservada.
+
+        Retorna:
+            dict: Valores iniciais do formulário.
+        """
+        initial = super().get_initial()
+        token = self.request.GET.get("reservation")
+        if token:
+            try:
+                reservation = active_reservations().filter(token=token).first()
+            except ValidationError:
+                reservation = None
+            if reservation is not None:
+                initial.update(
+                    product=reservation.product_id,
+                    quantity=reservation.quantity,
+                    reservation=reservation.token,
+                )
+        return initial
+
+    def form_valid(self, form):
+        """
+        Salva a saída e redireciona para a lista de saídas.
+
+        Se a reserva informada expirar ou for consumida por outra venda entre a validação e a
+        gravação, a gravação é desfeita pelo formulário e o formulário é reapresentado com o
+        erro.
+
+        Argumentos:
+            form (OutflowForm): Formulário validado.
+
+        Retorna:
+            HttpResponse: Redirecionamento para a lista de saídas, ou o formulário com o erro.
+        """
+        try:
+            return super().form_valid(form)
+        except ValidationError as error:
+            form.add_error(None, error)
+            return self.form_invalid(form)
+
 
 class OutflowDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView):
     """
@@ -118,16 +202,18 @@ class OutflowCreateListAPIView(generics.ListCreateAPIView):
     """
     API view para listar e criar saídas.
 
-    Permite listar todas as saídas ou criar uma nova via métodos GET e POST.
+    Permite listar as saídas, paginadas por cursor, ou criar uma nova via métodos GET e POST.
     Usa o serializer OutflowSerializer para serializar os dados.
 
     Atributos:
         queryset: Todos os objetos Outflow.
         serializer_class: Serializer para Outflow.
+        pagination_class: Paginação por cursor sobre (created_at, id).
     """
 
     queryset = models.Outflow.objects.all()
     serializer_class = serializers.OutflowSerializer
+    pagination_class = KeysetPagination
 
 
 class OutflowRetrieveAPIView(generics.RetrieveAPIView):
@@ -144,3 +230,33 @@ class OutflowRetrieveAPIView(generics.RetrieveAPIView):
 
     queryset = models.Outflow.objects.all()
     serializer_class = serializers.OutflowSerializer
+
+
+class SaleCreateListAPIView(generics.ListCreateAPIView):
+    """
+    API view para listar vendas e criar uma venda com várias saídas.
+
+    Permite listar as vendas ou criar, via POST, uma venda com todas as suas linhas em uma
+    única requisição e transação. O estoque de todas as linhas é validado de uma só vez,
+    com os produtos envolvidos bloqueados.
+
+    Atributos:
+        queryset: Todos os objetos Sale, com as saídas pré-carregadas.
+        serializer_class: Serializer para Sale.
+    """
+
+    queryset = models.Sale.objects.prefetch_related("outflows")
+    serializer_class = serializers.SaleSerializer
+
+
+class SaleRetrieveAPIView(generics.RetrieveAPIView):
+    """
+    API view para recuperar detalhes de uma venda.
+
+    Atributos:
+        queryset: Todos os objetos Sale, com as saídas pré-carregadas.
+        serializer_class: Serializer para Sale.
+    """
+
+    queryset = models.Sale.objects.prefetch_related("outflows")
+    serializer_class = serializers.SaleSerializer
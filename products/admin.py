@@ -6,10 +6,15 @@ permitindo gerenciar instâncias de produtos diretamente no painel admin.
 
 Componentes principais:
     - ProductAdmin: Classe que personaliza a exibição e busca de produtos no admin.
+    - StockMovementAdmin: Classe que exibe o livro-razão de estoque no admin.
+    - StockSnapshotAdmin: Classe que exibe os instantâneos de estoque no admin.
+    - StockReservationAdmin: Classe que exibe as reservas de estoque no admin.
+    - StockCounterStripeAdmin: Classe que exibe as faixas dos contadores de estoque no admin.
 
 Dependências:
     - django.contrib.admin: Para funcionalidades de administração.
-    - .models: Para o modelo Product.
+    - .models: Para os modelos Product, StockMovement, StockSnapshot, StockReservation e
+               StockCounterStripe.
 """
 
 from django.contrib import admin
@@ -33,3 +38,78 @@ class ProductAdmin(admin.ModelAdmin):
 
 
 admin.site.register(models.Product, ProductAdmin)
+
+
+class StockMovementAdmin(admin.ModelAdmin):
+    """
+    Classe de administração para o modelo StockMovement.
+
+    Atributos:
+        list_display: Campos exibidos na lista de movimentações.
+        search_fields: Campos disponíveis para busca ("product__title").
+        list_select_related: Relacionamentos carregados junto com a lista.
+    """
+
+    list_display = ("product", "quantity", "inflow", "outflow", "created_at")
+    search_fields = ("product__title",)
+    list_select_related = ("product",)
+
+
+admin.site.register(models.StockMovement, StockMovementAdmin)
+
+
+class StockSnapshotAdmin(admin.ModelAdmin):
+    """
+    Classe de administração para o modelo StockSnapshot.
+
+    Atributos:
+        list_display: Campos exibidos na lista de instantâneos.
+        list_filter: Campos disponíveis para filtragem ("taken_at").
+        search_fields: Campos disponíveis para busca ("product__title").
+    """
+
+    list_display = ("product", "taken_at", "quantity", "cost_price")
+    list_filter = ("taken_at",)
+    search_fields = ("product__title",)
+
+
+admin.site.register(models.StockSnapshot, StockSnapshotAdmin)
+
+
+class StockReservationAdmin(admin.ModelAdmin):
+    """
+    Classe de administração para o modelo StockReservation.
+
+    Atributos:
+        list_display: Campos exibidos na lista de reservas.
+        list_filter: Campos disponíveis para filtragem ("status").
+        search_fields: Campos disponíveis para busca ("product__title").
+    """
+
+    list_display = ("product", "quantity", "status", "expires_at", "created_at")
+    list_filter = ("status",)
+    search_fields = ("product__title",)
+
+
+admin.site.register(models.StockReservation, StockReservationAdmin)
+
+
+class StockCounterStripeAdmin(admin.ModelAdmin):
+    """
+    Classe de administração para o modelo StockCounterStripe.
+
+    As faixas são mantidas pelos sinais e pelo comando `collapse_stock_stripes`, por isso
+    são exibidas apenas para consulta.
+
+    Atributos:
+        list_display: Campos exibidos na lista de faixas.
+        search_fields: Campos disponíveis para busca ("product__title").
+        readonly_fields: Campos que não podem ser alterados no admin.
+    """
+
+    list_display = ("product", "stripe", "quantity")
+    search_fields = ("product__title",)
+    readonly_fields = ("product", "stripe", "quantity")
+
+
+admin.site.register(models.StockCounterStripe, StockCounterStripeAdmin)
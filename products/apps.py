@@ -2,7 +2,8 @@
 Módulo de configuração da aplicação Products.
 
 Este módulo define a configuração da aplicação 'products' no Django,
-especificando opções como o tipo de campo automático padrão para chaves primárias.
+especificando opções como o tipo de campo automático padrão para chaves primárias
+e carregando os sinais associados.
 
 Componentes principais:
     - ProductsConfig: Classe de configuração da aplicação Products.
@@ -24,7 +25,18 @@ class ProductsConfig(AppConfig):
     Atributos:
         default_auto_field: Tipo de campo automático padrão para chaves primárias (BigAutoField).
         name: Nome da aplicação no projeto Django ("products").
+
+    Métodos:
+        ready: Carrega os sinais definidos no módulo products.signals ao iniciar a aplicação.
     """
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "products"
+
+    def ready(self):
+        """
+        Método chamado quando a aplicação está pronta.
+
+        Importa o módulo products.signals para registrar os sinais associados à aplicação.
+        """
+        import products.signals  # noqa: F401
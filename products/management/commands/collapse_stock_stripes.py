@@ -0,0 +1,69 @@
+"""
+Módulo do comando de recolhimento dos contadores de estoque divididos.
+
+Este módulo define o comando `collapse_stock_stripes`, que recolhe as faixas dos contadores
+de estoque divididos para a quantidade base dos produtos, mantendo `Product.quantity` próxima
+do estoque real para as telas e métricas. O mesmo comando ativa ou desativa a divisão do
+contador de um produto.
+
+Componentes principais:
+    - Command: Comando de gerenciamento que recolhe, ativa ou desativa as faixas.
+
+Uso:
+    python manage.py collapse_stock_stripes
+    python manage.py collapse_stock_stripes --product 42 --stripes 8
+    python manage.py collapse_stock_stripes --product 42 --stripes 0
+
+Dependências:
+    - django.core.management.base: Para as classes BaseCommand e CommandError.
+    - products.models: Para o modelo Product.
+    - products.stripes: Para o recolhimento e a configuração das faixas.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from products.models import Product
+from products.stripes import collapse_stock_stripes, enable_stock_stripes
+
+
+class Command(BaseCommand):
+    """
+    Comando que recolhe as faixas dos contadores de estoque divididos.
+
+    Argumentos:
+        --product: Id do produto (padrão: todos os produtos com faixas).
+        --stripes: Nova quantidade de faixas do produto informado (0 desativa a divisão).
+    """
+
+    help = "Recolhe as faixas dos contadores de estoque divididos para a quantidade dos produtos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--product",
+            type=int,
+            help="Id do produto (padrão: todos os produtos com faixas).",
+        )
+        parser.add_argument(
+            "--stripes",
+            type=int,
+            help="Nova quantidade de faixas do produto informado (0 desativa a divisão).",
+        )
+
+    def handle(self, *args, **options):
+        product_id = options["product"]
+        stripes = options["stripes"]
+        if stripes is None:
+            total = collapse_stock_stripes(None if product_id is None else [product_id])
+            self.stdout.write(self.style.SUCCESS(f"Produtos recolhidos: {total}."))
+            return
+
+        if product_id is None:
+            raise CommandError("Informe o produto com --product para alterar as faixas.")
+        if stripes < 0:
+            raise CommandError("A quantidade de faixas não pode ser negativa.")
+        try:
+            product = enable_stock_stripes(product_id, stripes)
+        except Product.DoesNotExist:
+            raise CommandError(f"Produto {product_id} não encontrado.")
+        self.stdout.write(
+            self.style.SUCCESS(f"Produto {product}: {product.stock_stripes} faixas.")
+        )
@@ -0,0 +1,44 @@
+"""
+Módulo do comando de expiração das reservas de estoque.
+
+Este módulo define o comando `expire_reservations`, que marca como expiradas, em lotes, as
+reservas de estoque ativas cujo prazo já venceu. As reservas vencidas já não são descontadas
+do estoque disponível; o comando apenas as retira do índice parcial das reservas ativas,
+mantendo-o pequeno.
+
+Componentes principais:
+    - Command: Comando de gerenciamento que expira as reservas vencidas.
+
+Uso:
+    python manage.py expire_reservations [--batch-size 10000]
+
+Dependências:
+    - django.core.management.base: Para a classe BaseCommand.
+    - products.reservations: Para a expiração das reservas.
+"""
+
+from django.core.management.base import BaseCommand
+from products.reservations import expire_reservations
+
+
+class Command(BaseCommand):
+    """
+    Comando que marca como expiradas as reservas de estoque vencidas.
+
+    Argumentos:
+        --batch-size: Quantidade máxima de reservas expiradas por UPDATE (padrão: 10000).
+    """
+
+    help = "Marca como expiradas as reservas de estoque vencidas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Quantidade máxima de reservas expiradas por UPDATE.",
+        )
+
+    def handle(self, *args, **options):
+        total = expire_reservations(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Reservas expiradas: {total}."))
@@ -0,0 +1,46 @@
+"""
+Módulo do comando de reconstrução dos vetores da busca textual.
+
+Este módulo define o comando `rebuild_search_vectors`, que recalcula o vetor da busca textual
+de todos os produtos (ver products.search). Os sinais mantêm o vetor nas gravações feitas
+pelas views, pela API e pelo admin; o comando deve ser executado após gravações que não
+disparam sinais, como importações com `bulk_create` ou alterações com `QuerySet.update`.
+
+Componentes principais:
+    - Command: Comando de gerenciamento que reconstrói os vetores de busca.
+
+Uso:
+    python manage.py rebuild_search_vectors [--batch-size 10000]
+
+Dependências:
+    - django.core.management.base: Para as classes BaseCommand e CommandError.
+    - django.db: Para a conexão com o banco de dados.
+    - products.models: Para o modelo Product.
+    - products.search: Para o recálculo dos vetores.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from products.models import Product
+from products.search import rebuild_search_vectors
+
+
+class Command(BaseCommand):
+    """
+    Comando que reconstrói o vetor da busca textual de todos os produtos.
+
+    Argumentos:
+        --batch-size: Quantidade de IDs de produtos processados por lote (padrão: 10000).
+    """
+
+    help = "Reconstrói o vetor da busca textual de todos os produtos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("A busca textual de produtos exige o PostgreSQL.")
+
+        total = rebuild_search_vectors(Product, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{total} vetores de busca reconstruídos."))
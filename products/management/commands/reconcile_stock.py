@@ -0,0 +1,201 @@
+"""
+Módulo do comando de conciliação do estoque.
+
+Este módulo define o comando `reconcile_stock`, que recalcula a quantidade esperada de cada
+produto como a soma das entradas menos a soma das saídas e a compara com `Product.quantity`
+(somadas as faixas, para produtos com contador dividido).
+O recálculo é feito por faixas de IDs de produtos, com consultas agrupadas por produto, e as
+faixas podem ser distribuídas entre vários processos. Nenhum bloqueio é mantido sobre a tabela
+de produtos: as leituras de cada faixa são feitas em uma transação somente leitura e, com
+`--fix`, apenas os produtos divergentes são corrigidos, com um UPDATE incremental por faixa.
+
+Componentes principais:
+    - reconcile_range: Função que concilia os produtos de uma faixa de IDs.
+    - Command: Comando de gerenciamento que distribui as faixas e relata as divergências.
+
+Uso:
+    python manage.py reconcile_stock [--batch-size 10000] [--workers 4] [--fix]
+
+Dependências:
+    - concurrent.futures.ProcessPoolExecutor: Para processar as faixas em paralelo.
+    - django: Para configurar o Django nos processos de trabalho.
+    - django.core.management.base: Para a classe BaseCommand.
+    - django.db: Para as conexões e o controle de transações.
+    - django.db.models: Para as funções de agregação.
+    - inflows.models, outflows.models: Para as entradas e saídas.
+    - products.models: Para o modelo Product.
+    - products.stripes: Para somar as faixas dos contadores de estoque divididos.
+    - products.stock: Para a correção incremental do estoque.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+from django.db.models import Max, Min, Sum
+from inflows.models import Inflow
+from outflows.models import Outflow
+from products.models import Product
+from products.stock import apply_stock_deltas
+from products.stripes import get_striped_quantities
+
+
+def sum_by_product(queryset, start, end):
+    """
+    Soma as quantidades positivas de entradas ou saídas por produto em uma faixa de IDs.
+
+    Argumentos:
+        queryset (QuerySet): Entradas ou saídas.
+        start (int): Primeiro ID de produto da faixa.
+        end (int): ID de produto final da faixa (exclusivo).
+
+    Retorna:
+        dict: Dicionário que associa o id de cada produto à soma das quantidades.
+    """
+    rows = (
+        queryset.filter(product_id__gte=start, product_id__lt=end, quantity__gt=0)
+        .values("product_id")
+        .annotate(total=Sum("quantity"))
+        .order_by()
+    )
+    return {row["product_id"]: row["total"] for row in rows}
+
+
+def reconcile_range(start, end, fix=False):
+    """
+    Concilia os produtos com IDs no intervalo [start, end).
+
+    As leituras (produtos, faixas dos contadores, entradas e saídas) são feitas na mesma transação somente
+    leitura; no PostgreSQL, com isolamento REPEATABLE READ, para que todas vejam o mesmo
+    instante do banco. A correção é aplicada como uma variação (`quantity = quantity + n`),
+    de modo que movimentações confirmadas depois da leitura não são desfeitas.
+
+    Argumentos:
+        start (int): Primeiro ID de produto da faixa.
+        end (int): ID de produto final da faixa (exclusivo).
+        fix (bool): Indica se as divergências devem ser corrigidas.
+
+    Retorna:
+        tuple: Quantidade de produtos verificados, lista de divergências no formato
+               (id, quantidade, quantidade esperada) e quantidade de produtos corrigidos.
+    """
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"
+                )
+        quantities = dict(
+            Product.objects.filter(id__gte=start, id__lt=end)
+            .order_by()
+            .values_list("id", "quantity")
+        )
+        striped = get_striped_quantities(
+            Product.objects.filter(id__gte=start, id__lt=end, stock_stripes__gt=0)
+            .order_by()
+            .values("id")
+        )
+        inflows = sum_by_product(Inflow.objects.all(), start, end)
+        outflows = sum_by_product(Outflow.objects.all(), start, end)
+
+    drifts = []
+    for product_id, quantity in quantities.items():
+        quantity += striped.get(product_id, 0)
+        expected = inflows.get(product_id, 0) - outflows.get(product_id, 0)
+        if quantity != expected:
+            drifts.append((product_id, quantity, expected))
+
+    fixed = 0
+    if fix and drifts:
+        with transaction.atomic():
+            fixed = apply_stock_deltas(
+                {product_id: expected - quantity for product_id, quantity, expected in drifts}
+            )
+    return len(quantities), drifts, fixed
+
+
+def init_worker():
+    """
+    Prepara um processo de trabalho para acessar o banco de dados.
+
+    Configura o Django, necessário quando os processos são iniciados com `spawn`. As conexões
+    do processo principal são fechadas antes da criação dos processos, de modo que cada
+    processo abre a sua própria conexão.
+    """
+    django.setup()
+
+
+class Command(BaseCommand):
+    """
+    Comando que concilia o estoque dos produtos com as entradas e saídas.
+
+    Argumentos:
+        --batch-size: Quantidade de IDs de produtos por faixa (padrão: 10000).
+        --workers: Quantidade de processos de trabalho (padrão: 1, sem paralelismo).
+        --fix: Corrige as divergências encontradas.
+        --max-report: Quantidade máxima de divergências listadas na saída (padrão: 20).
+    """
+
+    help = "Concilia o estoque dos produtos com a soma das entradas e saídas."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Quantidade de IDs de produtos por faixa.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Quantidade de processos de trabalho.",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Corrige as divergências encontradas.",
+        )
+        parser.add_argument(
+            "--max-report",
+            type=int,
+            default=20,
+            help="Quantidade máxima de divergências listadas na saída.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        fix = options["fix"]
+        bounds = Product.objects.aggregate(first_id=Min("id"), last_id=Max("id"))
+        if bounds["first_id"] is None:
+            self.stdout.write(self.style.SUCCESS("Nenhum produto cadastrado."))
+            return
+
+        starts = range(bounds["first_id"], bounds["last_id"] + 1, batch_size)
+        ends = [start + batch_size for start in starts]
+        fixes = [fix] * len(starts)
+        if options["workers"] > 1:
+            connections.close_all()
+            with ProcessPoolExecutor(
+                options["workers"], initializer=init_worker
+            ) as executor:
+                results = list(executor.map(reconcile_range, starts, ends, fixes))
+        else:
+            results = list(map(reconcile_range, starts, ends, fixes))
+
+        checked = sum(result[0] for result in results)
+        drifts = [drift for result in results for drift in result[1]]
+        fixed = sum(result[2] for result in results)
+
+        for product_id, quantity, expected in drifts[: options["max_report"]]:
+            self.stdout.write(
+                f"Produto {product_id}: estoque {quantity}, esperado {expected} "
+                f"(diferença {quantity - expected:+d})"
+            )
+        message = f"{checked} produtos verificados, {len(drifts)} divergentes"
+        if fix:
+            self.stdout.write(self.style.SUCCESS(f"{message}, {fixed} corrigidos."))
+        elif drifts:
+            self.stdout.write(self.style.WARNING(f"{message}."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{message}."))
@@ -0,0 +1,550 @@
+"""
+Módulo do comando de benchmark do sistema.
+
+Este módulo define o comando `sge_bench`, que cria um banco de dados temporário (o mesmo
+mecanismo usado pelos testes do Django), popula-o com categorias, marcas, fornecedores,
+produtos, entradas e saídas, e mede:
+    - cada função de `app.metrics`;
+    - cada ListView e DetailView registrada nas URLs do projeto;
+    - cada endpoint de listagem da API REST;
+    - as páginas do painel (home, home_async e o endpoint de dados do painel);
+    - as buscas por trecho das listagens, registrando também o plano de execução e os índices
+      escolhidos pelo planejador;
+    - as consultas frequentes das entradas e saídas (histórico por produto, somas por produto e
+      por dia e a listagem padrão), com e sem os índices de cobertura, registrando os planos
+      escolhidos pelo planejador antes e depois dos índices (a medição sem os índices é feita
+      apenas no PostgreSQL).
+
+Para cada alvo são registrados o tempo de parede (mínimo e mediana das repetições), a
+quantidade de consultas ao banco e o pico de memória alocada em Python. O resultado é gravado
+em JSON, permitindo comparar execuções e detectar regressões antes da implantação.
+
+Componentes principais:
+    - Command: Comando de gerenciamento que executa o benchmark.
+
+Uso:
+    python manage.py sge_bench --products 10000 --outflows 50000 --output bench.json
+
+Dependências:
+    - django.core.management.base: Para a classe BaseCommand.
+    - django.db: Para o banco temporário e a contagem de consultas.
+    - django.test: Para os clientes HTTP de teste e o ambiente de teste.
+    - rest_framework: Para o cliente e a identificação dos endpoints de listagem.
+    - app.metrics: Para as funções de métricas medidas.
+    - products.search: Para os vetores e a busca textual de produtos.
+"""
+
+import gc
+import json
+import platform
+import random
+import re
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+from django.views.generic import DetailView, ListView
+from rest_framework.mixins import ListModelMixin
+from rest_framework.test import APIClient
+from app import metrics
+from brands.models import Brand
+from categories.models import Category
+from inflows.models import Inflow
+from outflows.models import Outflow
+from products.models import Product
+from products.search import rebuild_search_vectors, search_products
+from suppliers.models import Supplier
+
+
+# Índices citados no plano de execução do PostgreSQL ("Index Scan using", "Index Only Scan
+# Backward using", "Bitmap Index Scan on") e do SQLite ("USING INDEX", "USING COVERING INDEX")
+PLAN_INDEX_RE = re.compile(
+    r"Index (?:Only )?Scan (?:Backward )?using (\w+)"
+    r"|Bitmap Index Scan on (\w+)"
+    r"|USING (?:COVERING )?INDEX (\w+)"
+)
+
+# Índices de cobertura das entradas e saídas, removidos temporariamente para registrar os planos
+# anteriores a eles
+MOVEMENT_INDEXES = (
+    "inflow_product_created_at",
+    "inflow_created_at_quantity",
+    "outflow_product_created_at",
+    "outflow_created_at_quantity",
+)
+
+
+class Command(BaseCommand):
+    """
+    Comando que popula um banco temporário e mede métricas, views e endpoints.
+
+    Argumentos:
+        --categories, --brands, --suppliers, --products, --inflows, --outflows:
+            Quantidade de registros criados de cada tipo.
+        --days: Quantidade de dias pelos quais as saídas são distribuídas.
+        --repeat: Quantidade de repetições de cada medição.
+        --warm-cache: Mantém o cache de métricas entre as repetições (por padrão ele é limpo).
+        --seed: Semente do gerador de números aleatórios.
+        --keepdb: Mantém o banco temporário ao final da execução.
+        --output: Arquivo JSON de saída (por padrão, a saída padrão).
+    """
+
+    help = "Popula um banco temporário e mede métricas, views e endpoints de listagem."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--brands", type=int, default=100)
+        parser.add_argument("--suppliers", type=int, default=50)
+        parser.add_argument("--products", type=int, default=5000)
+        parser.add_argument("--inflows", type=int, default=10000)
+        parser.add_argument("--outflows", type=int, default=20000)
+        parser.add_argument("--days", type=int, default=90)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--warm-cache", action="store_true")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keepdb", action="store_true")
+        parser.add_argument("--output", help="Arquivo JSON de saída.")
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.random = random.Random(options["seed"])
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            self.seed()
+            results = []
+            results += self.bench_metrics()
+            results += self.bench_views()
+            results += self.bench_api()
+            results += self.bench_search()
+            results += self.bench_movements()
+            report = dict(meta=self.get_meta(), results=results)
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output)
+            self.stderr.write(self.style.SUCCESS(f"Resultados gravados em {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def get_meta(self):
+        """
+        Retorna os metadados da execução (volumes, banco e ambiente).
+        """
+        sizes = (
+            "categories",
+            "brands",
+            "suppliers",
+            "products",
+            "inflows",
+            "outflows",
+            "days",
+            "repeat",
+            "warm_cache",
+            "seed",
+        )
+        return dict(
+            created_at=timezone.now().isoformat(),
+            database=connection.vendor,
+            python=platform.python_version(),
+            **{name: self.options[name] for name in sizes},
+        )
+
+    def seed(self):
+        """
+        Popula o banco temporário com dados aleatórios.
+
+        Os registros são criados com `bulk_create`; como os sinais de post_save não são
+        disparados, o estoque dos produtos, o resumo diário de vendas e os vetores da busca
+        textual são calculados ao final.
+        """
+        options = self.options
+        self.stderr.write("Populando o banco temporário...")
+
+        categories = Category.objects.bulk_create(
+            Category(name=f"Categoria {i}", description="Benchmark")
+            for i in range(options["categories"])
+        )
+        brands = Brand.objects.bulk_create(
+            Brand(name=f"Marca {i}") for i in range(options["brands"])
+        )
+        suppliers = Supplier.objects.bulk_create(
+            Supplier(name=f"Fornecedor {i}") for i in range(options["suppliers"])
+        )
+        products = []
+        for i in range(options["products"]):
+            cost_price = Decimal(self.random.randint(100, 100000)) / 100
+            products.append(
+                Product(
+                    title=f"Produto {i}",
+                    category=self.random.choice(categories),
+                    brand=self.random.choice(brands),
+                    description=f"Descrição do produto {i}",
+                    serie_number=f"SN-{i:08d}",
+                    cost_price=cost_price,
+                    selling_price=(cost_price * Decimal("1.4")).quantize(Decimal("0.01")),
+                )
+            )
+        products = Product.objects.bulk_create(products, batch_size=1000)
+
+        Inflow.objects.bulk_create(
+            (
+                Inflow(
+                    supplier=self.random.choice(suppliers),
+                    product=self.random.choice(products),
+                    quantity=self.random.randint(50, 500),
+                )
+                for _ in range(options["inflows"])
+            ),
+            batch_size=1000,
+        )
+
+        # As saídas são distribuídas pelos últimos dias, um lote por dia
+        days = max(options["days"], 1)
+        now = timezone.now()
+        for day in range(days):
+            count = options["outflows"] // days + (day < options["outflows"] % days)
+            outflows = []
+            for _ in range(count):
+                product = self.random.choice(products)
+                outflows.append(
+                    Outflow(
+                        product=product,
+                        quantity=self.random.randint(1, 5),
+                        unit_selling_price=product.selling_price,
+                        unit_cost_price=product.cost_price,
+                        description="Benchmark",
+                    )
+                )
+            created = Outflow.objects.bulk_create(outflows, batch_size=1000)
+            Outflow.objects.filter(id__in=[outflow.id for outflow in created]).update(
+                created_at=now - timedelta(days=day)
+            )
+
+        inflows = Inflow.objects.filter(product=OuterRef("pk")).values("product")
+        outflows = Outflow.objects.filter(product=OuterRef("pk")).values("product")
+        total_inflows = Coalesce(Subquery(inflows.annotate(total=Sum("quantity")).values("total")), 0)
+        total_outflows = Coalesce(Subquery(outflows.annotate(total=Sum("quantity")).values("total")), 0)
+        Product.objects.update(quantity=total_inflows - total_outflows)
+        call_command("rebuild_daily_sales_summary", stdout=StringIO())
+        rebuild_search_vectors(Product)
+
+        # Estatísticas atualizadas para o planejador e, no PostgreSQL, o mapa de visibilidade
+        # usado pelas varreduras somente de índice
+        with connection.cursor() as cursor:
+            cursor.execute("VACUUM ANALYZE" if connection.vendor == "postgresql" else "ANALYZE")
+
+        self.user = User.objects.create_superuser("sge_bench", "bench@sge.local", "sge_bench")
+
+    def measure(self, group, name, func):
+        """
+        Mede uma chamada: tempo de parede, quantidade de consultas e pico de memória.
+
+        Argumentos:
+            group (str): Grupo do alvo (metrics, views, api ou search).
+            name (str): Nome do alvo.
+            func (callable): Chamada sem argumentos a ser medida.
+
+        Retorna:
+            dict: Resultado da medição.
+        """
+        timings = []
+        queries = 0
+        for _ in range(self.options["repeat"]):
+            if not self.options["warm_cache"]:
+                cache.clear()
+            with CaptureQueriesContext(connection) as context:
+                start = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - start) * 1000)
+            queries = len(context)
+
+        # O pico de memória é medido em uma execução separada, pois o tracemalloc
+        # distorce o tempo de parede
+        if not self.options["warm_cache"]:
+            cache.clear()
+        gc.collect()
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stderr.write(f"{group}:{name} {statistics.median(timings):.1f} ms, {queries} consultas")
+        return dict(
+            group=group,
+            name=name,
+            wall_ms_min=round(min(timings), 3),
+            wall_ms_median=round(statistics.median(timings), 3),
+            queries=queries,
+            peak_memory_kb=round(peak / 1024, 1),
+        )
+
+    def bench_metrics(self):
+        """
+        Mede cada função de métrica de `app.metrics`.
+        """
+        targets = dict(
+            get_product_metrics=metrics.get_product_metrics,
+            get_sales_metrics=metrics.get_sales_metrics,
+            summarize_products=lambda: metrics.summarize_products(Product.objects.all()),
+            summarize_outflows=lambda: metrics.summarize_outflows(Outflow.objects.all()),
+            get_graphic_product_category_metric=metrics.get_graphic_product_category_metric,
+            get_graphic_product_brand_metric=metrics.get_graphic_product_brand_metric,
+            get_graphic_product_brand_metric_top=lambda: metrics.get_graphic_product_brand_metric(
+                top=metrics.GRAPHIC_TOP_N
+            ),
+            get_last_updated=metrics.get_last_updated,
+        )
+        for days in metrics.DAILY_SALES_RANGES:
+            targets[f"get_daily_sales_data_{days}"] = (
+                lambda days=days: metrics.get_daily_sales_data(days)
+            )
+            targets[f"get_daily_sales_quantity_data_{days}"] = (
+                lambda days=days: metrics.get_daily_sales_quantity_data(days)
+            )
+        return [self.measure("metrics", name, func) for name, func in targets.items()]
+
+    def iter_url_patterns(self, patterns=None):
+        """
+        Percorre recursivamente as rotas do projeto.
+        """
+        if patterns is None:
+            patterns = get_resolver().url_patterns
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from self.iter_url_patterns(pattern.url_patterns)
+            else:
+                yield pattern
+
+    def get_url(self, pattern, view_class):
+        """
+        Monta a URL de uma rota, usando o primeiro registro do modelo quando há `pk`.
+        """
+        if "pk" not in pattern.pattern.regex.groupindex:
+            return reverse(pattern.name)
+        instance = view_class.model.objects.order_by("pk").first()
+        return reverse(pattern.name, kwargs={"pk": instance.pk})
+
+    def get(self, client, url, status=200):
+        """
+        Executa uma requisição GET e valida o status da resposta.
+        """
+        response = client.get(url)
+        if response.status_code != status:
+            raise RuntimeError(f"{url} retornou {response.status_code}")
+        return response
+
+    def bench_views(self):
+        """
+        Mede as páginas do painel e cada ListView e DetailView do projeto.
+        """
+        client = Client()
+        client.force_login(self.user)
+
+        results = []
+        for name in ("home", "home_async", "dashboard-api-view"):
+            url = reverse(name)
+            results.append(self.measure("views", name, lambda url=url: self.get(client, url)))
+
+        for pattern in self.iter_url_patterns():
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class is None or not issubclass(view_class, (ListView, DetailView)):
+                continue
+            url = self.get_url(pattern, view_class)
+            results.append(
+                self.measure("views", pattern.name, lambda url=url: self.get(client, url))
+            )
+        return results
+
+    def bench_api(self):
+        """
+        Mede cada endpoint de listagem da API REST.
+        """
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        results = []
+        for pattern in self.iter_url_patterns():
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class is None or not issubclass(view_class, ListModelMixin):
+                continue
+            url = reverse(pattern.name)
+            results.append(
+                self.measure("api", pattern.name, lambda url=url: self.get(client, url))
+            )
+        return results
+
+    def explain(self, queryset):
+        """
+        Retorna o plano de execução de uma consulta e os índices escolhidos pelo planejador.
+        """
+        plan = queryset.explain()
+        indexes = sorted({"".join(match) for match in PLAN_INDEX_RE.findall(plan)})
+        return dict(plan=plan.splitlines(), indexes=indexes)
+
+    def bench_search(self):
+        """
+        Mede as buscas por trecho das listagens e registra o plano de cada consulta.
+
+        Os termos buscados são trechos de registros existentes, seletivos o bastante para que
+        o planejador do PostgreSQL prefira os índices de trigramas à varredura da tabela. A
+        busca textual de produtos usa o título completo de um produto.
+        """
+        client = Client()
+        client.force_login(self.user)
+
+        product = Product.objects.order_by("?").first()
+        title, serie_number = product.title[-6:], product.serie_number[-6:]
+        brand = Brand.objects.order_by("?").first().name[-4:]
+        category = Category.objects.order_by("?").first().name[-4:]
+        supplier = Supplier.objects.order_by("?").first().name[-4:]
+        targets = dict(
+            product_title=(
+                "product_list",
+                dict(title=title),
+                Product.objects.filter(title__icontains=title),
+            ),
+            product_serie_number=(
+                "product_list",
+                dict(serie_number=serie_number),
+                Product.objects.filter(serie_number__icontains=serie_number),
+            ),
+            product_search=(
+                "product_list",
+                dict(search=product.title),
+                search_products(Product.objects.all(), product.title),
+            ),
+            inflow_product=(
+                "inflow_list",
+                dict(product=title),
+                Inflow.objects.filter(product__title__icontains=title),
+            ),
+            outflow_product=(
+                "outflow_list",
+                dict(product=title),
+                Outflow.objects.filter(product__title__icontains=title),
+            ),
+            brand_name=(
+                "brand_list",
+                dict(name=brand),
+                Brand.objects.filter(name__icontains=brand),
+            ),
+            category_name=(
+                "category_list",
+                dict(name=category),
+                Category.objects.filter(name__icontains=category),
+            ),
+            supplier_name=(
+                "supplier_list",
+                dict(name=supplier),
+                Supplier.objects.filter(name__icontains=supplier),
+            ),
+        )
+
+        results = []
+        for name, (url_name, params, queryset) in targets.items():
+            url = f"{reverse(url_name)}?{urlencode(params)}"
+            result = self.measure("search", name, lambda url=url: self.get(client, url))
+            result.update(self.explain(queryset))
+            self.stderr.write(f"search:{name} índices: {', '.join(result['indexes']) or '-'}")
+            results.append(result)
+        return results
+
+    def bench_movements(self):
+        """
+        Mede as consultas frequentes das entradas e saídas, com e sem os índices de cobertura.
+
+        Os índices de MOVEMENT_INDEXES são removidos em uma transação desfeita ao final, de
+        modo que o mesmo banco registra o plano e o tempo de cada consulta antes dos índices
+        (grupo movements_baseline) e depois deles (grupo movements). A medição sem os índices
+        só é feita no PostgreSQL: nos demais bancos, que ignoram as colunas incluídas
+        (`INCLUDE`), os índices não são de cobertura e a comparação não seria representativa.
+        """
+        product = Product.objects.order_by("?").first()
+        since = timezone.now() - timedelta(days=7)
+        targets = {}
+        for name, model in (("inflow", Inflow), ("outflow", Outflow)):
+            targets[f"{name}_product_history"] = model.objects.filter(
+                product=product
+            ).order_by("-created_at")[:20]
+            targets[f"{name}_sum_by_product"] = (
+                model.objects.filter(
+                    product_id__gte=product.id, product_id__lt=product.id + 1000, quantity__gt=0
+                )
+                .values("product_id")
+                .annotate(total=Sum("quantity"))
+                .order_by()
+            )
+            targets[f"{name}_daily_quantity"] = (
+                model.objects.filter(created_at__gte=since)
+                .annotate(date=TruncDate("created_at"))
+                .values("date")
+                .annotate(total=Sum("quantity"))
+                .order_by("date")
+            )
+            targets[f"{name}_list"] = model.objects.all()[:100]
+
+        results = self.measure_plans("movements", targets)
+        if connection.vendor != "postgresql":
+            self.stderr.write(
+                self.style.WARNING(
+                    "movements_baseline ignorado: a comparação com e sem os índices de "
+                    "cobertura exige o PostgreSQL (banco atual: "
+                    f"{connection.vendor})."
+                )
+            )
+            return results
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for index in MOVEMENT_INDEXES:
+                    cursor.execute(f"DROP INDEX {connection.ops.quote_name(index)}")
+            results += self.measure_plans("movements_baseline", targets)
+            transaction.set_rollback(True)
+        return results
+
+    def measure_plans(self, group, targets):
+        """
+        Mede cada consulta e registra o seu plano de execução.
+
+        Argumentos:
+            group (str): Grupo dos alvos.
+            targets (dict): Consultas medidas, pelo nome do alvo.
+
+        Retorna:
+            list: Resultados das medições, com o plano e os índices de cada consulta.
+        """
+        results = []
+        for name, queryset in targets.items():
+            result = self.measure(group, name, lambda queryset=queryset: list(queryset.all()))
+            result.update(self.explain(queryset))
+            self.stderr.write(f"{group}:{name} índices: {', '.join(result['indexes']) or '-'}")
+            results.append(result)
+        return results
@@ -0,0 +1,120 @@
+"""
+Módulo do comando de instantâneos de estoque.
+
+Este módulo define o comando `snapshot_stock`, que grava o estoque de cada produto em um
+instante (por padrão, a meia-noite do dia atual). O estoque é calculado a partir do
+instantâneo anterior e das movimentações do livro-razão desde então, e apenas os produtos que
+tiveram movimentações recebem um novo instantâneo. O cálculo é feito em lotes de IDs de
+produtos, com uma consulta agrupada e uma inserção em lote por faixa.
+
+Deve ser executado diariamente, alguns minutos após o instante do instantâneo, para que as
+movimentações de transações ainda abertas naquele instante já tenham sido confirmadas.
+
+Componentes principais:
+    - Command: Comando de gerenciamento que grava os instantâneos de estoque.
+
+Uso:
+    python manage.py snapshot_stock [--at 2025-01-31T23:59:59] [--batch-size 1000]
+
+Dependências:
+    - datetime: Para interpretar o instante informado.
+    - django.core.management.base: Para as classes BaseCommand e CommandError.
+    - django.db.models: Para as funções de agregação Min e Max.
+    - django.utils.timezone: Para o fuso horário do instante.
+    - products.models: Para os modelos Product e StockSnapshot.
+    - products.stock: Para o cálculo do estoque em um instante.
+"""
+
+from datetime import datetime, time
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+from products.models import Product, StockSnapshot
+from products.stock import annotate_stock_at
+
+
+class Command(BaseCommand):
+    """
+    Comando que grava os instantâneos de estoque dos produtos movimentados.
+
+    Argumentos:
+        --at: Instante do instantâneo, no formato ISO (padrão: meia-noite do dia atual).
+        --batch-size: Quantidade de IDs de produtos processados por lote (padrão: 1000).
+    """
+
+    help = "Grava os instantâneos de estoque dos produtos movimentados desde o último instantâneo."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--at",
+            help="Instante do instantâneo, no formato ISO (padrão: meia-noite do dia atual).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Quantidade de IDs de produtos processados por lote.",
+        )
+
+    def handle(self, *args, **options):
+        at = self.get_instant(options["at"])
+        batch_size = options["batch_size"]
+        bounds = Product.objects.aggregate(first_id=Min("id"), last_id=Max("id"))
+        if bounds["first_id"] is None:
+            self.stdout.write(self.style.SUCCESS("Nenhum produto cadastrado."))
+            return
+
+        total = 0
+        for start in range(bounds["first_id"], bounds["last_id"] + 1, batch_size):
+            total += self.snapshot_batch(at, start, start + batch_size)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Instantâneos de estoque gravados em {at}: {total} produtos.")
+        )
+
+    def get_instant(self, value):
+        """
+        Retorna o instante do instantâneo.
+
+        Argumentos:
+            value (str): Instante no formato ISO, ou None para a meia-noite do dia atual.
+
+        Retorna:
+            datetime: Instante com fuso horário.
+        """
+        if value is None:
+            return timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+        try:
+            at = datetime.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f"Instante inválido: {value}")
+        if timezone.is_naive(at):
+            at = timezone.make_aware(at)
+        return at
+
+    def snapshot_batch(self, at, start, end):
+        """
+        Grava os instantâneos dos produtos com IDs no intervalo [start, end).
+
+        Argumentos:
+            at (datetime): Instante do instantâneo.
+            start (int): Primeiro ID de produto do lote.
+            end (int): ID de produto final do lote (exclusivo).
+
+        Retorna:
+            int: Quantidade de produtos do lote com movimentações desde o último instantâneo.
+        """
+        products = annotate_stock_at(
+            Product.objects.filter(id__gte=start, id__lt=end), at
+        ).filter(tail_count__gt=0)
+        snapshots = [
+            StockSnapshot(
+                product_id=product.pk,
+                taken_at=at,
+                quantity=product.stock_at,
+                cost_price=product.cost_price,
+            )
+            for product in products
+        ]
+        StockSnapshot.objects.bulk_create(snapshots, ignore_conflicts=True)
+        return len(snapshots)
@@ -0,0 +1,413 @@
+"""
+Módulo do comando de benchmark de concorrência sobre o estoque.
+
+Este módulo define o comando `stock_concurrency`, que cria um banco de dados temporário (o
+mesmo mecanismo usado pelos testes do Django e pelo comando `sge_bench`), cadastra M produtos
+e dispara K gravações de saída simultâneas sobre eles a partir de várias threads, cada uma
+com a sua própria conexão, para comparar as estratégias de gravação do estoque com números
+reais. A medição é repetida para cada alvo e para cada quantidade de faixas do contador de
+estoque informada.
+
+Os alvos medidos são:
+    - view: POST no formulário de saída (OutflowCreateView), com a validação de estoque do
+      formulário;
+    - api: POST no endpoint de saídas (OutflowCreateListAPIView);
+    - outflow: criação de uma saída pelo ORM, com todos os sinais (estoque, livro-razão e
+      resumo diário de vendas);
+    - stock: apenas a variação do contador de estoque (`adjust_product_quantity`).
+
+Para cada medição são registrados a vazão, a mediana e o p95 da latência das gravações
+confirmadas, as gravações recusadas pela validação, os deadlocks, as falhas de serialização,
+as violações da restrição de estoque e os demais erros. Ao final, as faixas são recolhidas e
+o estoque de cada produto é comparado com a soma das suas entradas e saídas gravadas,
+detectando produtos com estoque negativo (venda acima do estoque) e atualizações perdidas.
+Com `--initial-stock` baixo, as gravações disputam o último estoque disponível, expondo as
+vendas acima do estoque.
+
+O resultado só é representativo em um banco com bloqueio por linha, como o PostgreSQL; no
+SQLite todas as gravações são serializadas pelo bloqueio do arquivo.
+
+Componentes principais:
+    - classify_error: Função que classifica uma falha do banco de dados pelo SQLSTATE.
+    - Command: Comando de gerenciamento que executa o benchmark de concorrência.
+
+Uso:
+    python manage.py stock_concurrency --targets view,api,outflow --products 4 --threads 16
+    python manage.py stock_concurrency --targets api --initial-stock 100 --operations 50
+
+Dependências:
+    - concurrent.futures.ThreadPoolExecutor: Para as gravações simultâneas.
+    - logging: Para silenciar o registro das falhas esperadas das views.
+    - django.core.management.base: Para as classes BaseCommand e CommandError.
+    - django.db: Para o banco temporário, as conexões e o controle de transações.
+    - django.test: Para o cliente HTTP de teste e o ambiente de teste.
+    - rest_framework.test: Para o cliente da API REST.
+    - inflows.models, outflows.models: Para as entradas e saídas.
+    - products.models: Para os modelos de produto.
+    - products.stock: Para a variação do contador de estoque.
+    - products.stripes: Para a configuração, o recolhimento e a leitura das faixas.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import random
+import statistics
+import threading
+import time
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Sum
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from rest_framework.test import APIClient
+from brands.models import Brand
+from categories.models import Category
+from inflows.models import Inflow
+from outflows.models import Outflow
+from products.models import Product
+from products.stock import adjust_product_quantity
+from products.stripes import (
+    collapse_stock_stripes,
+    enable_stock_stripes,
+    get_striped_quantities,
+)
+from suppliers.models import Supplier
+
+# SQLSTATE das falhas classificadas separadamente
+DEADLOCK = "40P01"
+SERIALIZATION_FAILURE = "40001"
+CHECK_VIOLATION = "23514"
+
+
+def classify_error(error):
+    """
+    Classifica uma falha do banco de dados pelo SQLSTATE do driver.
+
+    Argumentos:
+        error (DatabaseError): Falha levantada pelo Django.
+
+    Retorna:
+        str: deadlocks, serialization_failures, check_violations ou errors.
+    """
+    cause = error.__cause__
+    code = getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+    if code == DEADLOCK:
+        return "deadlocks"
+    if code == SERIALIZATION_FAILURE:
+        return "serialization_failures"
+    if code == CHECK_VIOLATION:
+        return "check_violations"
+    return "errors"
+
+
+class Command(BaseCommand):
+    """
+    Comando que mede gravações de saída simultâneas sobre um conjunto de produtos.
+
+    Argumentos:
+        --targets: Alvos medidos, separados por vírgula (padrão: view,api,outflow,stock).
+        --stripes: Quantidades de faixas medidas, separadas por vírgula (padrão: 0,2,4,8).
+        --products: Quantidade de produtos disputados (padrão: 1).
+        --threads: Quantidade de threads simultâneas (padrão: 8).
+        --operations: Quantidade de gravações por thread (padrão: 100).
+        --quantity: Quantidade de cada saída (padrão: 1).
+        --initial-stock: Estoque inicial de cada produto (padrão: 1000000000).
+        --seed: Semente do sorteio dos produtos.
+        --keepdb: Mantém o banco temporário ao final da execução.
+        --output: Arquivo JSON de saída (por padrão, a saída padrão).
+    """
+
+    help = "Mede a vazão, a latência e as falhas de gravações de saída simultâneas."
+
+    targets = ("view", "api", "outflow", "stock")
+    sizes = ("products", "threads", "operations", "quantity", "initial_stock")
+    outcomes = (
+        "rejected",
+        "deadlocks",
+        "serialization_failures",
+        "check_violations",
+        "errors",
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--targets", default=",".join(self.targets))
+        parser.add_argument("--stripes", default="0,2,4,8")
+        parser.add_argument("--products", type=int, default=1)
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--operations", type=int, default=100)
+        parser.add_argument("--quantity", type=int, default=1)
+        parser.add_argument("--initial-stock", type=int, default=10**9)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keepdb", action="store_true")
+        parser.add_argument("--output", help="Arquivo JSON de saída.")
+
+    def handle(self, *args, **options):
+        self.options = options
+        try:
+            stripes = [int(value) for value in options["stripes"].split(",")]
+        except ValueError:
+            raise CommandError(f"Quantidades de faixas inválidas: {options['stripes']}")
+        targets = options["targets"].split(",")
+        for target in targets:
+            if target not in self.targets:
+                raise CommandError(f"Alvo desconhecido: {target}")
+
+        # As falhas esperadas das views (deadlocks, bloqueios) são contadas, não registradas
+        request_logger = logging.getLogger("django.request")
+        request_level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            self.seed()
+            results = [
+                self.measure(target, count) for target in targets for count in stripes
+            ]
+            report = dict(
+                database=connection.vendor,
+                **{name: options[name] for name in self.sizes},
+                results=results,
+            )
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+            request_logger.setLevel(request_level)
+
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output)
+            self.stderr.write(self.style.SUCCESS(f"Resultados gravados em {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def seed(self):
+        """
+        Cadastra os registros comuns a todas as medições.
+        """
+        self.category = Category.objects.create(name="Benchmark")
+        self.brand = Brand.objects.create(name="Benchmark")
+        self.supplier = Supplier.objects.create(name="Benchmark")
+        self.user = User.objects.create_superuser(
+            "stock_concurrency", "bench@sge.local", "stock_concurrency"
+        )
+
+    def create_products(self, stripes):
+        """
+        Cadastra os produtos disputados em uma medição, com o estoque inicial.
+
+        Produtos novos a cada medição mantêm as medições independentes entre si.
+
+        Argumentos:
+            stripes (int): Quantidade de faixas do contador de cada produto.
+
+        Retorna:
+            list: Produtos cadastrados.
+        """
+        products = []
+        for i in range(self.options["products"]):
+            product = Product.objects.create(
+                title=f"Produto concorrido {i}",
+                category=self.category,
+                brand=self.brand,
+                cost_price=Decimal("10.00"),
+                selling_price=Decimal("14.00"),
+            )
+            Inflow.objects.create(
+                supplier=self.supplier,
+                product=product,
+                quantity=self.options["initial_stock"],
+            )
+            products.append(enable_stock_stripes(product.pk, stripes))
+        return products
+
+    def get_client(self, target):
+        """
+        Retorna o cliente HTTP autenticado de uma thread, para os alvos view e api.
+
+        Argumentos:
+            target (str): Alvo medido.
+
+        Retorna:
+            Client: Cliente autenticado, ou None para os alvos sem HTTP.
+        """
+        if target == "view":
+            client = Client()
+            client.force_login(self.user)
+            return client
+        if target == "api":
+            client = APIClient()
+            client.force_authenticate(self.user)
+            return client
+        return None
+
+    def write(self, target, client, product):
+        """
+        Executa uma gravação do alvo informado.
+
+        Argumentos:
+            target (str): Alvo medido.
+            client (Client): Cliente HTTP da thread (alvos view e api).
+            product (Product): Produto da saída.
+
+        Retorna:
+            bool: Indica se a gravação foi confirmada (False quando recusada pela validação).
+        """
+        quantity = self.options["quantity"]
+        data = dict(product=product.pk, quantity=quantity, description="Benchmark")
+        if target == "view":
+            return client.post(reverse("outflow_create"), data).status_code == 302
+        if target == "api":
+            url = reverse("outflow-create-list-api-view")
+            return client.post(url, data, format="json").status_code == 201
+        with transaction.atomic():
+            if target == "outflow":
+                Outflow.objects.create(**dict(data, product=product))
+            else:
+                adjust_product_quantity(product.pk, -quantity, product.stock_stripes)
+        return True
+
+    def run_thread(self, target, products, barrier, index):
+        """
+        Executa as gravações de uma thread e mede a latência de cada uma.
+
+        Argumentos:
+            target (str): Alvo medido.
+            products (list): Produtos disputados, sorteados a cada gravação.
+            barrier (threading.Barrier): Barreira que libera todas as threads juntas.
+            index (int): Índice da thread, usado na semente do sorteio.
+
+        Retorna:
+            tuple: Latências das gravações confirmadas (em ms), contagem de cada desfecho
+                   e quantidade confirmada por produto (alvo stock).
+        """
+        rng = random.Random(self.options["seed"] + index)
+        latencies = []
+        outcomes = dict.fromkeys(self.outcomes, 0)
+        applied = dict.fromkeys((product.pk for product in products), 0)
+        try:
+            try:
+                client = self.get_client(target)
+            except Exception:
+                barrier.abort()
+                raise
+            barrier.wait()
+            for _ in range(self.options["operations"]):
+                product = rng.choice(products)
+                start = time.perf_counter()
+                try:
+                    committed = self.write(target, client, product)
+                except DatabaseError as error:
+                    outcomes[classify_error(error)] += 1
+                    continue
+                if not committed:
+                    outcomes["rejected"] += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+                applied[product.pk] += self.options["quantity"]
+        finally:
+            connection.close()
+        return latencies, outcomes, applied
+
+    def check_products(self, target, products, applied):
+        """
+        Confere o estoque final dos produtos com as movimentações gravadas.
+
+        Argumentos:
+            target (str): Alvo medido.
+            products (list): Produtos disputados.
+            applied (dict): Quantidade confirmada por produto, usada no alvo stock, que não
+                            grava saídas.
+
+        Retorna:
+            tuple: Quantidade de produtos com estoque negativo e soma, em módulo, das
+                   diferenças entre o estoque e o esperado (atualizações perdidas).
+        """
+        product_ids = [product.pk for product in products]
+        collapse_stock_stripes(product_ids)
+        quantities = dict(
+            Product.objects.filter(pk__in=product_ids).values_list("pk", "quantity")
+        )
+        striped = get_striped_quantities(product_ids)
+        outflows = dict(
+            Outflow.objects.filter(product_id__in=product_ids, quantity__gt=0)
+            .values("product_id")
+            .annotate(total=Sum("quantity"))
+            .order_by()
+            .values_list("product_id", "total")
+        )
+
+        negative = 0
+        lost_updates = 0
+        for product_id in product_ids:
+            stock = quantities[product_id] + striped.get(product_id, 0)
+            sold = applied[product_id] if target == "stock" else outflows.get(product_id, 0)
+            negative += stock < 0
+            lost_updates += abs(stock - (self.options["initial_stock"] - sold))
+        return negative, lost_updates
+
+    def measure(self, target, stripes):
+        """
+        Mede as gravações simultâneas de um alvo com uma quantidade de faixas.
+
+        Argumentos:
+            target (str): Alvo medido.
+            stripes (int): Quantidade de faixas do contador dos produtos.
+
+        Retorna:
+            dict: Resultado da medição.
+        """
+        products = self.create_products(stripes)
+        threads = self.options["threads"]
+        barrier = threading.Barrier(threads)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as executor:
+            results = list(
+                executor.map(
+                    lambda index: self.run_thread(target, products, barrier, index),
+                    range(threads),
+                )
+            )
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(latency for result in results for latency in result[0])
+        outcomes = {
+            name: sum(result[1][name] for result in results) for name in self.outcomes
+        }
+        applied = {
+            product.pk: sum(result[2][product.pk] for result in results)
+            for product in products
+        }
+        negative, lost_updates = self.check_products(target, products, applied)
+
+        self.stderr.write(
+            f"{target} com {stripes} faixas: {len(latencies) / elapsed:.1f} gravações/s, "
+            f"{outcomes['deadlocks']} deadlocks, {outcomes['errors']} erros, "
+            f"{negative} produtos negativos, {lost_updates} atualizações perdidas"
+        )
+        return dict(
+            target=target,
+            stripes=stripes,
+            committed=len(latencies),
+            **outcomes,
+            seconds=round(elapsed, 3),
+            throughput_per_second=round(len(latencies) / elapsed, 1),
+            latency_ms_median=round(statistics.median(latencies), 3) if latencies else None,
+            latency_ms_p95=(
+                round(latencies[max(int(len(latencies) * 0.95) - 1, 0)], 3)
+                if latencies
+                else None
+            ),
+            negative_products=negative,
+            lost_updates=lost_updates,
+        )
@@ -0,0 +1,63 @@
+"""
+Módulo do comando de instalação dos gatilhos de estoque.
+
+Este módulo define o comando `stock_triggers`, que instala, remove ou consulta os gatilhos
+do PostgreSQL que mantêm o estoque dos produtos (ver products.triggers). Ao instalar, as
+faixas dos contadores divididos são recolhidas, pois os gatilhos alteram apenas a quantidade
+base. Após a troca de modo, os processos da aplicação devem ser reiniciados.
+
+Componentes principais:
+    - Command: Comando de gerenciamento que instala, remove ou consulta os gatilhos.
+
+Uso:
+    python manage.py stock_triggers install
+    python manage.py stock_triggers uninstall
+    python manage.py stock_triggers status
+
+Dependências:
+    - django.core.management.base: Para as classes BaseCommand e CommandError.
+    - django.db: Para a conexão e o controle de transações.
+    - products.stripes: Para o recolhimento das faixas.
+    - products.triggers: Para a instalação e a remoção dos gatilhos.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from products.stripes import collapse_stock_stripes
+from products.triggers import (
+    install_stock_triggers,
+    stock_triggers_installed,
+    uninstall_stock_triggers,
+)
+
+
+class Command(BaseCommand):
+    """
+    Comando que instala, remove ou consulta os gatilhos de estoque do PostgreSQL.
+
+    Argumentos:
+        action: Ação executada (install, uninstall ou status).
+    """
+
+    help = "Instala, remove ou consulta os gatilhos de estoque do PostgreSQL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["install", "uninstall", "status"])
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Os gatilhos de estoque exigem o PostgreSQL.")
+
+        action = options["action"]
+        if action == "install":
+            with transaction.atomic():
+                collapse_stock_stripes()
+                install_stock_triggers(connection)
+        elif action == "uninstall":
+            with transaction.atomic():
+                uninstall_stock_triggers(connection)
+
+        if stock_triggers_installed(connection):
+            self.stdout.write(self.style.SUCCESS("Gatilhos de estoque instalados."))
+        else:
+            self.stdout.write(self.style.WARNING("Gatilhos de estoque não instalados."))
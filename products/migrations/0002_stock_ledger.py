@@ -0,0 +1,146 @@
+"""
+Módulo de migração para o livro-razão de estoque.
+
+Este módulo cria as tabelas de movimentações de estoque (StockMovement), alimentada pelas
+entradas e saídas, e de instantâneos de estoque por produto (StockSnapshot).
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - CreateModel: Operações que criam os modelos StockMovement e StockSnapshot no banco de dados.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para a definição dos campos do modelo.
+    - inflows, outflows: Para os relacionamentos das movimentações com as entradas e saídas.
+"""
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para o livro-razão de estoque.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - CreateModel: Cria o modelo StockMovement com os campos:
+            - id: Chave primária automática.
+            - quantity: Variação do estoque.
+            - created_at: Data e hora da movimentação.
+            - inflow, outflow: Relacionamentos opcionais com a entrada ou saída de origem.
+            - product: Relacionamento com Product.
+          e o índice por produto e data.
+        - CreateModel: Cria o modelo StockSnapshot com os campos:
+            - id: Chave primária automática.
+            - taken_at: Instante do instantâneo.
+            - quantity: Quantidade em estoque no instante.
+            - cost_price: Preço de custo do produto.
+            - product: Relacionamento com Product.
+          e a restrição de unicidade da combinação de produto e instante.
+    """
+
+    dependencies = [
+        ("inflows", "0001_initial"),
+        ("outflows", "0007_sale"),
+        ("products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockMovement",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("quantity", models.IntegerField()),
+                (
+                    "created_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "inflow",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="stock_movements",
+                        to="inflows.inflow",
+                    ),
+                ),
+                (
+                    "outflow",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="stock_movements",
+                        to="outflows.outflow",
+                    ),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stock_movements",
+                        to="products.product",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["product", "created_at"],
+                        name="stock_movement_product_date",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="StockSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("taken_at", models.DateTimeField()),
+                ("quantity", models.IntegerField()),
+                (
+                    "cost_price",
+                    models.DecimalField(decimal_places=2, max_digits=20),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stock_snapshots",
+                        to="products.product",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-taken_at"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("product", "taken_at"), name="unique_stock_snapshot"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,96 @@
+"""
+Módulo de migração de dados para o livro-razão de estoque.
+
+Este módulo preenche o livro-razão com as entradas e saídas já existentes, para que o estoque
+em um instante possa ser calculado também para o período anterior à sua criação. O
+preenchimento é feito em lotes de IDs, com uma leitura e uma inserção em lote por faixa,
+mantendo o uso de memória limitado ao lote.
+
+Componentes principais:
+    - BATCH_SIZE: Quantidade de IDs processados por lote.
+    - backfill_movements: Função que copia as movimentações de um modelo em lotes.
+    - backfill_stock_ledger: Função que preenche o livro-razão com as entradas e as saídas.
+    - Migration: Classe que define a migração de dados.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para as funções de agregação Min e Max.
+"""
+
+from django.db import migrations
+from django.db.models import Max, Min
+
+BATCH_SIZE = 5000
+
+
+def backfill_movements(StockMovement, queryset, source, sign):
+    """
+    Copia para o livro-razão as movimentações de um modelo, em lotes de IDs.
+
+    Argumentos:
+        StockMovement: Modelo histórico de movimentações de estoque.
+        queryset (QuerySet): Entradas ou saídas que alteraram o estoque.
+        source (str): Nome do campo de origem da movimentação ("inflow" ou "outflow").
+        sign (int): Sinal da variação (1 para entradas, -1 para saídas).
+    """
+    bounds = queryset.aggregate(first_id=Min("id"), last_id=Max("id"))
+    if bounds["first_id"] is None:
+        return
+
+    for start in range(bounds["first_id"], bounds["last_id"] + 1, BATCH_SIZE):
+        rows = queryset.filter(id__gte=start, id__lt=start + BATCH_SIZE).values_list(
+            "id", "product_id", "quantity", "created_at"
+        )
+        StockMovement.objects.bulk_create(
+            [
+                StockMovement(
+                    product_id=product_id,
+                    quantity=sign * quantity,
+                    created_at=created_at,
+                    **{f"{source}_id": pk},
+                )
+                for pk, product_id, quantity, created_at in rows
+            ]
+        )
+
+
+def backfill_stock_ledger(apps, schema_editor):
+    """
+    Preenche o livro-razão com as entradas e saídas existentes.
+
+    Apenas as movimentações com quantidade positiva são copiadas, pois são as únicas que
+    alteram o estoque nos sinais de entrada e de saída.
+
+    Argumentos:
+        apps: Registro histórico de aplicações usado pela migração.
+        schema_editor: Editor de esquema do banco de dados.
+    """
+    StockMovement = apps.get_model("products", "StockMovement")
+    Inflow = apps.get_model("inflows", "Inflow")
+    Outflow = apps.get_model("outflows", "Outflow")
+
+    backfill_movements(StockMovement, Inflow.objects.filter(quantity__gt=0), "inflow", 1)
+    backfill_movements(
+        StockMovement, Outflow.objects.filter(quantity__gt=0), "outflow", -1
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração de dados para o livro-razão de estoque.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - RunPython: Executa o preenchimento em lotes (sem operação reversa necessária).
+    """
+
+    dependencies = [
+        ("products", "0002_stock_ledger"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_stock_ledger, migrations.RunPython.noop),
+    ]
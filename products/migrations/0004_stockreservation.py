@@ -0,0 +1,101 @@
+"""
+Módulo de migração para o modelo StockReservation.
+
+Este módulo cria a tabela de reservas de estoque, com o índice parcial das reservas ativas
+por produto e data de expiração usado no cálculo do estoque disponível.
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - CreateModel: Operação que cria o modelo StockReservation no banco de dados.
+
+Dependências:
+    - uuid: Para o valor padrão do identificador público das reservas.
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para a definição dos campos do modelo.
+"""
+
+import uuid
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para o modelo StockReservation.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - CreateModel: Cria o modelo StockReservation com os campos:
+            - id: Chave primária automática.
+            - token: Identificador público da reserva.
+            - quantity: Quantidade reservada.
+            - status: Situação da reserva.
+            - expires_at: Data e hora de expiração.
+            - created_at: Data e hora de criação.
+            - updated_at: Data e hora da última atualização.
+            - product: Relacionamento com Product.
+          e o índice parcial das reservas ativas.
+    """
+
+    dependencies = [
+        ("products", "0003_backfill_stock_ledger"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StockReservation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "token",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                ("quantity", models.PositiveIntegerField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("active", "Ativa"),
+                            ("consumed", "Consumida"),
+                            ("released", "Liberada"),
+                            ("expired", "Expirada"),
+                        ],
+                        default="active",
+                        max_length=10,
+                    ),
+                ),
+                ("expires_at", models.DateTimeField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reservations",
+                        to="products.product",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "active")),
+                        fields=["product", "expires_at"],
+                        name="active_reservation_product",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+"""
+Módulo de migração para os contadores de estoque divididos em faixas.
+
+Este módulo adiciona ao modelo Product a quantidade de faixas do contador de estoque e cria a
+tabela de faixas (StockCounterStripe), usada pelos produtos muito movimentados.
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - AddField: Operação que adiciona o campo stock_stripes ao modelo Product.
+    - CreateModel: Operação que cria o modelo StockCounterStripe no banco de dados.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - django.db.models: Para a definição dos campos do modelo.
+"""
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para os contadores de estoque divididos em faixas.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - AddField: Adiciona o campo stock_stripes (padrão 0, divisão desativada) ao modelo Product.
+        - CreateModel: Cria o modelo StockCounterStripe com os campos:
+            - id: Chave primária automática.
+            - stripe: Número da faixa.
+            - quantity: Variação de estoque acumulada na faixa.
+            - product: Relacionamento com Product.
+          e a restrição de unicidade da combinação de produto e faixa.
+    """
+
+    dependencies = [
+        ("products", "0004_stockreservation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="stock_stripes",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name="StockCounterStripe",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("stripe", models.PositiveSmallIntegerField()),
+                ("quantity", models.IntegerField(default=0)),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="counter_stripes",
+                        to="products.product",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("product", "stripe"),
+                        name="unique_stock_counter_stripe",
+                    )
+                ],
+            },
+        ),
+    ]
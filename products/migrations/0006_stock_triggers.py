@@ -0,0 +1,69 @@
+"""
+Módulo de migração para os gatilhos de estoque do PostgreSQL.
+
+Este módulo instala os gatilhos que mantêm o estoque dos produtos e o livro-razão a partir
+das tabelas de entradas e saídas, e a restrição `CHECK (quantity >= 0)`, quando o banco de
+dados é o PostgreSQL e a configuração STOCK_TRIGGERS está ativa. Nos demais casos a migração
+não faz nada, e o estoque continua sendo mantido pelos sinais.
+
+Componentes principais:
+    - install: Função que instala os gatilhos, se o modo estiver configurado.
+    - uninstall: Função que remove os gatilhos na reversão da migração.
+    - Migration: Classe que define a migração.
+
+Dependências:
+    - django.conf.settings: Para a configuração STOCK_TRIGGERS.
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - products.triggers: Para as instruções de instalação e remoção dos gatilhos.
+"""
+
+from django.conf import settings
+from django.db import migrations
+from products.triggers import install_stock_triggers, uninstall_stock_triggers
+
+
+def install(apps, schema_editor):
+    """
+    Instala os gatilhos de estoque no PostgreSQL, se STOCK_TRIGGERS estiver ativa.
+
+    Argumentos:
+        apps: Registro histórico de aplicações usado pela migração.
+        schema_editor: Editor de esquema do banco de dados.
+    """
+    if schema_editor.connection.vendor == "postgresql" and settings.STOCK_TRIGGERS:
+        install_stock_triggers(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    """
+    Remove os gatilhos de estoque do PostgreSQL, se existirem.
+
+    Argumentos:
+        apps: Registro histórico de aplicações usado pela migração.
+        schema_editor: Editor de esquema do banco de dados.
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        uninstall_stock_triggers(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para os gatilhos de estoque do PostgreSQL.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - RunPython: Instala os gatilhos (e os remove na reversão).
+    """
+
+    dependencies = [
+        ("products", "0005_stock_counter_stripes"),
+        ("inflows", "0001_initial"),
+        ("outflows", "0007_sale"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
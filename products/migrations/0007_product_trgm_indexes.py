@@ -0,0 +1,59 @@
+"""
+Módulo de migração para os índices de trigramas dos produtos.
+
+Este módulo cria, no PostgreSQL, índices GIN sobre `UPPER(title)` e `UPPER(serie_number)`, a
+mesma expressão gerada pelos filtros `__icontains` da listagem de produtos e das listagens de
+entradas e saídas (pelo título do produto), para que as buscas por trecho deixem de varrer a
+tabela inteira. Nos demais bancos de dados são criados índices comuns sobre as mesmas
+expressões (ver app.trigram).
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - AddTrigramIndex: Operação que cria cada um dos índices de trigramas.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - app.trigram: Para o índice e a operação que o cria.
+"""
+
+from django.db import migrations
+from app.trigram import AddTrigramIndex, TrigramIndex
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para os índices de trigramas dos produtos.
+
+    A migração não é atômica, pois os índices são criados com `CREATE INDEX CONCURRENTLY`,
+    sem bloquear as gravações na tabela.
+
+    Atributos:
+        atomic (bool): Indica que a migração não é executada em uma transação.
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - AddTrigramIndex: Cria o índice products_product_title_trgm da coluna title.
+        - AddTrigramIndex: Cria o índice products_product_serie_trgm da coluna serie_number.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("products", "0006_stock_triggers"),
+        # A extensão `pg_trgm` é criada pela migração dos índices das marcas
+        ("brands", "0002_brand_name_trgm"),
+    ]
+
+    operations = [
+        AddTrigramIndex(
+            model_name="product",
+            index=TrigramIndex(field="title", name="products_product_title_trgm"),
+        ),
+        AddTrigramIndex(
+            model_name="product",
+            index=TrigramIndex(
+                field="serie_number", name="products_product_serie_trgm"
+            ),
+        ),
+    ]
@@ -0,0 +1,81 @@
+"""
+Módulo de migração para o vetor da busca textual dos produtos.
+
+Este módulo adiciona ao modelo Product o campo search_vector e, no PostgreSQL, calcula o vetor
+de todos os produtos existentes e cria o índice GIN usado pela busca por relevância (ver
+products.search). Nos demais bancos de dados o campo é criado vazio e não é mantido.
+
+Componentes principais:
+    - populate: Função que calcula os vetores e cria o índice no PostgreSQL.
+    - drop_index: Função que remove o índice na reversão da migração.
+    - Migration: Classe que define a migração.
+
+Dependências:
+    - django.contrib.postgres.search: Para o campo do vetor de busca.
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - products.search: Para o cálculo dos vetores e a criação do índice.
+"""
+
+import django.contrib.postgres.search
+from django.db import migrations
+from products.search import create_search_index, drop_search_index, rebuild_search_vectors
+
+
+def populate(apps, schema_editor):
+    """
+    Calcula o vetor de busca dos produtos existentes e cria o índice GIN no PostgreSQL.
+
+    Argumentos:
+        apps: Registro histórico de aplicações usado pela migração.
+        schema_editor: Editor de esquema do banco de dados.
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        rebuild_search_vectors(apps.get_model("products", "Product"))
+        create_search_index(schema_editor.connection)
+
+
+def drop_index(apps, schema_editor):
+    """
+    Remove o índice GIN do vetor de busca no PostgreSQL.
+
+    Argumentos:
+        apps: Registro histórico de aplicações usado pela migração.
+        schema_editor: Editor de esquema do banco de dados.
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para o vetor da busca textual dos produtos.
+
+    A migração não é atômica: os vetores são calculados em lotes e o índice é criado com
+    `CREATE INDEX CONCURRENTLY`, sem bloquear as gravações na tabela.
+
+    Atributos:
+        atomic (bool): Indica que a migração não é executada em uma transação.
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - AddField: Adiciona o campo search_vector (opcional, não editável) ao modelo Product.
+        - RunPython: Calcula os vetores e cria o índice (e o remove na reversão).
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("products", "0007_product_trgm_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(populate, drop_index),
+    ]
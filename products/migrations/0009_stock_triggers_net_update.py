@@ -0,0 +1,52 @@
+"""
+Módulo de migração que atualiza a função dos gatilhos de estoque do PostgreSQL.
+
+Este módulo reinstala a função `sge_stock_movement` nos bancos de dados em que os gatilhos de
+estoque já estão instalados, para que a alteração da quantidade de uma entrada ou saída sem
+troca de produto aplique ao estoque apenas a diferença. Nos demais casos a migração não faz
+nada.
+
+Componentes principais:
+    - reinstall: Função que reinstala os gatilhos, se estiverem instalados.
+    - Migration: Classe que define a migração.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - products.triggers: Para a consulta e a instalação dos gatilhos.
+"""
+
+from django.db import migrations
+from products.triggers import install_stock_triggers, stock_triggers_installed
+
+
+def reinstall(apps, schema_editor):
+    """
+    Reinstala os gatilhos de estoque no PostgreSQL, se já estiverem instalados.
+
+    Argumentos:
+        apps: Registro histórico de aplicações usado pela migração.
+        schema_editor: Editor de esquema do banco de dados.
+    """
+    if stock_triggers_installed(schema_editor.connection):
+        install_stock_triggers(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração que atualiza a função dos gatilhos de estoque.
+
+    Atributos:
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - RunPython: Reinstala os gatilhos (a reversão não faz nada).
+    """
+
+    dependencies = [
+        ("products", "0008_product_search_vector"),
+    ]
+
+    operations = [
+        migrations.RunPython(reinstall, migrations.RunPython.noop),
+    ]
@@ -6,14 +6,26 @@ utilizado em diversas partes da aplicação, como views, formulários e APIs.
 
 Componentes principais:
     - Product: Modelo que representa um produto com campos para título, categoria, marca, preços, etc.
+    - StockMovement: Modelo que registra cada movimentação de estoque (livro-razão).
+    - StockSnapshot: Modelo que registra o estoque de um produto em um instante.
+    - StockReservation: Modelo que reserva, por tempo limitado, parte do estoque de um produto.
+    - StockCounterStripe: Modelo que representa uma faixa do contador de estoque de um produto.
 
 Dependências:
+    - uuid: Para o identificador público das reservas de estoque.
+    - django.contrib.postgres.search: Para o campo do vetor de busca textual.
     - django.db.models: Para a criação de modelos de banco de dados.
     - categories.models: Para o modelo Category (relação de chave estrangeira).
     - brands.models: Para o modelo Brand (relação de chave estrangeira).
+    - django.utils.timezone: Para a data padrão das movimentações de estoque.
+    - app.trigram: Para os índices de trigramas do título e do número de série.
 """
 
+import uuid
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.utils import timezone
+from app.trigram import TrigramIndex
 from categories.models import Category
 from brands.models import Brand
 
@@ -33,12 +45,17 @@ class Product(models.Model):
         serie_number: Número de série do produto (máximo de 200 caracteres, opcional).
         cost_price: Preço de custo do produto (decimal com até 20 dígitos e 2 casas).
         selling_price: Preço de venda do produto (decimal com até 20 dígitos e 2 casas).
-        quantity: Quantidade em estoque (inteiro, padrão é 0).
+        quantity: Quantidade em estoque (inteiro, padrão é 0). Com contadores divididos ativos,
+                  é a base do estoque, que deve ser somada às faixas (StockCounterStripe).
+        stock_stripes: Quantidade de faixas do contador de estoque (0 desativa a divisão).
+        search_vector: Vetor da busca textual (ver products.search), mantido apenas no
+                       PostgreSQL.
         created_at: Data e hora de criação do registro (adicionada automaticamente).
         updated_at: Data e hora da última atualização do registro (atualizada automaticamente).
 
     Atributos:
-        Meta: Classe interna que define a ordenação padrão dos registros por título.
+        Meta: Classe interna que define a ordenação padrão dos registros por título e os
+            índices de trigramas do título e do número de série, usados pela busca por trecho.
 
     Métodos:
         __str__: Retorna o título do produto como representação em string.
@@ -55,11 +72,207 @@ class Product(models.Model):
     cost_price = models.DecimalField(max_digits=20, decimal_places=2)
     selling_price = models.DecimalField(max_digits=20, decimal_places=2)
     quantity = models.IntegerField(default=0)
+    stock_stripes = models.PositiveSmallIntegerField(default=0, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["title"]
+        indexes = [
+            TrigramIndex(field="title", name="products_product_title_trgm"),
+            TrigramIndex(field="serie_number", name="products_product_serie_trgm"),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class StockMovement(models.Model):
+    """
+    Modelo que registra cada movimentação de estoque de um produto.
+
+    Funciona como um livro-razão somente de inclusão: cada entrada (Inflow) ou saída (Outflow)
+    que altera o estoque gera um registro com a variação da quantidade. Junto com os
+    instantâneos (StockSnapshot), permite calcular o estoque de um produto em qualquer instante
+    sem percorrer todo o histórico de entradas e saídas.
+
+    Campos:
+        product: Chave estrangeira para o modelo Product.
+        quantity: Variação do estoque (positiva para entradas, negativa para saídas).
+        inflow: Entrada que originou a movimentação (opcional).
+        outflow: Saída que originou a movimentação (opcional).
+        created_at: Data e hora da movimentação (a mesma da entrada ou saída).
+
+    Atributos:
+        Meta: Classe interna que define a ordenação padrão por data (decrescente) e o índice
+              por produto e data usado nas consultas de estoque em um instante.
+    """
+
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="stock_movements"
+    )
+    quantity = models.IntegerField()
+    inflow = models.ForeignKey(
+        "inflows.Inflow",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="stock_movements",
+    )
+    outflow = models.ForeignKey(
+        "outflows.Outflow",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="stock_movements",
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["product", "created_at"], name="stock_movement_product_date"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product} ({self.quantity:+d})"
+
+
+class StockSnapshot(models.Model):
+    """
+    Modelo que registra o estoque de um produto em um instante.
+
+    Os instantâneos são gravados periodicamente pelo comando `snapshot_stock`, apenas para os
+    produtos que tiveram movimentações desde o instantâneo anterior. O estoque em um instante T
+    é o último instantâneo até T somado às movimentações posteriores a ele e até T.
+
+    Campos:
+        product: Chave estrangeira para o modelo Product.
+        taken_at: Instante ao qual o instantâneo se refere.
+        quantity: Quantidade em estoque no instante.
+        cost_price: Preço de custo do produto quando o instantâneo foi gravado.
+
+    Atributos:
+        Meta: Classe interna que define a ordenação padrão por instante (decrescente) e a
+              unicidade da combinação de produto e instante.
+    """
+
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="stock_snapshots"
+    )
+    taken_at = models.DateTimeField()
+    quantity = models.IntegerField()
+    cost_price = models.DecimalField(max_digits=20, decimal_places=2)
+
+    class Meta:
+        ordering = ["-taken_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "taken_at"], name="unique_stock_snapshot"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product} - {self.taken_at}"
+
+
+class StockReservation(models.Model):
+    """
+    Modelo que reserva, por tempo limitado, parte do estoque de um produto.
+
+    Uma reserva segura a quantidade de um produto entre a exibição de um formulário de venda e
+    a sua confirmação, sem manter bloqueada a linha do produto. Enquanto estiver ativa e não
+    expirada, a quantidade reservada é descontada do estoque disponível para as demais vendas.
+    As reservas expiradas são marcadas pelo comando `expire_reservations`.
+
+    Campos:
+        token: Identificador público da reserva.
+        product: Chave estrangeira para o modelo Product.
+        quantity: Quantidade reservada.
+        status: Situação da reserva (ativa, consumida, liberada ou expirada).
+        expires_at: Data e hora de expiração da reserva.
+        created_at: Data e hora de criação do registro (adicionada automaticamente).
+        updated_at: Data e hora da última atualização do registro (atualizada automaticamente).
+
+    Atributos:
+        ACTIVE, CONSUMED, RELEASED, EXPIRED: Situações possíveis da reserva.
+        Meta: Classe interna que define a ordenação padrão por data de criação (decrescente)
+              e o índice parcial das reservas ativas por produto e expiração, usado no cálculo
+              do estoque disponível.
+
+    Métodos:
+        __str__: Retorna o produto e a quantidade reservada como representação em string.
+    """
+
+    ACTIVE = "active"
+    CONSUMED = "consumed"
+    RELEASED = "released"
+    EXPIRED = "expired"
+    STATUS_CHOICES = [
+        (ACTIVE, "Ativa"),
+        (CONSUMED, "Consumida"),
+        (RELEASED, "Liberada"),
+        (EXPIRED, "Expirada"),
+    ]
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="reservations"
+    )
+    quantity = models.PositiveIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=ACTIVE)
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["product", "expires_at"],
+                condition=models.Q(status="active"),
+                name="active_reservation_product",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product} ({self.quantity})"
+
+
+class StockCounterStripe(models.Model):
+    """
+    Modelo que representa uma faixa do contador de estoque de um produto.
+
+    Para produtos muito movimentados, o estoque pode ser dividido em N faixas: cada saída ou
+    entrada individual atualiza uma faixa sorteada, em vez da linha do produto, de modo que
+    gravações simultâneas não disputam a mesma linha. O estoque do produto é a soma de
+    `Product.quantity` com as faixas, que podem ser recolhidas de volta para o produto pelo
+    comando `collapse_stock_stripes`.
+
+    Campos:
+        product: Chave estrangeira para o modelo Product.
+        stripe: Número da faixa (de 0 a N - 1).
+        quantity: Variação de estoque acumulada na faixa desde o último recolhimento.
+
+    Atributos:
+        Meta: Classe interna que define a unicidade da combinação de produto e faixa.
+    """
+
+    product = models.ForeignKey(
+        Product, on_delete=models.CASCADE, related_name="counter_stripes"
+    )
+    stripe = models.PositiveSmallIntegerField()
+    quantity = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "stripe"], name="unique_stock_counter_stripe"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product} #{self.stripe}"
@@ -0,0 +1,212 @@
+"""
+Módulo de reservas de estoque.
+
+Este módulo define as operações sobre as reservas de estoque (StockReservation). Uma reserva
+segura parte do estoque de um produto por um tempo limitado, de modo que os fluxos de venda
+possam validar o estoque no momento em que o formulário é exibido e confirmar a venda depois,
+sem manter uma transação longa ou um bloqueio sobre a linha do produto. O estoque disponível
+é o estoque do produto (somadas as faixas do contador, quando dividido) menos as reservas
+ativas, calculado por uma consulta que usa o índice parcial das reservas ativas.
+
+Componentes principais:
+    - active_reservations: Retorna as reservas ativas e não expiradas.
+    - get_reserved_quantities: Retorna a quantidade reservada de cada produto.
+    - get_available_quantity: Retorna o estoque disponível de um produto.
+    - annotate_available_quantity: Anota um conjunto de produtos com o estoque disponível.
+    - reserve_stock: Cria uma reserva, se houver estoque disponível.
+    - release_reservation: Libera uma reserva ativa.
+    - consume_reservation: Marca uma reserva ativa como consumida por uma venda.
+    - expire_reservations: Marca como expiradas as reservas vencidas.
+
+Configurações:
+    - STOCK_RESERVATION_TTL: Duração padrão das reservas, em segundos.
+
+Dependências:
+    - datetime.timedelta: Para calcular a expiração das reservas.
+    - django.conf.settings: Para a duração padrão das reservas.
+    - django.core.exceptions.ValidationError: Para recusar reservas sem estoque disponível.
+    - django.db: Para controle de transações e expressões das consultas.
+    - django.utils.timezone: Para o instante atual.
+    - .models: Para os modelos Product e StockReservation.
+    - .stripes: Para somar as faixas dos contadores de estoque divididos.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .models import Product, StockReservation
+from .stripes import annotate_stock_quantity, get_stock_quantity
+
+
+def active_reservations():
+    """
+    Retorna as reservas ativas e não expiradas.
+
+    Retorna:
+        QuerySet: Reservas com situação ativa e expiração posterior ao instante atual.
+    """
+    return StockReservation.objects.filter(
+        status=StockReservation.ACTIVE, expires_at__gt=timezone.now()
+    )
+
+
+def get_reserved_quantities(product_ids, exclude=None):
+    """
+    Retorna a quantidade reservada de cada produto, com uma única consulta agrupada.
+
+    Argumentos:
+        product_ids (iterable): Ids dos produtos.
+        exclude (iterable): Tokens de reservas a desconsiderar (por exemplo, a reserva da
+                            própria venda).
+
+    Retorna:
+        dict: Dicionário que associa o id de cada produto reservado à quantidade reservada.
+    """
+    reservations = active_reservations().filter(product_id__in=product_ids)
+    if exclude:
+        reservations = reservations.exclude(token__in=exclude)
+    rows = (
+        reservations.values("product_id").annotate(total=Sum("quantity")).order_by()
+    )
+    return {row["product_id"]: row["total"] for row in rows}
+
+
+def get_available_quantity(product, exclude=None):
+    """
+    Retorna o estoque disponível de um produto.
+
+    Argumentos:
+        product (Product): Produto.
+        exclude (iterable): Tokens de reservas a desconsiderar.
+
+    Retorna:
+        int: Estoque do produto menos as reservas ativas.
+    """
+    reserved = get_reserved_quantities([product.pk], exclude=exclude)
+    return get_stock_quantity(product) - reserved.get(product.pk, 0)
+
+
+def annotate_available_quantity(queryset):
+    """
+    Anota um conjunto de produtos com o estoque, a quantidade reservada e o estoque disponível.
+
+    Argumentos:
+        queryset (QuerySet): Conjunto de produtos.
+
+    Retorna:
+        QuerySet: Produtos anotados com stock_quantity, reserved_quantity e
+                  available_quantity.
+    """
+    reserved = (
+        active_reservations()
+        .filter(product=OuterRef("pk"))
+        .order_by()
+        .values("product")
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+    return annotate_stock_quantity(queryset).annotate(
+        reserved_quantity=Coalesce(Subquery(reserved), 0),
+        available_quantity=F("stock_quantity") - F("reserved_quantity"),
+    )
+
+
+def reserve_stock(product_id, quantity, ttl=None):
+    """
+    Cria uma reserva, se houver estoque disponível.
+
+    A linha do produto é bloqueada apenas durante esta transação curta, para que duas
+    reservas simultâneas não ultrapassem o estoque disponível.
+
+    Argumentos:
+        product_id (int): Id do produto.
+        quantity (int): Quantidade a reservar.
+        ttl (int): Duração da reserva, em segundos (padrão: STOCK_RESERVATION_TTL).
+
+    Retorna:
+        StockReservation: Reserva criada.
+
+    Levanta:
+        ValidationError: Se a quantidade for maior que o estoque disponível.
+    """
+    if ttl is None:
+        ttl = settings.STOCK_RESERVATION_TTL
+    with transaction.atomic():
+        product = Product.objects.select_for_update().get(pk=product_id)
+        available = get_available_quantity(product)
+        if quantity > available:
+            raise ValidationError(
+                f"A quantidade disponível em estoque para o produto {product.title} é de {available} unidades."
+            )
+        return StockReservation.objects.create(
+            product=product,
+            quantity=quantity,
+            expires_at=timezone.now() + timedelta(seconds=ttl),
+        )
+
+
+def release_reservation(token):
+    """
+    Libera uma reserva ativa, devolvendo a quantidade ao estoque disponível.
+
+    Argumentos:
+        token (UUID): Identificador público da reserva.
+
+    Retorna:
+        bool: Indica se a reserva estava ativa e foi liberada.
+    """
+    return bool(
+        StockReservation.objects.filter(
+            token=token, status=StockReservation.ACTIVE
+        ).update(status=StockReservation.RELEASED, updated_at=timezone.now())
+    )
+
+
+def consume_reservation(token):
+    """
+    Marca uma reserva ativa e não expirada como consumida por uma venda.
+
+    Deve ser chamada na mesma transação que grava a saída correspondente.
+
+    Argumentos:
+        token (UUID): Identificador público da reserva.
+
+    Retorna:
+        bool: Indica se a reserva estava ativa e foi consumida.
+    """
+    return bool(
+        active_reservations()
+        .filter(token=token)
+        .update(status=StockReservation.CONSUMED, updated_at=timezone.now())
+    )
+
+
+def expire_reservations(batch_size=10000):
+    """
+    Marca como expiradas as reservas ativas vencidas, em lotes.
+
+    Mantém pequeno o índice parcial das reservas ativas. Cada lote é um único UPDATE.
+
+    Argumentos:
+        batch_size (int): Quantidade máxima de reservas por lote.
+
+    Retorna:
+        int: Quantidade de reservas expiradas.
+    """
+    total = 0
+    while True:
+        now = timezone.now()
+        ids = list(
+            StockReservation.objects.filter(
+                status=StockReservation.ACTIVE, expires_at__lte=now
+            ).values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return total
+        total += StockReservation.objects.filter(
+            id__in=ids, status=StockReservation.ACTIVE
+        ).update(status=StockReservation.EXPIRED, updated_at=now)
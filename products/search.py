@@ -0,0 +1,172 @@
+"""
+Módulo da busca textual de produtos.
+
+Este módulo define a busca por relevância dos produtos, baseada na busca textual do
+PostgreSQL. Cada produto guarda em `search_vector` um `tsvector` com o título e o número de
+série (peso A), os nomes da categoria e da marca (peso B) e a descrição (peso C). A coluna
+tem um índice GIN, de modo que a busca encontra os produtos pelo índice e calcula a relevância
+apenas dos encontrados, em vez de percorrer a descrição de todos os produtos do catálogo.
+
+O vetor é recalculado pelos sinais a cada gravação de um produto e, para os produtos
+afetados, a cada gravação de uma categoria ou marca. Gravações que não disparam sinais
+(`bulk_create`, `QuerySet.update` e importações) devem ser seguidas do comando
+`rebuild_search_vectors`. Fora do PostgreSQL o vetor não é mantido e a busca recorre a
+filtros `__icontains` nos mesmos campos, ordenados por título.
+
+Componentes principais:
+    - SEARCH_FIELDS: Campos do produto que compõem o vetor de busca.
+    - SEARCH_INDEX_NAME: Nome do índice GIN do vetor de busca.
+    - SEARCH_LOOKUPS: Campos filtrados pela busca fora do PostgreSQL.
+    - product_search_vector: Monta a expressão do vetor de busca de um produto.
+    - update_search_vectors: Recalcula o vetor de busca dos produtos de um queryset.
+    - rebuild_search_vectors: Recalcula o vetor de busca de todos os produtos, em lotes.
+    - create_search_index: Cria o índice GIN do vetor de busca no PostgreSQL.
+    - drop_search_index: Remove o índice GIN do vetor de busca.
+    - search_products: Filtra e ordena um queryset de produtos por relevância.
+
+Configurações:
+    - PRODUCT_SEARCH_CONFIG: Configuração de idioma da busca textual (padrão: "portuguese").
+
+Dependências:
+    - django.conf.settings: Para a configuração de idioma da busca.
+    - django.contrib.postgres.search: Para o vetor, a consulta e a relevância da busca.
+    - django.db: Para as conexões e expressões do banco de dados.
+"""
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, OuterRef, Q, Subquery
+
+SEARCH_FIELDS = {"title", "serie_number", "description", "category", "brand"}
+
+SEARCH_INDEX_NAME = "products_product_search_vector"
+
+# Filtros usados fora do PostgreSQL, sobre os mesmos campos do vetor de busca
+SEARCH_LOOKUPS = ("title", "serie_number", "description", "category__name", "brand__name")
+
+
+def product_search_vector(model):
+    """
+    Monta a expressão do vetor de busca de um produto.
+
+    Os nomes da categoria e da marca são obtidos por subconsultas, pois `QuerySet.update`
+    não aceita campos de modelos relacionados.
+
+    Argumentos:
+        model: Modelo Product (o atual ou o histórico de uma migração).
+
+    Retorna:
+        CombinedSearchVector: Expressão do vetor de busca, com os pesos de cada campo.
+    """
+    config = settings.PRODUCT_SEARCH_CONFIG
+    category = model._meta.get_field("category").related_model
+    brand = model._meta.get_field("brand").related_model
+    category_name = category._default_manager.filter(pk=OuterRef("category_id"))
+    brand_name = brand._default_manager.filter(pk=OuterRef("brand_id"))
+    vector = SearchVector("title", "serie_number", weight="A", config=config)
+    vector += SearchVector(
+        Subquery(category_name.values("name")[:1]),
+        Subquery(brand_name.values("name")[:1]),
+        weight="B",
+        config=config,
+    )
+    vector += SearchVector("description", weight="C", config=config)
+    return vector
+
+
+def update_search_vectors(queryset):
+    """
+    Recalcula o vetor de busca dos produtos de um queryset em uma única instrução.
+
+    Argumentos:
+        queryset (QuerySet): Queryset de Product.
+
+    Retorna:
+        int: Quantidade de produtos atualizados (sempre 0 fora do PostgreSQL).
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return 0
+    return queryset.update(search_vector=product_search_vector(queryset.model))
+
+
+def rebuild_search_vectors(model, batch_size=10000):
+    """
+    Recalcula o vetor de busca de todos os produtos, em lotes de IDs.
+
+    Cada lote é gravado em uma instrução própria, para que a reconstrução de um catálogo
+    grande não mantenha todas as linhas bloqueadas em uma única transação.
+
+    Argumentos:
+        model: Modelo Product (o atual ou o histórico de uma migração).
+        batch_size (int): Quantidade de IDs de produtos por lote (padrão: 10000).
+
+    Retorna:
+        int: Quantidade de produtos atualizados.
+    """
+    queryset = model._default_manager.order_by("pk").values_list("pk", flat=True)
+    total = 0
+    last_id = 0
+    while True:
+        ids = list(queryset.filter(pk__gt=last_id)[:batch_size])
+        if not ids:
+            return total
+        total += update_search_vectors(
+            model._default_manager.filter(pk__gte=ids[0], pk__lte=ids[-1])
+        )
+        last_id = ids[-1]
+
+
+def create_search_index(connection):
+    """
+    Cria o índice GIN do vetor de busca, sem bloquear as gravações na tabela.
+
+    Argumentos:
+        connection: Conexão com o banco de dados PostgreSQL (fora de uma transação).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {SEARCH_INDEX_NAME} "
+            "ON products_product USING gin (search_vector);"
+        )
+
+
+def drop_search_index(connection):
+    """
+    Remove o índice GIN do vetor de busca.
+
+    Argumentos:
+        connection: Conexão com o banco de dados PostgreSQL (fora de uma transação).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {SEARCH_INDEX_NAME};")
+
+
+def search_products(queryset, text):
+    """
+    Filtra um queryset de produtos pelos termos buscados e o ordena por relevância.
+
+    A consulta aceita a sintaxe de buscadores (`websearch_to_tsquery`): termos entre aspas,
+    `or` e exclusões com `-`. Os produtos recebem a anotação `rank` com a relevância.
+
+    Argumentos:
+        queryset (QuerySet): Queryset de Product.
+        text (str): Termos buscados.
+
+    Retorna:
+        QuerySet: Produtos encontrados, do mais ao menos relevante.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        condition = Q()
+        for lookup in SEARCH_LOOKUPS:
+            condition |= Q(**{f"{lookup}__icontains": text})
+        return queryset.filter(condition).order_by("title", "pk")
+
+    query = SearchQuery(
+        text, config=settings.PRODUCT_SEARCH_CONFIG, search_type="websearch"
+    )
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(rank=SearchRank(F("search_vector"), query))
+        .order_by("-rank", "pk")
+    )
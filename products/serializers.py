@@ -5,15 +5,25 @@ Este módulo define o serializer utilizado para converter instâncias do modelo
 em representações JSON e vice-versa, possibilitando a integração com APIs REST.
 
 Componentes principais:
-    - ProductSerializer: Serializer que mapeia todos os campos do modelo Product.
+    - ProductSerializer: Serializer que mapeia todos os campos do modelo Product, com o
+      estoque somado às faixas dos contadores divididos.
+    - StockReservationSerializer: Serializer que cria reservas de estoque.
 
 Dependências:
+    - django.conf.settings: Para a duração máxima das reservas de estoque.
+    - django.core.exceptions.ValidationError: Para a recusa de reservas sem estoque disponível.
     - rest_framework.serializers: Para a criação de serializers.
-    - products.models: Para o modelo Product.
+    - products.models: Para os modelos Product e StockReservation.
+    - products.reservations: Para a criação das reservas de estoque.
+    - products.stripes: Para somar ao estoque as faixas dos contadores divididos.
 """
 
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from rest_framework import serializers
-from products.models import Product
+from products.models import Product, StockReservation
+from products.reservations import reserve_stock
+from products.stripes import get_stock_quantity
 
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -21,10 +31,17 @@ class ProductSerializer(serializers.ModelSerializer):
     Serializer para o modelo Product.
 
     Converte instâncias do modelo Product em dados serializados (JSON) e vice-versa,
-    incluindo todos os campos definidos no modelo.
+    incluindo todos os campos definidos no modelo, exceto o vetor da busca textual.
+
+    Para produtos com contador dividido, o campo `quantity` representa o estoque total (a
+    base somada às faixas), tanto na leitura quanto na gravação.
 
     Atributos:
-        Meta: Classe interna que especifica o modelo e os campos a serem serializados.
+        Meta: Classe interna que especifica o modelo e o campo excluído da serialização.
+
+    Métodos:
+        update: Converte o estoque total informado para a base do produto.
+        to_representation: Exibe o estoque total do produto.
 
     Exemplo de uso:
         serializer = ProductSerializer(product_instance)
@@ -33,4 +50,62 @@ class ProductSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
-        fields = "__all__"
+        exclude = ["search_vector"]
+
+    def update(self, instance, validated_data):
+        if "quantity" in validated_data and instance.stock_stripes:
+            striped = get_stock_quantity(instance) - instance.quantity
+            validated_data["quantity"] -= striped
+        return super().update(instance, validated_data)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        data["quantity"] = get_stock_quantity(instance)
+        return data
+
+
+class StockReservationSerializer(serializers.ModelSerializer):
+    """
+    Serializer que cria reservas de estoque.
+
+    Atributos:
+        quantity: Quantidade a reservar (maior que zero).
+        ttl: Duração da reserva, em segundos (opcional, apenas escrita, limitada por
+            STOCK_RESERVATION_MAX_TTL).
+        Meta: Classe interna que especifica o modelo, os campos e os campos somente leitura.
+
+    Métodos:
+        create: Cria a reserva, se houver estoque disponível.
+    """
+
+    quantity = serializers.IntegerField(min_value=1)
+    ttl = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.STOCK_RESERVATION_MAX_TTL,
+        write_only=True,
+        required=False,
+    )
+
+    class Meta:
+        model = StockReservation
+        fields = ["token", "product", "quantity", "ttl", "status", "expires_at", "created_at"]
+        read_only_fields = ["status", "expires_at", "created_at"]
+
+    def create(self, validated_data):
+        """
+        Cria a reserva, se houver estoque disponível.
+
+        Argumentos:
+            validated_data (dict): Dados validados da reserva.
+
+        Retorna:
+            StockReservation: Reserva criada.
+        """
+        try:
+            return reserve_stock(
+                validated_data["product"].pk,
+                validated_data["quantity"],
+                ttl=validated_data.get("ttl"),
+            )
+        except ValidationError as error:
+            raise serializers.ValidationError({"quantity": error.messages})
@@ -0,0 +1,75 @@
+"""
+Módulo de sinais para o modelo Product.
+
+Este módulo define um sinal que invalida as métricas em cache sempre que um produto
+é gravado ou excluído, e os sinais que mantêm o vetor da busca textual dos produtos.
+
+Componentes principais:
+    - invalidate_metrics: Função que invalida as métricas em cache.
+    - update_product_search_vector: Função que recalcula o vetor de busca de um produto.
+    - update_related_search_vectors: Função que recalcula o vetor de busca dos produtos de
+      uma categoria ou marca.
+
+Dependências:
+    - django.db.models.signals: Para os sinais post_save e post_delete.
+    - django.dispatch: Para o decorador receiver.
+    - app.metrics_cache: Para a invalidação das métricas em cache.
+    - categories.models, brands.models: Para os modelos Category e Brand.
+    - .models: Para o modelo Product.
+    - .search: Para o recálculo do vetor de busca.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from app.metrics_cache import invalidate_metrics_cache
+from categories.models import Category
+from brands.models import Brand
+from .models import Product
+from .search import SEARCH_FIELDS, update_search_vectors
+
+
+@receiver([post_save, post_delete], sender=Product)
+def invalidate_metrics(sender, instance, **kwargs):
+    """
+    Invalida as métricas em cache após a gravação ou exclusão de um produto.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Product).
+        instance: Instância do modelo Product que foi salva ou excluída.
+        **kwargs: Argumentos adicionais passados pelo sinal.
+    """
+    invalidate_metrics_cache()
+
+
+@receiver(post_save, sender=Product)
+def update_product_search_vector(sender, instance, update_fields=None, **kwargs):
+    """
+    Recalcula o vetor de busca de um produto após a sua gravação.
+
+    Gravações limitadas a campos que não compõem o vetor (`update_fields`) são ignoradas.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Product).
+        instance: Instância do modelo Product que foi salva.
+        update_fields: Campos gravados, quando a gravação foi limitada a alguns campos.
+        **kwargs: Argumentos adicionais passados pelo sinal.
+    """
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+    update_search_vectors(Product.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Brand)
+def update_related_search_vectors(sender, instance, created, **kwargs):
+    """
+    Recalcula o vetor de busca dos produtos de uma categoria ou marca alterada.
+
+    Argumentos:
+        sender: Classe do modelo que enviou o sinal (Category ou Brand).
+        instance: Instância da categoria ou marca que foi salva.
+        created: Indica se o registro foi criado (e ainda não tem produtos).
+        **kwargs: Argumentos adicionais passados pelo sinal.
+    """
+    if not created:
+        update_search_vectors(instance.products.all())
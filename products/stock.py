@@ -0,0 +1,441 @@
+"""
+Módulo de movimentação do estoque de produtos.
+
+Este módulo concentra as alterações da quantidade em estoque dos produtos. As alterações são
+aplicadas como um único `UPDATE ... SET quantity = quantity ± n` no banco de dados, em vez de
+ler o produto, alterar a quantidade em memória e gravar todas as colunas com `save()`. Dessa
+forma, gravações concorrentes sobre o mesmo produto não perdem atualizações, e apenas as
+colunas `quantity` e `updated_at` são reescritas. Como essas escritas não disparam os sinais
+dos modelos, cada uma delas invalida por conta própria as métricas em cache.
+
+Quando várias movimentações são gravadas em uma mesma operação (entradas em lote, vendas com
+várias linhas, importações), o bloco `stock_batch` acumula as variações por produto e as grava
+de uma só vez ao final do bloco, com uma única escrita por produto.
+
+Para produtos com o contador dividido em faixas (ver products.stripes), todas as variações,
+inclusive as de um lote e os estornos, são gravadas em uma faixa, e nunca na base do produto,
+que só é alterada pelo recolhimento das faixas. Assim, a base não fica negativa enquanto as
+faixas acumulam as entradas.
+
+O módulo também mantém o livro-razão de estoque (StockMovement) e responde ao estoque de um
+produto, ou à valorização do armazém, em um instante passado, a partir do último instantâneo
+(StockSnapshot) e das poucas movimentações posteriores a ele.
+
+Componentes principais:
+    - StockBatch: Acumulador das variações de estoque e movimentações de um bloco.
+    - stock_batch: Gerenciador de contexto que agrupa as escritas de estoque de um bloco.
+    - apply_stock_deltas: Aplica variações de estoque a vários produtos em uma única consulta.
+    - adjust_product_quantity: Aplica uma variação de estoque a um único produto.
+    - build_stock_movements: Monta as movimentações do livro-razão de entradas e saídas.
+    - record_stock_movements: Registra as movimentações de entradas e saídas no livro-razão.
+    - record_stock_change: Aplica e registra a variação de uma entrada ou saída alterada ou excluída.
+    - annotate_stock_at: Anota um conjunto de produtos com o estoque em um instante.
+    - get_stock_at: Retorna o estoque de um produto em um instante.
+    - get_stock_valuation_at: Retorna a quantidade e o valor de todo o estoque em um instante.
+
+Dependências:
+    - collections.defaultdict: Para somar as variações por produto.
+    - contextlib.contextmanager: Para o gerenciador de contexto stock_batch.
+    - contextvars.ContextVar: Para o lote ativo da thread ou tarefa corrente.
+    - datetime: Para o instante inicial usado quando não há instantâneo anterior.
+    - random: Para sortear a faixa do contador de produtos com contador dividido.
+    - django.db.transaction: Para gravar o bloco e as variações acumuladas em conjunto.
+    - django.db.models: Para as expressões e funções de agregação das consultas.
+    - django.utils.timezone: Para atualizar a data de atualização dos produtos.
+    - app.metrics_cache: Para a invalidação das métricas em cache.
+    - .models: Para os modelos Product, StockCounterStripe, StockMovement e StockSnapshot.
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone as dt_timezone
+import random
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    DateTimeField,
+    DecimalField,
+    F,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from app.metrics_cache import invalidate_metrics_cache
+from .models import Product, StockCounterStripe, StockMovement, StockSnapshot
+
+LEDGER_START = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+_current_batch = ContextVar("stock_batch", default=None)
+
+
+class StockBatch:
+    """
+    Acumulador das variações de estoque e movimentações de um bloco `stock_batch`.
+
+    Atributos:
+        deltas (defaultdict): Variação acumulada da quantidade de cada produto.
+        inflows (list): Entradas cujas movimentações ainda não foram registradas.
+        outflows (list): Saídas cujas movimentações ainda não foram registradas.
+        movements (list): Movimentações avulsas (alterações e exclusões) ainda não gravadas.
+        stripes (dict): Quantidade de faixas de cada produto com contador dividido.
+
+    Métodos:
+        flush: Grava as variações e movimentações acumuladas.
+    """
+
+    def __init__(self):
+        self.deltas = defaultdict(int)
+        self.inflows = []
+        self.outflows = []
+        self.movements = []
+        self.stripes = {}
+
+    def flush(self):
+        """
+        Grava as variações e movimentações acumuladas.
+
+        As variações são aplicadas com um único UPDATE agrupado por produto (mais um UPDATE
+        de faixa por produto com contador dividido), e as movimentações registradas no
+        livro-razão com um único `bulk_create`.
+
+        Retorna:
+            int: Quantidade de produtos atualizados.
+        """
+        deltas, self.deltas = self.deltas, defaultdict(int)
+        inflows, self.inflows = self.inflows, []
+        outflows, self.outflows = self.outflows, []
+        movements, self.movements = self.movements, []
+        stripes, self.stripes = self.stripes, {}
+        updated = sum(
+            _write_product_delta(product_id, deltas.pop(product_id), stripes[product_id])
+            for product_id in stripes
+            if product_id in deltas
+        )
+        updated += apply_stock_deltas(deltas)
+        StockMovement.objects.bulk_create(
+            build_stock_movements(inflows, outflows) + movements
+        )
+        return updated
+
+
+@contextmanager
+def stock_batch():
+    """
+    Agrupa as escritas de estoque de um bloco em uma escrita por produto.
+
+    Dentro do bloco, `adjust_product_quantity` e `record_stock_movements` (chamadas pelos
+    sinais de entrada e de saída) apenas acumulam as variações e movimentações. Ao final do
+    bloco, ainda dentro da sua transação, tudo é gravado de uma só vez, de modo que uma
+    importação de 10.000 linhas faz uma única escrita de estoque por produto. Se o bloco
+    levantar uma exceção, nada é gravado. Blocos aninhados usam o lote do bloco externo.
+
+    Dentro do bloco, `Product.quantity` ainda não reflete as variações acumuladas; validações
+    de estoque devem ser feitas antes do bloco ou sobre as linhas bloqueadas.
+
+    Uso:
+        with stock_batch():
+            for row in rows:
+                Inflow.objects.create(**row)
+
+    Retorna:
+        StockBatch: Lote ativo no bloco.
+    """
+    batch = _current_batch.get()
+    if batch is not None:
+        yield batch
+        return
+
+    batch = StockBatch()
+    token = _current_batch.set(batch)
+    try:
+        with transaction.atomic():
+            yield batch
+            batch.flush()
+    finally:
+        _current_batch.reset(token)
+
+
+def apply_stock_deltas(deltas):
+    """
+    Aplica variações de estoque a vários produtos em uma única consulta.
+
+    A quantidade de cada produto é incrementada (ou decrementada, para variações negativas)
+    diretamente no banco de dados, com um único UPDATE que abrange todos os produtos informados.
+    Deve ser chamada dentro da transação das movimentações que originaram as variações.
+
+    Argumentos:
+        deltas (dict): Dicionário que associa o id de cada produto à variação da sua quantidade.
+
+    Retorna:
+        int: Quantidade de produtos atualizados.
+
+    Lógica:
+        - Descarta as variações nulas.
+        - Monta uma expressão CASE com a variação de cada produto.
+        - Atualiza apenas as colunas quantity e updated_at dos produtos envolvidos.
+        - Invalida as métricas em cache após o commit da transação.
+    """
+    deltas = {product_id: delta for product_id, delta in deltas.items() if delta}
+    if not deltas:
+        return 0
+
+    delta = Case(
+        *[When(pk=product_id, then=Value(value)) for product_id, value in deltas.items()],
+        output_field=IntegerField(),
+    )
+    updated = Product.objects.filter(pk__in=deltas).update(
+        quantity=F("quantity") + delta,
+        updated_at=timezone.now(),
+    )
+    invalidate_metrics_cache()
+    return updated
+
+
+def adjust_product_quantity(product_id, delta, stripes=0):
+    """
+    Aplica uma variação de estoque a um único produto.
+
+    Dentro de um bloco `stock_batch`, a variação é apenas acumulada no lote ativo. Para
+    produtos com o contador dividido em faixas, a variação é aplicada a uma faixa sorteada,
+    em vez da linha do produto (ver products.stripes), inclusive quando acumulada no lote.
+
+    Argumentos:
+        product_id (int): Id do produto.
+        delta (int): Variação da quantidade (positiva para entradas, negativa para saídas).
+        stripes (int): Quantidade de faixas do contador do produto (0 para nenhuma).
+
+    Retorna:
+        int: Quantidade de linhas atualizadas (0 ou 1; 0 quando a variação é acumulada).
+    """
+    if not delta:
+        return 0
+    batch = _current_batch.get()
+    if batch is not None:
+        batch.deltas[product_id] += delta
+        if stripes:
+            batch.stripes[product_id] = stripes
+        return 0
+    return _write_product_delta(product_id, delta, stripes)
+
+
+def _write_product_delta(product_id, delta, stripes):
+    """
+    Grava a variação de estoque de um produto em uma faixa sorteada ou, sem faixas, na base.
+
+    Se as faixas tiverem sido removidas depois da leitura do produto, a variação é gravada
+    na base.
+    """
+    invalidate_metrics_cache()
+    if stripes:
+        updated = StockCounterStripe.objects.filter(
+            product_id=product_id, stripe=random.randrange(stripes)
+        ).update(quantity=F("quantity") + delta)
+        if updated:
+            return updated
+    return Product.objects.filter(pk=product_id).update(
+        quantity=F("quantity") + delta,
+        updated_at=timezone.now(),
+    )
+
+
+def build_stock_movements(inflows=(), outflows=()):
+    """
+    Monta as movimentações do livro-razão de um conjunto de entradas e saídas.
+
+    Apenas as movimentações com quantidade positiva são consideradas, pois são as únicas que
+    alteram o estoque.
+
+    Argumentos:
+        inflows (iterable): Entradas gravadas (somam ao estoque).
+        outflows (iterable): Saídas gravadas (subtraem do estoque).
+
+    Retorna:
+        list: Movimentações (ainda não gravadas).
+    """
+    movements = [
+        StockMovement(
+            product_id=inflow.product_id,
+            quantity=inflow.quantity,
+            inflow=inflow,
+            created_at=inflow.created_at,
+        )
+        for inflow in inflows
+        if inflow.quantity > 0
+    ]
+    movements += [
+        StockMovement(
+            product_id=outflow.product_id,
+            quantity=-outflow.quantity,
+            outflow=outflow,
+            created_at=outflow.created_at,
+        )
+        for outflow in outflows
+        if outflow.quantity > 0
+    ]
+    return movements
+
+
+def record_stock_movements(inflows=(), outflows=()):
+    """
+    Registra as movimentações de entradas e saídas no livro-razão de estoque.
+
+    Deve ser chamada dentro da transação que gravou as entradas ou saídas, junto com a
+    atualização do estoque. Dentro de um bloco `stock_batch`, as movimentações são apenas
+    acumuladas no lote ativo.
+
+    Argumentos:
+        inflows (iterable): Entradas gravadas (somam ao estoque).
+        outflows (iterable): Saídas gravadas (subtraem do estoque).
+
+    Retorna:
+        list: Movimentações criadas (vazia quando as movimentações são acumuladas).
+    """
+    batch = _current_batch.get()
+    if batch is not None:
+        batch.inflows.extend(inflows)
+        batch.outflows.extend(outflows)
+        return []
+    return StockMovement.objects.bulk_create(build_stock_movements(inflows, outflows))
+
+
+def record_stock_change(product_id, quantity, inflow=None, outflow=None, stripes=0):
+    """
+    Aplica e registra a variação de estoque de uma entrada ou saída alterada ou excluída.
+
+    Usada pelos sinais para estornar a movimentação antiga e aplicar a nova, como fazem os
+    gatilhos de estoque (products.triggers): a variação é aplicada ao estoque do produto,
+    como em `adjust_product_quantity`, e registrada no livro-razão com a data atual. Dentro
+    de um bloco `stock_batch`, a variação e a movimentação são apenas acumuladas no lote ativo.
+
+    Argumentos:
+        product_id (int): Id do produto.
+        quantity (int): Variação da quantidade (com o sinal do efeito sobre o estoque).
+        inflow (Inflow): Entrada alterada (None para exclusões e saídas).
+        outflow (Outflow): Saída alterada (None para exclusões e entradas).
+        stripes (int): Quantidade de faixas do contador do produto (0 para nenhuma).
+
+    Retorna:
+        StockMovement: Movimentação criada (None quando acumulada ou nula).
+    """
+    if not quantity:
+        return None
+    adjust_product_quantity(product_id, quantity, stripes)
+    movement = StockMovement(
+        product_id=product_id,
+        quantity=quantity,
+        inflow=inflow,
+        outflow=outflow,
+        created_at=timezone.now(),
+    )
+    batch = _current_batch.get()
+    if batch is not None:
+        batch.movements.append(movement)
+        return None
+    movement.save()
+    return movement
+
+
+def annotate_stock_at(queryset, at):
+    """
+    Anota um conjunto de produtos com o estoque em um instante.
+
+    Para cada produto, busca o último instantâneo até o instante informado e soma apenas as
+    movimentações posteriores a ele, usando os índices por produto e data das duas tabelas.
+
+    Argumentos:
+        queryset (QuerySet): Conjunto de produtos.
+        at (datetime): Instante da consulta.
+
+    Retorna:
+        QuerySet: Produtos anotados com:
+            - snapshot_at: Instante do último instantâneo (ou None).
+            - snapshot_quantity: Estoque no último instantâneo (0 se não houver).
+            - snapshot_cost_price: Preço de custo no último instantâneo (ou None).
+            - tail_quantity: Soma das movimentações posteriores ao instantâneo.
+            - tail_count: Quantidade de movimentações posteriores ao instantâneo.
+            - stock_at: Estoque no instante informado.
+    """
+    snapshots = StockSnapshot.objects.filter(
+        product=OuterRef("pk"), taken_at__lte=at
+    ).order_by("-taken_at")
+    queryset = queryset.annotate(
+        snapshot_at=Subquery(snapshots.values("taken_at")[:1]),
+        snapshot_quantity=Coalesce(Subquery(snapshots.values("quantity")[:1]), 0),
+        snapshot_cost_price=Subquery(snapshots.values("cost_price")[:1]),
+    )
+
+    movements = (
+        StockMovement.objects.filter(
+            product=OuterRef("pk"),
+            created_at__lte=at,
+            created_at__gt=Coalesce(
+                OuterRef("snapshot_at"),
+                Value(LEDGER_START, output_field=DateTimeField()),
+            ),
+        )
+        .order_by()
+        .values("product")
+    )
+    return queryset.annotate(
+        tail_quantity=Coalesce(
+            Subquery(movements.annotate(total=Sum("quantity")).values("total")), 0
+        ),
+        tail_count=Coalesce(
+            Subquery(movements.annotate(total=Count("id")).values("total")), 0
+        ),
+        stock_at=F("snapshot_quantity") + F("tail_quantity"),
+    )
+
+
+def get_stock_at(product_id, at):
+    """
+    Retorna o estoque de um produto em um instante.
+
+    Argumentos:
+        product_id (int): Id do produto.
+        at (datetime): Instante da consulta.
+
+    Retorna:
+        int: Estoque do produto no instante (0 se o produto não existir).
+    """
+    stock = (
+        annotate_stock_at(Product.objects.filter(pk=product_id), at)
+        .values_list("stock_at", flat=True)
+        .first()
+    )
+    return stock or 0
+
+
+def get_stock_valuation_at(at):
+    """
+    Retorna a quantidade e o valor de todo o estoque em um instante.
+
+    O valor de cada produto usa o preço de custo do seu último instantâneo ou, na falta dele,
+    o preço de custo atual do produto.
+
+    Argumentos:
+        at (datetime): Instante da consulta (por exemplo, o fim de um mês).
+
+    Retorna:
+        dict: Um dicionário contendo:
+            - quantity: Quantidade total em estoque no instante.
+            - value: Valor total do estoque no instante, a preço de custo.
+    """
+    return annotate_stock_at(Product.objects.all(), at).aggregate(
+        quantity=Coalesce(Sum("stock_at"), 0),
+        value=Coalesce(
+            Sum(
+                F("stock_at") * Coalesce("snapshot_cost_price", "cost_price"),
+                output_field=DecimalField(max_digits=20, decimal_places=2),
+            ),
+            Value(0),
+            output_field=DecimalField(max_digits=20, decimal_places=2),
+        ),
+    )
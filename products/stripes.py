@@ -0,0 +1,212 @@
+"""
+Módulo de contadores de estoque divididos em faixas.
+
+Para produtos muito movimentados, todas as saídas e entradas individuais disputam a mesma
+linha da tabela de produtos, e as transações passam a esperar umas pelas outras. Com a divisão
+ativa, o estoque do produto é a soma de `Product.quantity` (a base) com N faixas
+(StockCounterStripe), e cada gravação individual atualiza uma faixa sorteada, de modo que até
+N gravações simultâneas sobre o mesmo produto prosseguem sem esperar. Todas as gravações de
+um produto com faixas, inclusive as dos lotes (products.stock), vão para as faixas; a base só
+é alterada pelo recolhimento, feito periodicamente pelo comando `collapse_stock_stripes`.
+
+As leituras do estoque somam as faixas: as métricas, as listagens, o detalhe e a API de
+produtos usam `annotate_stock_quantity` (ou `get_stock_quantity`, para um único produto), de
+modo que exibem o estoque real mesmo antes do recolhimento.
+
+Componentes principais:
+    - get_striped_quantities: Retorna a soma das faixas de cada produto.
+    - get_stock_quantity: Retorna o estoque de um produto, somando as faixas.
+    - annotate_stock_quantity: Anota um conjunto de produtos com o estoque somado às faixas.
+    - enable_stock_stripes: Ativa a divisão do contador de estoque de um produto.
+    - disable_stock_stripes: Desativa a divisão do contador de estoque de um produto.
+    - collapse_stock_stripes: Recolhe as faixas para a quantidade base dos produtos.
+
+Configurações:
+    - STOCK_STRIPES_CACHE_TIMEOUT: Duração, em segundos, do estoque somado em cache.
+
+Dependências:
+    - collections.defaultdict: Para somar as faixas por produto.
+    - django.conf.settings: Para a duração do cache.
+    - django.core.cache: Para o cache do estoque somado.
+    - django.db: Para controle de transações e expressões das consultas.
+    - .models: Para os modelos Product e StockCounterStripe.
+    - .stock: Para a atualização agrupada da quantidade base.
+"""
+
+from collections import defaultdict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from .models import Product, StockCounterStripe
+from .stock import apply_stock_deltas
+
+STOCK_CACHE_KEY = "stock_quantity:{}"
+
+
+def get_striped_quantities(product_ids):
+    """
+    Retorna a soma das faixas de cada produto, com uma única consulta agrupada.
+
+    Argumentos:
+        product_ids (iterable): Ids dos produtos.
+
+    Retorna:
+        dict: Dicionário que associa o id de cada produto com faixas à soma das faixas.
+    """
+    rows = (
+        StockCounterStripe.objects.filter(product_id__in=product_ids)
+        .values("product_id")
+        .annotate(total=Sum("quantity"))
+        .order_by()
+    )
+    return {row["product_id"]: row["total"] for row in rows}
+
+
+def get_stock_quantity(product, cached=False):
+    """
+    Retorna o estoque de um produto, somando a base e as faixas.
+
+    Para produtos sem divisão, retorna `product.quantity` sem consultar o banco de dados. Para
+    produtos anotados por `annotate_stock_quantity`, usa a soma das faixas anotada.
+
+    Argumentos:
+        product (Product): Produto.
+        cached (bool): Indica se o valor pode ser lido do cache, com atraso de até
+                       STOCK_STRIPES_CACHE_TIMEOUT segundos (apenas para exibição).
+
+    Retorna:
+        int: Quantidade em estoque.
+    """
+    if not product.stock_stripes:
+        return product.quantity
+    striped = getattr(product, "striped_quantity", None)
+    if striped is not None:
+        return product.quantity + striped
+
+    def compute():
+        return product.quantity + get_striped_quantities([product.pk]).get(product.pk, 0)
+
+    if not cached:
+        return compute()
+    return cache.get_or_set(
+        STOCK_CACHE_KEY.format(product.pk),
+        compute,
+        settings.STOCK_STRIPES_CACHE_TIMEOUT,
+    )
+
+
+def annotate_stock_quantity(queryset):
+    """
+    Anota um conjunto de produtos com a soma das faixas e o estoque total.
+
+    A soma das faixas é uma subconsulta avaliada apenas para os produtos com contador dividido,
+    de modo que a anotação não pesa nas agregações sobre todo o catálogo.
+
+    Argumentos:
+        queryset (QuerySet): Conjunto de produtos.
+
+    Retorna:
+        QuerySet: Produtos anotados com striped_quantity e stock_quantity.
+    """
+    striped = (
+        StockCounterStripe.objects.filter(product=OuterRef("pk"))
+        .order_by()
+        .values("product")
+        .annotate(total=Sum("quantity"))
+        .values("total")
+    )
+    return queryset.annotate(
+        striped_quantity=Case(
+            When(stock_stripes__gt=0, then=Coalesce(Subquery(striped), 0)),
+            default=Value(0),
+        ),
+        stock_quantity=F("quantity") + F("striped_quantity"),
+    )
+
+
+def enable_stock_stripes(product_id, stripes):
+    """
+    Ativa (ou redimensiona) a divisão do contador de estoque de um produto.
+
+    As faixas existentes são recolhidas para a base antes de serem recriadas, de modo que o
+    estoque total não se altera.
+
+    Argumentos:
+        product_id (int): Id do produto.
+        stripes (int): Quantidade de faixas (0 desativa a divisão).
+
+    Retorna:
+        Product: Produto atualizado.
+    """
+    with transaction.atomic():
+        product = Product.objects.select_for_update().get(pk=product_id)
+        collapse_stock_stripes([product_id])
+        StockCounterStripe.objects.filter(product_id=product_id).delete()
+        StockCounterStripe.objects.bulk_create(
+            [
+                StockCounterStripe(product_id=product_id, stripe=stripe)
+                for stripe in range(stripes)
+            ]
+        )
+        product.stock_stripes = stripes
+        product.save(update_fields=["stock_stripes"])
+    cache.delete(STOCK_CACHE_KEY.format(product_id))
+    return product
+
+
+def disable_stock_stripes(product_id):
+    """
+    Desativa a divisão do contador de estoque de um produto, recolhendo as faixas.
+
+    Argumentos:
+        product_id (int): Id do produto.
+
+    Retorna:
+        Product: Produto atualizado.
+    """
+    return enable_stock_stripes(product_id, 0)
+
+
+def collapse_stock_stripes(product_ids=None):
+    """
+    Recolhe as faixas para a quantidade base dos produtos.
+
+    Os produtos e, em seguida, as faixas com variação acumulada são bloqueados em ordem de id
+    (a mesma ordem das vendas e de `enable_stock_stripes`, para evitar deadlocks), somados à
+    base com um único UPDATE agrupado e zerados com outro UPDATE. O estoque total não se
+    altera, e gravações simultâneas nas faixas não são perdidas, pois aguardam o bloqueio.
+
+    Argumentos:
+        product_ids (iterable): Ids dos produtos (padrão: todos os produtos com faixas).
+
+    Retorna:
+        int: Quantidade de produtos cuja base foi atualizada.
+    """
+    with transaction.atomic():
+        products = Product.objects.filter(stock_stripes__gt=0)
+        if product_ids is not None:
+            products = products.filter(pk__in=product_ids)
+        product_ids = list(
+            products.select_for_update().order_by("pk").values_list("pk", flat=True)
+        )
+        stripes = list(
+            StockCounterStripe.objects.filter(product_id__in=product_ids)
+            .exclude(quantity=0)
+            .select_for_update()
+            .order_by("product_id", "stripe")
+            .values_list("id", "product_id", "quantity")
+        )
+        if not stripes:
+            return 0
+
+        deltas = defaultdict(int)
+        for _, product_id, quantity in stripes:
+            deltas[product_id] += quantity
+        updated = apply_stock_deltas(deltas)
+        StockCounterStripe.objects.filter(
+            id__in=[stripe_id for stripe_id, _, _ in stripes]
+        ).update(quantity=0)
+    cache.delete_many([STOCK_CACHE_KEY.format(product_id) for product_id in deltas])
+    return updated
@@ -0,0 +1,33 @@
+"""
+Módulo de testes das reservas de estoque.
+
+Verifica que a API limita a duração das reservas pedidas a STOCK_RESERVATION_MAX_TTL.
+"""
+
+from django.conf import settings
+from django.test import TestCase
+from app.tests.factories import create_product
+from products.serializers import StockReservationSerializer
+
+
+class StockReservationSerializerTests(TestCase):
+    """
+    Testes da validação da duração das reservas.
+    """
+
+    def setUp(self):
+        self.product = create_product(quantity=10)
+
+    def build(self, ttl):
+        return StockReservationSerializer(
+            data={"product": self.product.pk, "quantity": 1, "ttl": ttl}
+        )
+
+    def test_ttl_up_to_the_maximum_is_accepted(self):
+        serializer = self.build(settings.STOCK_RESERVATION_MAX_TTL)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_ttl_above_the_maximum_is_rejected(self):
+        serializer = self.build(settings.STOCK_RESERVATION_MAX_TTL + 1)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("ttl", serializer.errors)
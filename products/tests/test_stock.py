@@ -0,0 +1,145 @@
+"""
+Módulo de testes da movimentação do estoque de produtos.
+
+Verifica que `adjust_product_quantity`, por gravar a variação com um único
+`UPDATE ... SET quantity = quantity + n`, não perde atualizações quando várias threads, cada
+uma com a sua própria conexão, movimentam o mesmo produto ao mesmo tempo, que o bloco
+`stock_batch` grava as variações acumuladas uma única vez, dentro da sua transação, e que as
+escritas de estoque que não disparam sinais invalidam as métricas em cache.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+import unittest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test import TestCase, TransactionTestCase
+from app.metrics import get_product_metrics
+from app.metrics_cache import bump_metrics_version
+from app.tests.factories import create_product, create_supplier
+from inflows.models import Inflow
+from products.models import Product
+from products.stock import adjust_product_quantity, stock_batch
+
+THREADS = 8
+OPERATIONS = 50
+
+
+def adjust_many(product_id, delta):
+    """
+    Aplica OPERATIONS variações ao produto e fecha a conexão da thread.
+    """
+    try:
+        for _ in range(OPERATIONS):
+            adjust_product_quantity(product_id, delta)
+    finally:
+        connections.close_all()
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql",
+    "A concorrência entre conexões só é representativa no PostgreSQL.",
+)
+class AdjustProductQuantityConcurrencyTests(TransactionTestCase):
+    """
+    Testes de gravações simultâneas sobre o estoque de um mesmo produto.
+    """
+
+    def setUp(self):
+        self.product = create_product(quantity=1000)
+
+    def run_threads(self, deltas):
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            futures = [
+                executor.submit(adjust_many, self.product.pk, delta) for delta in deltas
+            ]
+            for future in futures:
+                future.result()
+
+    def test_concurrent_decrements_are_not_lost(self):
+        self.run_threads([-1] * THREADS)
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 1000 - THREADS * OPERATIONS)
+
+    def test_concurrent_mixed_deltas_are_not_lost(self):
+        self.run_threads([3, -2] * (THREADS // 2))
+
+        self.product.refresh_from_db()
+        self.assertEqual(
+            self.product.quantity, 1000 + (THREADS // 2) * OPERATIONS * (3 - 2)
+        )
+        self.assertEqual(Product.objects.count(), 1)
+
+
+class StockBatchTests(TestCase):
+    """
+    Testes do agrupamento das escritas de estoque em um bloco `stock_batch`.
+    """
+
+    def setUp(self):
+        self.product = create_product(quantity=10)
+
+    def test_flushes_inside_the_transaction(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with transaction.atomic():
+                with stock_batch():
+                    adjust_product_quantity(self.product.pk, 5)
+                    adjust_product_quantity(self.product.pk, -2)
+                    self.product.refresh_from_db()
+                    self.assertEqual(self.product.quantity, 10)
+
+                # Gravado ao sair do bloco, ainda dentro da transação externa
+                self.product.refresh_from_db()
+                self.assertEqual(self.product.quantity, 13)
+        # Apenas a invalidação das métricas em cache fica para depois do commit
+        self.assertEqual(callbacks, [bump_metrics_version])
+
+    def test_single_write_per_product(self):
+        with self.assertNumQueries(3):
+            with stock_batch():
+                for _ in range(20):
+                    adjust_product_quantity(self.product.pk, 1)
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 30)
+
+    def test_nothing_is_written_when_the_block_fails(self):
+        with self.assertRaises(ValueError):
+            with stock_batch():
+                adjust_product_quantity(self.product.pk, 5)
+                raise ValueError
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 10)
+
+
+class StockMetricsCacheTests(TransactionTestCase):
+    """
+    Testes da invalidação das métricas em cache pelas escritas de estoque sem sinais (a
+    conciliação define o nível de isolamento da sua transação e, por isso, os dados precisam
+    estar confirmados).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.product = create_product(quantity=0)
+        Inflow.objects.create(
+            supplier=create_supplier(), product=self.product, quantity=10
+        )
+
+    def test_reconcile_fix_invalidates_metrics_cache(self):
+        Product.objects.filter(pk=self.product.pk).update(quantity=4)
+        self.assertEqual(get_product_metrics()["total_quantity"], 4)
+
+        call_command("reconcile_stock", "--fix", stdout=StringIO())
+
+        self.assertEqual(get_product_metrics()["total_quantity"], 10)
+
+    def test_adjust_product_quantity_invalidates_metrics_cache(self):
+        self.assertEqual(get_product_metrics()["total_quantity"], 10)
+
+        adjust_product_quantity(self.product.pk, -3)
+
+        self.assertEqual(get_product_metrics()["total_quantity"], 7)
@@ -0,0 +1,154 @@
+"""
+Módulo de testes dos contadores de estoque divididos em faixas.
+
+Verifica que, com a divisão ativa, a base do produto somada às faixas é sempre igual ao
+estoque real (entradas menos saídas): ao ativar e ao recolher as faixas, nas gravações
+individuais, alterações e exclusões, e nas gravações em lote, que também vão para as faixas e
+não deixam a base negativa. Verifica também que as métricas, as páginas e a API de produtos
+exibem o estoque somado às faixas.
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Sum
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from app.metrics import summarize_products
+from app.tests.factories import create_product, create_supplier
+from inflows.models import Inflow
+from inflows.serializers import InflowBulkSerializer
+from outflows.models import Outflow
+from outflows.serializers import SaleSerializer
+from products.models import Product, StockCounterStripe
+from products.stripes import (
+    collapse_stock_stripes,
+    enable_stock_stripes,
+    get_stock_quantity,
+    get_striped_quantities,
+)
+
+
+class StockStripesTests(TestCase):
+    """
+    Testes do estoque de um produto com o contador dividido em faixas.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.supplier = create_supplier()
+        self.product = create_product(quantity=0)
+        Inflow.objects.create(supplier=self.supplier, product=self.product, quantity=10)
+        self.product = enable_stock_stripes(self.product.pk, 4)
+
+    def true_stock(self):
+        inflows = Inflow.objects.filter(product=self.product).aggregate(total=Sum("quantity"))
+        outflows = Outflow.objects.filter(product=self.product).aggregate(
+            total=Sum("quantity")
+        )
+        return (inflows["total"] or 0) - (outflows["total"] or 0)
+
+    def assertStock(self, expected, base):
+        self.assertEqual(self.true_stock(), expected)
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertEqual(product.quantity, base)
+        striped = get_striped_quantities([product.pk]).get(product.pk, 0)
+        self.assertEqual(product.quantity + striped, expected)
+        self.assertEqual(get_stock_quantity(product), expected)
+        metrics = summarize_products(Product.objects.filter(pk=product.pk))
+        self.assertEqual(metrics["total_quantity"], expected)
+
+    def sell(self, quantity):
+        serializer = SaleSerializer(
+            data={
+                "description": "Venda",
+                "items": [{"product": self.product.pk, "quantity": quantity}],
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_enabling_keeps_stock(self):
+        self.assertEqual(StockCounterStripe.objects.filter(product=self.product).count(), 4)
+        self.assertStock(10, base=10)
+
+    def test_individual_writes_go_to_stripes(self):
+        Inflow.objects.create(supplier=self.supplier, product=self.product, quantity=5)
+        Outflow.objects.create(product=self.product, quantity=3, description="Venda")
+
+        self.assertStock(12, base=10)
+
+    def test_changes_and_deletions_go_to_stripes(self):
+        inflow = Inflow.objects.create(supplier=self.supplier, product=self.product, quantity=5)
+        outflow = Outflow.objects.create(product=self.product, quantity=3, description="Venda")
+        inflow.quantity = 8
+        inflow.save()
+        outflow.delete()
+
+        self.assertStock(18, base=10)
+
+    def test_batch_writes_go_to_stripes(self):
+        Outflow.objects.create(product=self.product, quantity=10, description="Venda")
+        collapse_stock_stripes([self.product.pk])
+        self.assertStock(0, base=0)
+
+        # As entradas ficam nas faixas; a venda em lote não pode baixar a base vazia
+        serializer = InflowBulkSerializer(
+            data=[
+                {"supplier": self.supplier.pk, "product": self.product.pk, "quantity": 4},
+                {"supplier": self.supplier.pk, "product": self.product.pk, "quantity": 6},
+            ],
+            many=True,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.sell(7)
+
+        self.assertStock(3, base=0)
+
+    def test_collapse_moves_stripes_to_base(self):
+        Inflow.objects.create(supplier=self.supplier, product=self.product, quantity=5)
+        self.sell(4)
+
+        collapse_stock_stripes([self.product.pk])
+
+        self.assertStock(11, base=11)
+        self.assertFalse(
+            StockCounterStripe.objects.filter(product=self.product)
+            .exclude(quantity=0)
+            .exists()
+        )
+
+
+class StockStripesViewTests(TestCase):
+    """
+    Testes da exibição do estoque de produtos com contador dividido.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.product = create_product(quantity=10)
+        self.product = enable_stock_stripes(self.product.pk, 2)
+        StockCounterStripe.objects.filter(product=self.product, stripe=0).update(quantity=5)
+        self.user = User.objects.create_superuser("admin", "admin@sge.local", "admin")
+        self.client.force_login(self.user)
+
+    def test_list_and_detail_show_total_stock(self):
+        response = self.client.get(reverse("product_list"))
+        self.assertEqual(response.context["products"][0].stock_quantity, 15)
+        self.assertEqual(response.context["product_metrics"]["total_quantity"], 15)
+
+        response = self.client.get(reverse("product_detail", args=[self.product.pk]))
+        self.assertContains(response, "<strong>15</strong>")
+
+    def test_api_reads_and_writes_total_stock(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse("product-detail-api-view", args=[self.product.pk])
+        self.assertEqual(client.get(url).json()["quantity"], 15)
+
+        response = client.patch(url, {"quantity": 20}, format="json")
+        self.assertEqual(response.json()["quantity"], 20)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.quantity, 15)
+        self.assertEqual(get_stock_quantity(self.product), 20)
@@ -0,0 +1,170 @@
+"""
+Módulo de testes dos gatilhos de estoque do PostgreSQL.
+
+Executa os mesmos cenários de entradas e saídas com o estoque mantido pelos sinais e pelos
+gatilhos do banco de dados, verificando que os dois modos chegam ao mesmo estoque e ao mesmo
+livro-razão na criação, alteração, exclusão e gravação em lote, e que, com os gatilhos, a
+restrição de estoque recusa saídas acima do estoque.
+"""
+
+import unittest
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Sum
+from django.test import TestCase
+from app.tests.factories import create_product, create_supplier
+from inflows.models import Inflow
+from inflows.serializers import InflowBulkSerializer
+from outflows.models import Outflow
+from outflows.serializers import SaleSerializer
+from products.models import StockMovement
+from products.triggers import (
+    install_stock_triggers,
+    stock_triggers_enabled,
+    uninstall_stock_triggers,
+)
+
+
+class StockParityMixin:
+    """
+    Cenários de estoque comuns aos dois modos.
+
+    Cada cenário verifica o estoque dos produtos e, para cada produto, que a soma e a
+    quantidade das movimentações do livro-razão são as esperadas.
+    """
+
+    triggers = False
+
+    def setUp(self):
+        if self.triggers:
+            install_stock_triggers(connection)
+        self.assertEqual(stock_triggers_enabled(), self.triggers)
+        self.supplier = create_supplier()
+        self.product = create_product("Produto A", quantity=0)
+        self.other = create_product("Produto B", quantity=0)
+
+    def tearDown(self):
+        if self.triggers:
+            # As chaves estrangeiras adiadas precisam ser verificadas antes do ALTER TABLE
+            with connection.cursor() as cursor:
+                cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            uninstall_stock_triggers(connection)
+
+    def assertStock(self, product, quantity, movements):
+        product.refresh_from_db()
+        self.assertEqual(product.quantity, quantity)
+        ledger = StockMovement.objects.filter(product=product).aggregate(
+            total=Sum("quantity"), count=Count("id")
+        )
+        self.assertEqual(ledger["total"] or 0, quantity)
+        self.assertEqual(ledger["count"], movements)
+
+    def test_insert(self):
+        Inflow.objects.create(supplier=self.supplier, product=self.product, quantity=10)
+        Outflow.objects.create(product=self.product, quantity=4)
+        Inflow.objects.create(supplier=self.supplier, product=self.product, quantity=0)
+
+        self.assertStock(self.product, 6, movements=2)
+
+    def test_update_quantity(self):
+        inflow = Inflow.objects.create(
+            supplier=self.supplier, product=self.product, quantity=10
+        )
+        outflow = Outflow.objects.create(product=self.product, quantity=4)
+
+        outflow.quantity = 6
+        outflow.save()
+        # O estorno da entrada antiga, sozinho, deixaria o estoque negativo
+        inflow.quantity = 7
+        inflow.save()
+        # Gravações sem alteração de produto ou quantidade não movimentam o estoque
+        outflow.description = "Venda corrigida"
+        outflow.save()
+
+        self.assertStock(self.product, 1, movements=6)
+
+    def test_update_product(self):
+        inflow = Inflow.objects.create(
+            supplier=self.supplier, product=self.product, quantity=10
+        )
+        Inflow.objects.create(supplier=self.supplier, product=self.other, quantity=5)
+        outflow = Outflow.objects.create(product=self.product, quantity=4)
+
+        outflow.product = self.other
+        outflow.save()
+        inflow.product = self.other
+        inflow.save()
+
+        self.assertStock(self.product, 0, movements=4)
+        self.assertStock(self.other, 11, movements=3)
+
+    def test_delete(self):
+        inflow = Inflow.objects.create(
+            supplier=self.supplier, product=self.product, quantity=10
+        )
+        Outflow.objects.create(product=self.product, quantity=4)
+
+        Outflow.objects.filter(product=self.product).delete()
+        self.assertStock(self.product, 10, movements=3)
+
+        inflow.delete()
+        self.assertStock(self.product, 0, movements=4)
+
+    def test_bulk_create(self):
+        inflows = InflowBulkSerializer(
+            data=[
+                {"supplier": self.supplier.pk, "product": product.pk, "quantity": 5}
+                for product in (self.product, self.other, self.product)
+            ],
+            many=True,
+        )
+        inflows.is_valid(raise_exception=True)
+        inflows.save()
+        sale = SaleSerializer(
+            data={
+                "items": [
+                    {"product": self.product.pk, "quantity": 3},
+                    {"product": self.other.pk, "quantity": 2},
+                ]
+            }
+        )
+        sale.is_valid(raise_exception=True)
+        sale.save()
+
+        self.assertStock(self.product, 7, movements=3)
+        self.assertStock(self.other, 3, movements=2)
+
+
+class SignalStockTests(StockParityMixin, TestCase):
+    """
+    Cenários de estoque com o estoque mantido pelos sinais.
+    """
+
+
+@unittest.skipUnless(
+    connection.vendor == "postgresql", "Os gatilhos de estoque exigem o PostgreSQL."
+)
+class TriggerStockTests(StockParityMixin, TestCase):
+    """
+    Cenários de estoque com o estoque mantido pelos gatilhos do banco de dados.
+    """
+
+    triggers = True
+
+    def test_raw_bulk_create(self):
+        Inflow.objects.bulk_create(
+            [
+                Inflow(supplier=self.supplier, product=self.product, quantity=5),
+                Inflow(supplier=self.supplier, product=self.product, quantity=3),
+            ]
+        )
+
+        self.assertStock(self.product, 8, movements=2)
+
+    def test_check_rejects_negative_stock(self):
+        Inflow.objects.create(supplier=self.supplier, product=self.product, quantity=2)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Outflow.objects.create(product=self.product, quantity=3)
+
+        self.assertStock(self.product, 2, movements=1)
+        self.assertFalse(Outflow.objects.exists())
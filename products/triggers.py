@@ -0,0 +1,210 @@
+"""
+Módulo dos gatilhos de estoque do PostgreSQL.
+
+Este módulo define um modo opcional em que o estoque é mantido pelo próprio banco de dados:
+gatilhos `AFTER INSERT/UPDATE/DELETE` nas tabelas de entradas e saídas atualizam
+`products_product.quantity` e registram as movimentações no livro-razão de estoque na mesma
+instrução que grava a entrada ou saída. Diferentemente dos sinais de post_save, os gatilhos
+também são disparados por `bulk_create`, `QuerySet.update`, exclusões e SQL direto, e não
+custam uma ida e volta adicional ao banco. Com o modo ativo, a restrição
+`CHECK (quantity >= 0)` impede que o estoque fique negativo.
+
+Os dois modos têm a mesma semântica para as gravações que passam pelo ORM: a criação aplica a
+movimentação, a alteração do produto ou da quantidade estorna a movimentação antiga e aplica a
+nova, e a exclusão estorna a movimentação, sempre com um registro no livro-razão. As
+diferenças são as gravações que não disparam sinais (`bulk_create` fora das gravações
+agrupadas, `QuerySet.update` e SQL direto), refletidas no estoque apenas pelos gatilhos, e a
+restrição de estoque não negativo, que só existe com os gatilhos.
+
+Quando os gatilhos estão instalados, os sinais de entrada e de saída e as gravações agrupadas
+(entradas em lote e vendas) deixam de alterar o estoque, para que as movimentações não sejam
+contadas duas vezes. Os contadores divididos em faixas (products.stripes) não recebem
+gravações nesse modo, pois os gatilhos alteram sempre a quantidade base.
+
+Os gatilhos são instalados pela migração `0006_stock_triggers` quando a configuração
+STOCK_TRIGGERS está ativa, ou a qualquer momento pelo comando `stock_triggers`. Os processos
+da aplicação detectam os gatilhos uma única vez, e devem ser reiniciados após a troca de modo.
+
+Componentes principais:
+    - INSTALL_SQL: Instruções que criam as funções, os gatilhos e a restrição.
+    - UNINSTALL_SQL: Instruções que removem as funções, os gatilhos e a restrição.
+    - install_stock_triggers: Instala os gatilhos em uma conexão do PostgreSQL.
+    - uninstall_stock_triggers: Remove os gatilhos de uma conexão do PostgreSQL.
+    - stock_triggers_installed: Consulta se os gatilhos estão instalados.
+    - stock_triggers_enabled: Indica, com cache por processo, se o modo de gatilhos está ativo.
+
+Configurações:
+    - STOCK_TRIGGERS: Indica se a migração deve instalar os gatilhos.
+
+Dependências:
+    - django.db: Para as conexões com o banco de dados.
+"""
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+TRIGGER_NAMES = ("sge_inflow_stock", "sge_outflow_stock")
+
+CHECK_NAME = "products_product_quantity_non_negative"
+
+# Função comum às entradas (sinal 1) e às saídas (sinal -1). Apenas as movimentações com
+# quantidade positiva alteram o estoque, como nos sinais. Em uma alteração, a movimentação
+# antiga é estornada e a nova aplicada; em uma exclusão, a movimentação é estornada. Quando o
+# produto não muda, o estoque recebe apenas a diferença, para que a restrição de estoque não
+# recuse um estorno seguido de uma nova aplicação que, juntos, mantêm o estoque positivo.
+INSTALL_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION sge_stock_movement() RETURNS trigger AS $$
+    DECLARE
+        stock_sign integer := TG_ARGV[0]::integer;
+        stock_source text := TG_ARGV[1];
+        old_quantity integer := 0;
+        new_quantity integer := 0;
+    BEGIN
+        -- `save()` regrava todas as colunas; só interessam alterações de produto ou quantidade
+        IF TG_OP = 'UPDATE' AND OLD.product_id = NEW.product_id
+                            AND OLD.quantity = NEW.quantity THEN
+            RETURN NULL;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.quantity > 0 THEN
+            old_quantity := OLD.quantity;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.quantity > 0 THEN
+            new_quantity := NEW.quantity;
+        END IF;
+
+        IF TG_OP = 'UPDATE' AND OLD.product_id = NEW.product_id THEN
+            IF new_quantity <> old_quantity THEN
+                UPDATE products_product
+                   SET quantity = quantity + stock_sign * (new_quantity - old_quantity),
+                       updated_at = now()
+                 WHERE id = NEW.product_id;
+            END IF;
+        ELSE
+            IF old_quantity > 0 THEN
+                UPDATE products_product
+                   SET quantity = quantity - stock_sign * old_quantity, updated_at = now()
+                 WHERE id = OLD.product_id;
+            END IF;
+            IF new_quantity > 0 THEN
+                UPDATE products_product
+                   SET quantity = quantity + stock_sign * new_quantity, updated_at = now()
+                 WHERE id = NEW.product_id;
+            END IF;
+        END IF;
+
+        IF old_quantity > 0 THEN
+            INSERT INTO products_stockmovement
+                   (product_id, quantity, inflow_id, outflow_id, created_at)
+            VALUES (
+                OLD.product_id,
+                -stock_sign * old_quantity,
+                CASE WHEN stock_source = 'inflow' AND TG_OP = 'UPDATE' THEN OLD.id END,
+                CASE WHEN stock_source = 'outflow' AND TG_OP = 'UPDATE' THEN OLD.id END,
+                now()
+            );
+        END IF;
+        IF new_quantity > 0 THEN
+            INSERT INTO products_stockmovement
+                   (product_id, quantity, inflow_id, outflow_id, created_at)
+            VALUES (
+                NEW.product_id,
+                stock_sign * new_quantity,
+                CASE WHEN stock_source = 'inflow' THEN NEW.id END,
+                CASE WHEN stock_source = 'outflow' THEN NEW.id END,
+                CASE WHEN TG_OP = 'INSERT' THEN NEW.created_at ELSE now() END
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    "DROP TRIGGER IF EXISTS sge_inflow_stock ON inflows_inflow;",
+    """
+    CREATE TRIGGER sge_inflow_stock
+    AFTER INSERT OR DELETE OR UPDATE OF product_id, quantity ON inflows_inflow
+    FOR EACH ROW EXECUTE FUNCTION sge_stock_movement('1', 'inflow');
+    """,
+    "DROP TRIGGER IF EXISTS sge_outflow_stock ON outflows_outflow;",
+    """
+    CREATE TRIGGER sge_outflow_stock
+    AFTER INSERT OR DELETE OR UPDATE OF product_id, quantity ON outflows_outflow
+    FOR EACH ROW EXECUTE FUNCTION sge_stock_movement('-1', 'outflow');
+    """,
+    # NOT VALID: a restrição vale para as novas gravações sem varrer a tabela; produtos já
+    # negativos devem ser corrigidos com `reconcile_stock --fix` e a restrição validada depois.
+    f"ALTER TABLE products_product DROP CONSTRAINT IF EXISTS {CHECK_NAME};",
+    f"""
+    ALTER TABLE products_product
+    ADD CONSTRAINT {CHECK_NAME} CHECK (quantity >= 0) NOT VALID;
+    """,
+]
+
+UNINSTALL_SQL = [
+    f"ALTER TABLE products_product DROP CONSTRAINT IF EXISTS {CHECK_NAME};",
+    "DROP TRIGGER IF EXISTS sge_inflow_stock ON inflows_inflow;",
+    "DROP TRIGGER IF EXISTS sge_outflow_stock ON outflows_outflow;",
+    "DROP FUNCTION IF EXISTS sge_stock_movement();",
+]
+
+_enabled = {}
+
+
+def install_stock_triggers(connection):
+    """
+    Instala as funções, os gatilhos e a restrição de estoque em uma conexão do PostgreSQL.
+
+    Argumentos:
+        connection: Conexão com o banco de dados.
+    """
+    with connection.cursor() as cursor:
+        for sql in INSTALL_SQL:
+            cursor.execute(sql)
+    _enabled.pop(connection.alias, None)
+
+
+def uninstall_stock_triggers(connection):
+    """
+    Remove as funções, os gatilhos e a restrição de estoque de uma conexão do PostgreSQL.
+
+    Argumentos:
+        connection: Conexão com o banco de dados.
+    """
+    with connection.cursor() as cursor:
+        for sql in UNINSTALL_SQL:
+            cursor.execute(sql)
+    _enabled.pop(connection.alias, None)
+
+
+def stock_triggers_installed(connection):
+    """
+    Consulta se os gatilhos de estoque estão instalados.
+
+    Argumentos:
+        connection: Conexão com o banco de dados.
+
+    Retorna:
+        bool: Indica se ambos os gatilhos existem (sempre False fora do PostgreSQL).
+    """
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_trigger WHERE tgname = ANY(%s) AND NOT tgisinternal",
+            [list(TRIGGER_NAMES)],
+        )
+        return cursor.fetchone()[0] == len(TRIGGER_NAMES)
+
+
+def stock_triggers_enabled(using=DEFAULT_DB_ALIAS):
+    """
+    Indica se o modo de gatilhos está ativo, consultando o banco uma única vez por processo.
+
+    Argumentos:
+        using (str): Apelido da conexão (padrão: "default").
+
+    Retorna:
+        bool: Indica se o estoque é mantido pelos gatilhos do banco de dados.
+    """
+    if using not in _enabled:
+        _enabled[using] = stock_triggers_installed(connections[using])
+    return _enabled[using]
@@ -12,6 +12,8 @@ Rotas definidas:
     - product_delete: Realiza a exclusão de um produto específico na interface web.
     - product-create-list-api-view: Endpoint da API para listar todos os produtos ou criar um novo.
     - product-detail-api-view: Endpoint da API para recuperar, atualizar ou excluir um produto específico.
+    - stock-reservation-create-list-api-view: Endpoint da API para listar ou criar reservas de estoque.
+    - stock-reservation-detail-api-view: Endpoint da API para recuperar ou liberar uma reserva de estoque.
 
 Dependências:
     - django.urls: Para a definição de rotas.
@@ -50,4 +52,14 @@ urlpatterns = [
         views.ProductRetrieveUpdateDestroyAPIView.as_view(),
         name="product-detail-api-view",
     ),
+    path(
+        "api/v1/reservations/",
+        views.StockReservationCreateListAPIView.as_view(),
+        name="stock-reservation-create-list-api-view",
+    ),
+    path(
+        "api/v1/reservations/<uuid:token>/",
+        views.StockReservationRetrieveDestroyAPIView.as_view(),
+        name="stock-reservation-detail-api-view",
+    ),
 ]
@@ -13,6 +13,8 @@ Componentes principais:
     - ProductDeleteView: Exclui um produto.
     - ProductCreateListAPIView: API para listar e criar produtos.
     - ProductRetrieveUpdateDestroyAPIView: API para recuperar, atualizar e excluir produtos.
+    - StockReservationCreateListAPIView: API para listar e criar reservas de estoque.
+    - StockReservationRetrieveDestroyAPIView: API para recuperar e liberar uma reserva de estoque.
 
 Fluxo típico:
     1. O usuário acessa a lista de produtos com filtros opcionais.
@@ -21,15 +23,21 @@ Fluxo típico:
 
 Dependências:
     - django.contrib.auth.mixins: Para autenticação e permissões.
+    - django.utils.functional.cached_property: Para memorizar as métricas durante a requisição.
     - rest_framework.generics: Para views de API.
     - .models, .forms, .serializers: Modelos, formulários e serializadores locais.
     - categories.models, brands.models: Modelos relacionados de categorias e marcas.
     - app.metrics: Funções para métricas de produtos.
+    - .reservations: Para a liberação das reservas de estoque.
+    - .search: Para a busca textual por relevância.
+    - .stripes: Para somar ao estoque as faixas dos contadores divididos.
+    - app.pagination: Para o paginador com contagem estimada.
 """
 
 from rest_framework import generics
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.urls import reverse_lazy
+from django.utils.functional import cached_property
 from django.views.generic import (
     ListView,
     CreateView,
@@ -38,9 +46,13 @@ from django.views.generic import (
     DeleteView,
 )
 from . import models, forms, serializers
+from .reservations import release_reservation
+from .search import search_products
+from .stripes import annotate_stock_quantity
 from categories.models import Category
 from brands.models import Brand
 from app import metrics
+from app.pagination import EstimatedCountPaginator
 
 
 class ProductListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
@@ -48,17 +60,27 @@ class ProductListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     View para listar produtos com paginação e filtragem.
 
     Exibe uma lista paginada de produtos com filtros por título, número de série, categoria e marca.
+    O parâmetro `search` ativa a busca textual, que ordena os produtos encontrados por relevância.
     Requer autenticação e a permissão 'products.view_product'. Inclui métricas e dados adicionais no contexto.
+    As métricas consideram os filtros ativos, são calculadas uma única vez por requisição e ficam em
+    cache pela assinatura dos filtros, de modo que a troca de página não recalcula a agregação.
 
     Atributos:
         model: Modelo Product.
         template_name: Template HTML para renderizar a lista.
         context_object_name: Nome do objeto no contexto do template.
         paginate_by: Número de itens por página.
+        paginator_class: Paginador com total estimado em tabelas grandes.
         permission_required: Permissão necessária para acessar a view.
+        filter_params: Parâmetros da query string usados como filtros.
+
+    Métodos:
+        get_filters: Retorna os filtros ativos na query string.
+        product_metrics: Métricas dos produtos filtrados, memorizadas para a requisição.
 
     Métodos sobrescritos:
-        get_queryset: Filtra o queryset com base nos parâmetros da query string.
+        get_queryset: Anota o estoque total e filtra o queryset com base nos parâmetros da
+                      query string.
         get_context_data: Adiciona métricas, categorias e marcas ao contexto do template.
     """
 
@@ -66,10 +88,25 @@ class ProductListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = "product_list.html"
     context_object_name = "products"
     paginate_by = 5
+    paginator_class = EstimatedCountPaginator
     permission_required = "products.view_product"
+    filter_params = ("search", "title", "serie_number", "category", "brand")
+
+    def get_filters(self):
+        return {
+            name: self.request.GET[name]
+            for name in self.filter_params
+            if self.request.GET.get(name)
+        }
+
+    @cached_property
+    def product_metrics(self):
+        return metrics.get_filtered_product_metrics(
+            self.object_list, self.get_filters()
+        )
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = annotate_stock_quantity(super().get_queryset())
         title = self.request.GET.get("title")
         serie_number = self.request.GET.get("serie_number")
         category = self.request.GET.get("category")
@@ -82,11 +119,14 @@ class ProductListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
             queryset = queryset.filter(serie_number__icontains=serie_number)
         if brand:
             queryset = queryset.filter(brand__name=brand)
+        search = self.request.GET.get("search")
+        if search:
+            queryset = search_products(queryset, search)
         return queryset
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["product_metrics"] = metrics.get_product_metrics()
+        context["product_metrics"] = self.product_metrics
         context["categories"] = Category.objects.all()
         context["brands"] = Brand.objects.all()
         return context
@@ -118,16 +158,17 @@ class ProductDetailView(LoginRequiredMixin, PermissionRequiredMixin, DetailView)
     """
     View para exibir detalhes de um produto.
 
-    Exibe informações detalhadas de um produto específico.
+    Exibe informações detalhadas de um produto específico, com o estoque somado às faixas
+    dos contadores divididos.
     Requer autenticação e a permissão 'products.view_product'.
 
     Atributos:
-        model: Modelo Product.
+        queryset: Produtos anotados com o estoque total.
         template_name: Template HTML para renderizar os detalhes.
         permission_required: Permissão necessária para acessar a view.
     """
 
-    model = models.Product
+    queryset = annotate_stock_quantity(models.Product.objects.all())
     template_name = "product_detail.html"
     permission_required = "products.view_product"
 
@@ -183,14 +224,27 @@ class ProductCreateListAPIView(generics.ListCreateAPIView):
     Permite listar todos os produtos ou criar um novo via métodos GET e POST.
     Usa o serializer ProductSerializer para serializar os dados.
 
+    O parâmetro `search` ativa a busca textual, que ordena os produtos encontrados por
+    relevância.
+
     Atributos:
-        queryset: Todos os objetos Product.
+        queryset: Todos os objetos Product, anotados com o estoque total.
         serializer_class: Serializer para Product.
+
+    Métodos sobrescritos:
+        get_queryset: Aplica a busca textual, quando informada.
     """
 
-    queryset = models.Product.objects.all()
+    queryset = annotate_stock_quantity(models.Product.objects.all())
     serializer_class = serializers.ProductSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        search = self.request.query_params.get("search")
+        if search:
+            queryset = search_products(queryset, search)
+        return queryset
+
 
 class ProductRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     """
@@ -200,9 +254,49 @@ class ProductRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView)
     Usa o serializer ProductSerializer para serializar os dados.
 
     Atributos:
-        queryset: Todos os objetos Product.
+        queryset: Todos os objetos Product, anotados com o estoque total.
         serializer_class: Serializer para Product.
     """
 
-    queryset = models.Product.objects.all()
+    queryset = annotate_stock_quantity(models.Product.objects.all())
     serializer_class = serializers.ProductSerializer
+
+
+class StockReservationCreateListAPIView(generics.ListCreateAPIView):
+    """
+    API view para listar e criar reservas de estoque.
+
+    Permite listar as reservas ou criar, via POST, uma reserva com duração limitada, recusada
+    quando a quantidade excede o estoque disponível (estoque menos as reservas ativas).
+
+    Atributos:
+        queryset: Todos os objetos StockReservation.
+        serializer_class: Serializer para StockReservation.
+    """
+
+    queryset = models.StockReservation.objects.all()
+    serializer_class = serializers.StockReservationSerializer
+
+
+class StockReservationRetrieveDestroyAPIView(generics.RetrieveDestroyAPIView):
+    """
+    API view para recuperar e liberar uma reserva de estoque.
+
+    As reservas são identificadas pelo token. O método DELETE libera a reserva, mantendo o
+    registro para histórico, em vez de excluí-lo.
+
+    Atributos:
+        queryset: Todos os objetos StockReservation.
+        serializer_class: Serializer para StockReservation.
+        lookup_field: Campo usado para localizar a reserva (token).
+
+    Métodos:
+        perform_destroy: Libera a reserva.
+    """
+
+    queryset = models.StockReservation.objects.all()
+    serializer_class = serializers.StockReservationSerializer
+    lookup_field = "token"
+
+    def perform_destroy(self, instance):
+        release_reservation(instance.token)
@@ -0,0 +1,51 @@
+"""
+Módulo de migração para o índice de trigramas dos fornecedores.
+
+Este módulo cria, no PostgreSQL, um índice GIN sobre `UPPER(name)`, a mesma expressão gerada
+pelos filtros `__icontains` da listagem de fornecedores, para que as buscas por trecho deixem
+de varrer a tabela inteira. Nos demais bancos de dados é criado um índice comum sobre a mesma
+expressão (ver app.trigram).
+
+Componentes principais:
+    - Migration: Classe que define a migração, herdando de `django.db.migrations.Migration`.
+    - AddTrigramIndex: Operação que cria o índice de trigramas.
+
+Dependências:
+    - django.db.migrations: Para a criação e gerenciamento de migrações.
+    - app.trigram: Para o índice e a operação que o cria.
+"""
+
+from django.db import migrations
+from app.trigram import AddTrigramIndex, TrigramIndex
+
+
+class Migration(migrations.Migration):
+    """
+    Classe de migração para o índice de trigramas dos fornecedores.
+
+    A migração não é atômica, pois o índice é criado com `CREATE INDEX CONCURRENTLY`, sem
+    bloquear as gravações na tabela.
+
+    Atributos:
+        atomic (bool): Indica que a migração não é executada em uma transação.
+        dependencies (list): Lista de dependências de outras migrações.
+        operations (list): Lista de operações a serem executadas durante a migração.
+
+    Operações:
+        - AddTrigramIndex: Cria o índice suppliers_supplier_name_trgm da coluna name.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("suppliers", "0001_initial"),
+        # A extensão `pg_trgm` é criada pela migração dos índices das marcas
+        ("brands", "0002_brand_name_trgm"),
+    ]
+
+    operations = [
+        AddTrigramIndex(
+            model_name="supplier",
+            index=TrigramIndex(field="name", name="suppliers_supplier_name_trgm"),
+        ),
+    ]
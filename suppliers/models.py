@@ -9,9 +9,11 @@ Componentes principais:
 
 Dependências:
     - django.db.models: Para a criação de modelos de banco de dados.
+    - app.trigram: Para o índice de trigramas do nome.
 """
 
 from django.db import models
+from app.trigram import TrigramIndex
 
 
 class Supplier(models.Model):
@@ -27,7 +29,8 @@ class Supplier(models.Model):
         updated_at: Data e hora da última atualização do registro (atualizada automaticamente).
 
     Atributos:
-        Meta: Classe interna que define a ordenação padrão dos registros por nome.
+        Meta: Classe interna que define a ordenação padrão dos registros por nome e o índice
+            de trigramas do nome, usado pela busca por trecho da listagem.
 
     Métodos:
         __str__: Retorna o nome do fornecedor como representação em string.
@@ -41,6 +44,7 @@ class Supplier(models.Model):
 
     class Meta:
         ordering = ["name"]
+        indexes = [TrigramIndex(field="name", name="suppliers_supplier_name_trgm")]
 
     def __str__(self):
         return self.name
@@ -25,6 +25,7 @@ Dependências:
     - .models: Modelos de dados, incluindo Supplier.
     - .forms: Formulários, incluindo SupplierForm.
     - .serializers: Serializadores para API, incluindo SupplierSerializer.
+    - app.pagination: Para o paginador com contagem estimada.
 """
 
 from rest_framework import generics
@@ -38,6 +39,7 @@ from django.views.generic import (
     DeleteView,
 )
 from . import models, forms, serializers
+from app.pagination import EstimatedCountPaginator
 
 
 class SupplierListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
@@ -52,6 +54,7 @@ class SupplierListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
         template_name: Template HTML para renderizar a lista.
         context_object_name: Nome do objeto no contexto do template.
         paginate_by: Número de itens por página.
+        paginator_class: Paginador com total estimado em tabelas grandes.
         permission_required: Permissão necessária para acessar a view.
 
     Métodos sobrescritos:
@@ -62,6 +65,7 @@ class SupplierListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
     template_name = "supplier_list.html"
     context_object_name = "suppliers"
     paginate_by = 5
+    paginator_class = EstimatedCountPaginator
     permission_required = "suppliers.view_supplier"
 
     def get_queryset(self):